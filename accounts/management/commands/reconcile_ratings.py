@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from accounts.models import Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the review count, rating sum and average rating of every "
+        "reviewed model from its reviews, correcting any that have drifted"
+    )
+
+    def handle(self, *args, **options):
+        for model in Review.rated_models():
+            corrected = Review.reconcile_ratings(model)
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {corrected} corrected"
+            )
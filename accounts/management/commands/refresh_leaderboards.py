@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from accounts.models import RatingRollup, Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the Bayesian scores the school and facility leaderboards "
+        "are ranked by; run it periodically, e.g. nightly from cron"
+    )
+
+    def handle(self, *args, **options):
+        for model in Review.rated_models():
+            written, prior_mean = RatingRollup.refresh(model)
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {written} ranked, "
+                f"prior mean {prior_mean:.2f}"
+            )
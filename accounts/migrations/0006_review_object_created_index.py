@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_review"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["content_type", "object_id", "created_at", "id"],
+                name="review_object_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_review_object_created_index"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RatingRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("province", models.CharField(blank=True, max_length=50, null=True)),
+                ("district", models.CharField(blank=True, max_length=50, null=True)),
+                ("kind", models.CharField(blank=True, max_length=100, null=True)),
+                ("review_count", models.IntegerField()),
+                ("average_rating", models.DecimalField(decimal_places=2, max_digits=3)),
+                ("score", models.FloatField()),
+                ("refreshed_at", models.DateTimeField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "score", "object_id"],
+                        name="rollup_score_idx",
+                    ),
+                    models.Index(
+                        fields=["content_type", "province", "score", "object_id"],
+                        name="rollup_province_score_idx",
+                    ),
+                    models.Index(
+                        fields=["content_type", "district", "score", "object_id"],
+                        name="rollup_district_score_idx",
+                    ),
+                    models.Index(
+                        fields=["content_type", "kind", "score", "object_id"],
+                        name="rollup_kind_score_idx",
+                    ),
+                ],
+                "unique_together": {("content_type", "object_id")},
+            },
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
-from django.db import models
+from functools import cache
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from .managers import CustomUserManager
@@ -60,24 +64,209 @@ class Review(models.Model):
     content_object = GenericForeignKey("content_type", "object_id")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # The reviews of one object, newest first, paged by keyset with the
+        # id as tie-breaker (see ListReviewsView).
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id", "created_at", "id"],
+                name="review_object_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Review by {self.user} - {self.content_object} ({self.rating})"
 
     @staticmethod
-    def update_ratings(content_type, object_id):
+    def rated_models():
         """
-        Efficiently updates the average_rating and review_count for the reviewed object.
+        Returns the models that keep rating aggregates: review_count,
+        rating_sum and average_rating.
         """
+        return list(reviewable_models().values())
 
-        review_aggregate = Review.objects.filter(
-            content_type=content_type, object_id=object_id
-        ).aggregate(avg_rating=models.Avg("rating"), count=models.Count("id"))
-
-        avg_rating = review_aggregate["avg_rating"] or 0
-        count = review_aggregate["count"]
+    @staticmethod
+    def get_content_type(model_name):
+        """
+        Returns the ContentType of the reviewable model named `model_name`
+        (e.g. "school"), or None. ContentTypes are looked up through
+        Django's ContentType cache, so only the first request queries.
+        """
+        model = reviewable_models().get(str(model_name).lower())
+        return ContentType.objects.get_for_model(model) if model else None
 
-        # Atomic Update using F expressions
+    @staticmethod
+    def adjust_ratings(content_type, object_id, rating_delta, count_delta):
+        """
+        Applies a review write to the reviewed object's aggregates: adds
+        `rating_delta` to its rating sum and `count_delta` to its review
+        count, and derives the average from them, in one UPDATE with F
+        expressions. Concurrent writes add up and the cost does not depend
+        on the number of reviews.
+        """
+        rating_sum = models.F("rating_sum") + rating_delta
+        review_count = models.F("review_count") + count_delta
         content_type.model_class().objects.filter(id=object_id).update(
-            average_rating=models.F("average_rating") * 0 + avg_rating,
-            review_count=models.F("review_count") * 0 + count,
+            rating_sum=rating_sum,
+            review_count=review_count,
+            average_rating=average_expression(rating_sum, review_count),
+        )
+
+    @classmethod
+    def reconcile_ratings(cls, model):
+        """
+        Recomputes the aggregates of every `model` object from its reviews,
+        with one UPDATE of the objects whose stored values have drifted.
+        Returns the number of objects corrected.
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        reviews = (
+            cls.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+            .order_by()
+            .values("object_id")
+        )
+        rating_sum = Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0
+        )
+        review_count = Coalesce(
+            Subquery(reviews.annotate(count=Count("id")).values("count")), 0
+        )
+        average_rating = average_expression(rating_sum, review_count)
+
+        # The average is always written with the sum and count, so only the
+        # running columns are compared.
+        drifted = (
+            model.objects.alias(actual_sum=rating_sum, actual_count=review_count)
+            .exclude(
+                rating_sum=models.F("actual_sum"),
+                review_count=models.F("actual_count"),
+            )
+            .values("pk")
+        )
+        return model.objects.filter(pk__in=drifted).update(
+            rating_sum=rating_sum,
+            review_count=review_count,
+            average_rating=average_rating,
+        )
+
+
+class RatingRollup(models.Model):
+    """
+    Leaderboard row of a reviewed object: its Bayesian rating score with the
+    keys it can be ranked by, rebuilt for all objects by RatingRollup.refresh
+    (`manage.py refresh_leaderboards`). A leaderboard is then one index range
+    scan of the top rows instead of a sort of the whole table.
+
+    The score pulls the average of objects with few reviews towards the mean
+    rating of all reviews, as if each object had PRIOR_REVIEWS more reviews
+    at that mean, so one 5-star review does not outrank a hundred 4.8s.
+    """
+
+    PRIOR_REVIEWS = 5
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    province = models.CharField(max_length=50, blank=True, null=True)
+    district = models.CharField(max_length=50, blank=True, null=True)
+    kind = models.CharField(max_length=100, blank=True, null=True)
+    review_count = models.IntegerField()
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2)
+    score = models.FloatField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("content_type", "object_id")
+        indexes = [
+            models.Index(
+                fields=["content_type", "score", "object_id"],
+                name="rollup_score_idx",
+            ),
+            models.Index(
+                fields=["content_type", "province", "score", "object_id"],
+                name="rollup_province_score_idx",
+            ),
+            models.Index(
+                fields=["content_type", "district", "score", "object_id"],
+                name="rollup_district_score_idx",
+            ),
+            models.Index(
+                fields=["content_type", "kind", "score", "object_id"],
+                name="rollup_kind_score_idx",
+            ),
+        ]
+
+    @classmethod
+    def refresh(cls, model, batch_size=2000):
+        """
+        Rebuilds the rows of a rated `model` in one transaction: one per
+        reviewed object that is not deleted, with the keys from the model's
+        leaderboard_keys(). Returns (rows written, prior mean rating).
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        totals = model.objects.aggregate(
+            rating_sum=Sum("rating_sum"), review_count=Sum("review_count")
+        )
+        prior_mean = (
+            totals["rating_sum"] / totals["review_count"]
+            if totals["review_count"]
+            else 0.0
+        )
+        prior_weight = cls.PRIOR_REVIEWS * prior_mean
+        score = models.ExpressionWrapper(
+            (models.F("rating_sum") + prior_weight)
+            / Cast(models.F("review_count") + cls.PRIOR_REVIEWS, models.FloatField()),
+            output_field=models.FloatField(),
         )
+        rows = (
+            model.objects.filter(review_count__gt=0, is_deleted=False)
+            .annotate(score=score, **model.leaderboard_keys())
+            .values(
+                "province",
+                "district",
+                "kind",
+                "review_count",
+                "average_rating",
+                "score",
+                object_id=models.F("pk"),
+            )
+        )
+
+        refreshed_at = timezone.now()
+        written = 0
+        with transaction.atomic():
+            cls.objects.filter(content_type=content_type).delete()
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(
+                    cls(content_type=content_type, refreshed_at=refreshed_at, **row)
+                )
+                if len(batch) == batch_size:
+                    written += len(cls.objects.bulk_create(batch))
+                    batch = []
+            written += len(cls.objects.bulk_create(batch))
+        return written, prior_mean
+
+
+@cache
+def reviewable_models():
+    """
+    Maps the model names of the rated models to the models.
+    """
+    fields = {"review_count", "rating_sum", "average_rating"}
+    return {
+        model._meta.model_name: model
+        for model in apps.get_models()
+        if fields <= {field.name for field in model._meta.get_fields()}
+    }
+
+
+def average_expression(rating_sum, review_count):
+    """
+    The average rating for a rating sum and review count, NULL (unrated)
+    without reviews.
+    """
+    return Cast(
+        Cast(rating_sum, models.DecimalField(max_digits=12, decimal_places=2))
+        / NullIf(review_count, 0),
+        models.DecimalField(max_digits=3, decimal_places=2),
+    )
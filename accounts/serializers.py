@@ -1,6 +1,5 @@
 from rest_framework import serializers
 from django.conf import settings
-from django.contrib.contenttypes.models import ContentType
 from .validation import validate_email_field, validate_names, validate_password_fields
 from .models import CustomUser, Review
 
@@ -99,12 +98,12 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def validate_content_type(self, value):
         """Ensure the provided content_type corresponds to a valid model."""
-        try:
-            return ContentType.objects.get(model=value.lower())
-        except ContentType.DoesNotExist:
+        content_type = Review.get_content_type(value)
+        if content_type is None:
             raise serializers.ValidationError(
                 "Invalid content type. Make sure it is a valid model name."
             )
+        return content_type
 
     def get_content_object(self, obj):
         """Return the name of the reviewed object."""
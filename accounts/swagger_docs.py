@@ -112,7 +112,7 @@ get_review_api_docs = swagger_auto_schema(
         openapi.Parameter(
             "content_type",
             openapi.IN_QUERY,
-            description="The model type (e.g., 'school', 'hospital')",
+            description="The reviewed model: 'school' or 'healthfacility'",
             type=openapi.TYPE_STRING,
             required=True,
         ),
@@ -126,22 +126,31 @@ get_review_api_docs = swagger_auto_schema(
     ],
     responses={
         200: openapi.Response(
-            description="List of reviews retrieved successfully",
+            description="Page of reviews retrieved successfully, newest first",
             examples={
-                "application/json": [
-                    {
-                        "user": "John",
-                        "rating": 5,
-                        "comment": "Great!",
-                        "created_at": "2024-03-16T10:00:00Z",
-                    },
-                    {
-                        "user": "Uwera",
-                        "rating": 4,
-                        "comment": "Good",
-                        "created_at": "2024-03-16T11:00:00Z",
-                    },
-                ]
+                "application/json": {
+                    "next": "http://localhost:8000/api/v1/users/reviews/"
+                    "?content_type=school&object_id=1&cursor=eyJvIjo",
+                    "previous": None,
+                    "results": [
+                        {
+                            "id": 2,
+                            "user": 3,
+                            "rating": 4,
+                            "comment": "Good",
+                            "content_object": "Green Hills Academy",
+                            "created_at": "2024-03-16T11:00:00Z",
+                        },
+                        {
+                            "id": 1,
+                            "user": 1,
+                            "rating": 5,
+                            "comment": "Great!",
+                            "content_object": "Green Hills Academy",
+                            "created_at": "2024-03-16T10:00:00Z",
+                        },
+                    ],
+                }
             },
         ),
         400: openapi.Response(
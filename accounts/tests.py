@@ -1,8 +1,13 @@
+import io
+from decimal import Decimal
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from faker import Faker
+from edudata.models import School, SchoolLocation
+from .models import Review
 import string
 import random
 
@@ -155,3 +160,168 @@ class UserTest(APITestCase):
             response = self.client.post(self.register_url, invalid_data)
             self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
             self.assertIn(field, response.data)
+
+
+class ReviewRatingTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"reviewer{i}@example.com",
+                password="Password123!",
+                first_name="Review",
+                last_name="Er",
+            )
+            for i in range(3)
+        ]
+        self.school = School.objects.create(school_code=7001, school_name="Rated")
+
+    def review(self, user, rating):
+        self.client.force_authenticate(user)
+        response = self.client.post(
+            reverse("review-create"),
+            {"content_type": "school", "object_id": self.school.id, "rating": rating},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Review.objects.get(user=user)
+
+    def assert_aggregates(self, rating_sum, review_count, average_rating):
+        self.school.refresh_from_db()
+        self.assertEqual(
+            (self.school.rating_sum, self.school.review_count),
+            (rating_sum, review_count),
+        )
+        self.assertEqual(self.school.average_rating, average_rating)
+
+    def test_review_writes_update_aggregates_incrementally(self):
+        """Test create, update and delete adjust the aggregates by their delta"""
+        self.review(self.users[0], 5)
+        self.review(self.users[1], 4)
+        review = self.review(self.users[2], 4)
+        self.assert_aggregates(13, 3, Decimal("4.33"))
+
+        self.client.force_authenticate(self.users[2])
+        self.client.put(
+            reverse("review-update", args=[review.pk]), {"rating": 1}, format="json"
+        )
+        self.assert_aggregates(10, 3, Decimal("3.33"))
+
+        for user in self.users:
+            self.client.force_authenticate(user)
+            self.client.delete(
+                reverse("review-delete", args=[Review.objects.get(user=user).pk])
+            )
+        self.assert_aggregates(0, 0, None)
+
+    def test_reconcile_command_corrects_drift(self):
+        """Test the reconcile command recomputes drifted aggregates"""
+        self.review(self.users[0], 5)
+        self.review(self.users[1], 3)
+        School.objects.update(rating_sum=1, review_count=7, average_rating=1)
+
+        stdout = io.StringIO()
+        call_command("reconcile_ratings", stdout=stdout)
+        self.assertIn("schools: 1 corrected", stdout.getvalue())
+        self.assert_aggregates(8, 2, Decimal("4.00"))
+
+
+class ReviewListTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(school_code=7002, school_name="Listed")
+        content_type = Review.get_content_type("school")
+        for i in range(5):
+            user = User.objects.create_user(
+                email=f"lister{i}@example.com",
+                password="Password123!",
+                first_name="List",
+                last_name="Er",
+            )
+            Review.objects.create(
+                user=user,
+                rating=i + 1,
+                content_type=content_type,
+                object_id=cls.school.id,
+            )
+
+    def test_reviews_are_paged_newest_first(self):
+        """Test reviews are listed by keyset pages in a fixed number of queries"""
+        params = {"content_type": "school", "object_id": self.school.id}
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("review-list"), {**params, "page_size": 3}
+            )
+        ids = [review["id"] for review in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        ids += [review["id"] for review in response.data["results"]]
+
+        self.assertEqual(
+            ids,
+            list(
+                Review.objects.order_by("-created_at", "-id").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+        self.assertEqual(response.data["results"][0]["content_object"], "Listed")
+
+    def test_invalid_content_type(self):
+        """Test models that cannot be reviewed are rejected"""
+        response = self.client.get(
+            reverse("review-list"), {"content_type": "customuser", "object_id": 1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LeaderboardTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # (name, type, province, rating sum, review count)
+        for code, (name, school_type, province, rating_sum, count) in enumerate(
+            [
+                ("One review", "DAY", "RW.KL", 5, 1),
+                ("Many reviews", "DAY", "RW.NO", 480, 100),
+                ("Boarding", "BOARDING", "RW.KL", 40, 10),
+                ("Unrated", "DAY", "RW.KL", 0, 0),
+            ],
+            start=7300,
+        ):
+            school = School.objects.create(
+                school_code=code,
+                school_name=name,
+                school_type=school_type,
+                rating_sum=rating_sum,
+                review_count=count,
+                average_rating=rating_sum / count if count else None,
+            )
+            SchoolLocation.objects.create(school=school, province=province)
+        call_command("refresh_leaderboards", stdout=io.StringIO())
+
+    def names(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [entry["school"]["school_name"] for entry in response.data["results"]]
+
+    def test_scores_weigh_rating_by_review_count(self):
+        """Test many 4.8 reviews outrank a single 5-star review"""
+        response = self.client.get(reverse("school-leaderboard"))
+        self.assertEqual(
+            self.names(response), ["Many reviews", "One review", "Boarding"]
+        )
+        self.assertEqual(response.data["results"][0]["rank"], 1)
+
+    def test_filters(self):
+        """Test leaderboards by province and by type"""
+        response = self.client.get(reverse("school-leaderboard"), {"province": "RW.KL"})
+        self.assertEqual(self.names(response), ["One review", "Boarding"])
+        response = self.client.get(
+            reverse("school-leaderboard"), {"type": "boarding", "limit": 1}
+        )
+        self.assertEqual(self.names(response), ["Boarding"])
+
+    def test_invalid_filters(self):
+        """Test unknown types and out of range limits are rejected"""
+        response = self.client.get(
+            reverse("school-leaderboard"), {"type": "NIGHT", "limit": 0}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data["error"]), {"type", "limit"})
@@ -2,8 +2,8 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model, authenticate
-from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
@@ -18,16 +18,10 @@ from .serializers import (
     ReviewSerializer,
 )
 from .validation import is_email_already_registered
-from .swagger_docs import (
-    register_api_docs,
-    login_api_docs,
-    logout_api_docs,
-    get_users_api_docs,
-    get_review_api_docs,
-    create_review_api_docs,
-    update_review_api_docs,
-    delete_review_api_docs,
-)
+from opendataproject.api_docs import lazy_docs
+from opendataproject.pagination import KeysetCursorPagination
+
+docs = lazy_docs("accounts.swagger_docs")
 
 User = get_user_model()
 
@@ -49,7 +43,7 @@ class RegisterAPIView(APIView):
 
     serializer_class = CustomUserSerializer
 
-    @register_api_docs
+    @docs.register_api_docs
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         try:
@@ -84,7 +78,7 @@ class LoginAPIView(APIView):
 
     serializer_class = LoginSerializer
 
-    @login_api_docs
+    @docs.login_api_docs
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         try:
@@ -219,7 +213,7 @@ class LogoutAPIView(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    @logout_api_docs
+    @docs.logout_api_docs
     def post(self, request):
         refresh_token = request.COOKIES.get("refresh_token")
 
@@ -254,7 +248,7 @@ class LogoutAPIView(APIView):
 class CustomUserListAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @get_users_api_docs
+    @docs.get_users_api_docs
     def get(self, request):
         users = User.objects.all()
         serializer = GetCustomUserSerializer(users, many=True)
@@ -270,56 +264,73 @@ class GetUserProfileAPIView(APIView):
         return Response(serializer.data, status=200)
 
 
+class ReviewCursorPagination(KeysetCursorPagination):
+    """
+    Newest reviews first. With the review_object_created_idx index each page
+    is one index range scan, however many reviews the object has.
+    """
+
+    ordering_fields = ("created_at",)
+    ordering = "-created_at"
+
+
 class ListReviewsView(generics.ListAPIView):
     serializer_class = ReviewSerializer
     permission_classes = [AllowAny]
+    pagination_class = ReviewCursorPagination
 
-    @get_review_api_docs
+    @docs.get_review_api_docs
     def get(self, request, *args, **kwargs):
-        content_type = request.GET.get("content_type")
-        object_id = request.GET.get("object_id")
-
-        try:
-            content_type_obj = ContentType.objects.get(model=content_type)
-        except ContentType.DoesNotExist:
+        if Review.get_content_type(request.GET.get("content_type")) is None:
             return Response(
                 {"error": "Invalid content_type"}, status=status.HTTP_400_BAD_REQUEST
             )
+        if not str(request.GET.get("object_id", "")).isdigit():
+            return Response(
+                {"error": "Invalid object_id"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().get(request, *args, **kwargs)
 
-        reviews = Review.objects.filter(
-            content_type=content_type_obj, object_id=object_id
-        ).select_related("user")
-
-        return Response(self.serializer_class(reviews, many=True).data)
+    def get_queryset(self):
+        # The reviewed object is the same for every review, so it is
+        # fetched once for the page rather than once per review.
+        return (
+            Review.objects.filter(
+                content_type=Review.get_content_type(
+                    self.request.GET.get("content_type")
+                ),
+                object_id=self.request.GET.get("object_id"),
+            )
+            .select_related("user")
+            .prefetch_related("content_object")
+        )
 
 
 class CreateReviewView(generics.CreateAPIView):
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
 
-    @create_review_api_docs
+    @docs.create_review_api_docs
     def post(self, request, *args, **kwargs):
         data = request.data
         content_type = data.get("content_type")
         object_id = data.get("object_id")
 
-        try:
-            content_type_obj = ContentType.objects.get(model=content_type)
-        except ContentType.DoesNotExist:
+        content_type_obj = Review.get_content_type(content_type)
+        if content_type_obj is None:
             return Response(
                 {"error": "Invalid content_type"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        review = Review.objects.create(
-            user=request.user,
-            rating=data["rating"],
-            comment=data.get("comment", ""),
-            content_type=content_type_obj,
-            object_id=object_id,
-        )
-
-        # Update ratings immediately after saving
-        Review.update_ratings(content_type_obj, object_id)
+        with transaction.atomic():
+            review = Review.objects.create(
+                user=request.user,
+                rating=int(data["rating"]),
+                comment=data.get("comment", ""),
+                content_type=content_type_obj,
+                object_id=object_id,
+            )
+            Review.adjust_ratings(content_type_obj, object_id, review.rating, 1)
 
         return Response(
             {"message": "Review added successfully"}, status=status.HTTP_201_CREATED
@@ -333,29 +344,33 @@ class UpdateReviewView(generics.UpdateAPIView):
     def get_queryset(self):
         return Review.objects.filter(user=self.request.user)
 
-    @update_review_api_docs
+    @docs.update_review_api_docs
     def put(self, request, pk, *args, **kwargs):
         """
         Updates a review while ensuring the average rating is recalculated.
         """
         try:
-            review = self.get_queryset().get(pk=pk)
-
-            # Ensure the user updating the review is the one who created it
-            if review.user != request.user:
-                return Response(
-                    {"error": "You can only update your own review"},
-                    status=status.HTTP_403_FORBIDDEN,
+            with transaction.atomic():
+                # Locked so concurrent updates apply their deltas in turn.
+                review = self.get_queryset().select_for_update().get(pk=pk)
+
+                # Ensure the user updating the review is the one who created it
+                if review.user != request.user:
+                    return Response(
+                        {"error": "You can only update your own review"},
+                        status=status.HTTP_403_FORBIDDEN,
+                    )
+
+                # Update the fields based on user input
+                old_rating = review.rating
+                review.rating = int(request.data.get("rating", review.rating))
+                review.comment = request.data.get("comment", review.comment)
+                review.save()
+
+                Review.adjust_ratings(
+                    review.content_type, review.object_id, review.rating - old_rating, 0
                 )
 
-            # Update the fields based on user input
-            review.rating = request.data.get("rating", review.rating)
-            review.comment = request.data.get("comment", review.comment)
-            review.save()
-
-            # Update the ratings immediately after modifying the review
-            Review.update_ratings(review.content_type, review.object_id)
-
             return Response(
                 {"message": "Review updated successfully"}, status=status.HTTP_200_OK
             )
@@ -372,16 +387,15 @@ class DeleteReviewView(generics.DestroyAPIView):
     def get_queryset(self):
         return Review.objects.filter(user=self.request.user)
 
-    @delete_review_api_docs
+    @docs.delete_review_api_docs
     def delete(self, request, pk):
         try:
-            review = self.get_queryset().get(pk=pk)
-            content_type = review.content_type
-            object_id = review.object_id
-            review.delete()
-
-            # Update ratings immediately after deleting
-            Review.update_ratings(content_type, object_id)
+            with transaction.atomic():
+                review = self.get_queryset().select_for_update().get(pk=pk)
+                review.delete()
+                Review.adjust_ratings(
+                    review.content_type, review.object_id, -review.rating, -1
+                )
 
             return Response(status=204)
         except Review.DoesNotExist:
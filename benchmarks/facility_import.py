@@ -0,0 +1,160 @@
+"""
+Benchmark for the bulk facility import.
+
+Writes `--rows` synthetic facilities (default 50k) to a CSV file, each with a
+location, contact, fees, two to four of 40 services and two years of
+population statistics, then imports it into a throwaway test database:
+
+- fresh import, related rows loaded with COPY;
+- the same file again, so every facility is updated in place;
+- fresh import with INSERT (bulk_create) instead of COPY.
+
+Usage:
+    python benchmarks/facility_import.py [--rows 50000] [--batch-size 1000]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "opendataproject.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from edudata import locations  # noqa: E402
+from edudata.location_index import LEVELS, location_errors  # noqa: E402
+from healthdata.facility_import import FacilityImporter  # noqa: E402
+from healthdata.models import HealthFacility, Service  # noqa: E402
+from opendataproject.bulk_import import read_csv  # noqa: E402
+
+SERVICES = [f"Service {i}" for i in range(40)]
+FACILITY_TYPES = ["CLINIC", "HEALTH_CENTER", "HEALTH_POST", "PHARMACY", "HOSPITAL"]
+
+
+def villages():
+    """
+    Returns every (province, district, sector, cell, village) branch the
+    importer accepts. A few village codes are listed under two cells or end
+    with a space, which the importer strips.
+    """
+    branches = []
+    for province, _name in locations.PROVINCES:
+        for district, _name in locations.DISTRICTS.get(province, []):
+            for sector, _name in locations.SECTORS.get(district, []):
+                for cell, _name in locations.CELLS.get(sector, []):
+                    for village, _name in locations.VILLAGES.get(cell, []):
+                        branches.append((province, district, sector, cell, village))
+    return [
+        branch
+        for branch in branches
+        if not location_errors(dict(zip(LEVELS, branch)))
+        and branch[-1] == branch[-1].strip()
+    ]
+
+
+def write_input(path, rows):
+    rng = random.Random(0)
+    branches = villages()
+    with open(path, "w", newline="") as output:
+        writer = csv.writer(output)
+        writer.writerow(
+            [
+                "facility_code",
+                "facility_name",
+                "facility_type",
+                "ownership",
+                "address",
+                "province",
+                "district",
+                "sector",
+                "cell",
+                "village",
+                "phone",
+                "consultation_fee",
+                "accreditation_status",
+                "offered_services",
+                "population_stats",
+            ]
+        )
+        for i in range(rows):
+            population = [
+                {
+                    "year": year,
+                    "total_patients": 1000,
+                    "male_patients": 480,
+                    "female_patients": 520,
+                    "total_staff": 30,
+                    "doctors": 5,
+                    "nurses": 15,
+                    "other_staff": 10,
+                }
+                for year in (2023, 2024)
+            ]
+            writer.writerow(
+                [
+                    f"RW{10000000 + i}",
+                    f"Facility {i}",
+                    rng.choice(FACILITY_TYPES),
+                    "PRIVATE",
+                    f"Street {i}",
+                    *rng.choice(branches),
+                    f"+2507{i:08d}",
+                    "5000",
+                    "ACCREDITED",
+                    ";".join(rng.sample(SERVICES, rng.randint(2, 4))),
+                    json.dumps(population),
+                ]
+            )
+
+
+def run(path, label, **kwargs):
+    with open(path, newline="") as input_file:
+        report = FacilityImporter(**kwargs).run(read_csv(input_file))
+    sys.stdout.write(
+        f"{label:<28} {report.elapsed:>8.1f} {report.rows_per_second:>10.0f} "
+        f"{report.created:>8} {report.updated:>8} {len(report.errors):>7}\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "facilities.csv")
+            write_input(path, args.rows)
+            sys.stdout.write(
+                f"{args.rows} facilities, batches of {args.batch_size}\n"
+                f"{'run':<28} {'time (s)':>8} {'rows/s':>10} "
+                f"{'created':>8} {'updated':>8} {'errors':>7}\n"
+            )
+            run(path, "fresh import, COPY", batch_size=args.batch_size)
+            run(path, "re-import, COPY", batch_size=args.batch_size)
+            HealthFacility.objects.all().delete()
+            Service.objects.all().delete()
+            run(
+                path,
+                "fresh import, INSERT",
+                batch_size=args.batch_size,
+                use_copy=False,
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
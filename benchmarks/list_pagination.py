@@ -0,0 +1,132 @@
+"""
+Benchmark for keyset pagination of the school list.
+
+Fills a throwaway test database with `--rows` schools (default 100k, about a
+fifth of them unrated), then times fetching one page at increasing depths
+for each ordering, with the keyset cursor used by the API and with the
+equivalent LIMIT/OFFSET query for comparison. Keyset pages should take the
+same time at every depth; OFFSET pages grow with the depth.
+
+Usage:
+    python benchmarks/list_pagination.py [--rows 100000] [--number 20] [--keepdb]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "opendataproject.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from decimal import Decimal  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from edudata.models import School  # noqa: E402
+from opendataproject.pagination import KeysetCursorPagination  # noqa: E402
+
+ORDERINGS = ["id", "-average_rating", "updated_at"]
+DEPTHS = [0.0, 0.1, 0.5, 0.99]
+PAGE_SIZE = 20
+
+
+def populate(rows):
+    if School.objects.count() >= rows:
+        return
+    School.objects.all().delete()
+    rng = random.Random(0)
+    batch = []
+    for i in range(rows):
+        rating = None if rng.random() < 0.2 else Decimal(rng.randint(10, 50)) / 10
+        batch.append(
+            School(school_code=i, school_name=f"School {i}", average_rating=rating)
+        )
+        if len(batch) == 5000:
+            School.objects.bulk_create(batch)
+            batch = []
+    School.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE edudata_school")
+
+
+def offset_ordering(ordering):
+    field = ordering.lstrip("-")
+    if ordering.startswith("-"):
+        return [F(field).desc(nulls_last=True), "-id"]
+    return [F(field).asc(nulls_last=True), "id"]
+
+
+def keyset_request(ordering, row=None):
+    """
+    Builds the request for the page after `row`, as a client following
+    `next` links would send it.
+    """
+    factory = APIRequestFactory()
+    params = {"ordering": ordering, "page_size": PAGE_SIZE}
+    request = Request(factory.get("/api/v1/edudata/schools/", params))
+    if row is None:
+        return request
+
+    paginator = KeysetCursorPagination()
+    paginator.paginate_queryset(School.objects.all(), request)
+    link = paginator.encode_cursor(paginator.get_position(row), reversed=False)
+    return Request(factory.get(link))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--keepdb", action="store_true")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        populate(args.rows)
+        sys.stdout.write(
+            f"{args.rows} schools, page size {PAGE_SIZE}, mean of {args.number} runs\n"
+        )
+        sys.stdout.write(
+            f"{'ordering':<16} {'depth':>6} {'keyset (ms)':>12} {'offset (ms)':>12}\n"
+        )
+        for ordering in ORDERINGS:
+            order_by = offset_ordering(ordering)
+            for depth in DEPTHS:
+                offset = int((args.rows - PAGE_SIZE) * depth)
+                row = School.objects.order_by(*order_by)[offset] if offset else None
+                request = keyset_request(ordering, row)
+
+                def keyset():
+                    KeysetCursorPagination().paginate_queryset(
+                        School.objects.all(), request
+                    )
+
+                def offset_page():
+                    list(
+                        School.objects.order_by(*order_by)[offset : offset + PAGE_SIZE]
+                    )
+
+                keyset_ms = timeit.timeit(keyset, number=args.number) / args.number
+                offset_ms = timeit.timeit(offset_page, number=args.number) / args.number
+                sys.stdout.write(
+                    f"{ordering:<16} {depth:>6.0%} "
+                    f"{keyset_ms * 1e3:>12.2f} {offset_ms * 1e3:>12.2f}\n"
+                )
+    finally:
+        if not args.keepdb:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    with override_settings(ALLOWED_HOSTS=["*"]):
+        main()
@@ -0,0 +1,95 @@
+"""
+Cold-start benchmark for loading the administrative hierarchy.
+
+Each scenario runs in a fresh interpreter and reports the wall time and the
+resident memory growth of making PROVINCES/DISTRICTS/SECTORS/CELLS/VILLAGES
+available:
+
+- literal, no bytecode: import edudata.location_data with an empty pycache,
+  as on a serverless cold start without a writable/cached __pycache__
+- literal, cached .pyc: import edudata.location_data from bytecode
+- snapshot, all levels: edudata.locations loaded from location_data.snapshot
+- snapshot, provinces: edudata.locations with only PROVINCES accessed
+
+Usage:
+    python benchmarks/location_import.py [--repeat 5]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, {base_dir!r})
+sys.pycache_prefix = {pycache_prefix!r}
+sys.dont_write_bytecode = {cold!r}
+
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=[], USE_I18N=True)
+django.setup()
+
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+module = __import__({module!r}, fromlist=["*"])
+for name in {names!r}:
+    getattr(module, name)
+elapsed = time.perf_counter() - start
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+json.dump({{"ms": elapsed * 1000, "rss_kib": rss_after - rss_before}}, sys.stdout)
+"""
+
+ALL_LEVELS = ["PROVINCES", "DISTRICTS", "SECTORS", "CELLS", "VILLAGES"]
+
+
+def run(module, names, pycache_prefix, cold):
+    code = CHILD.format(
+        base_dir=str(BASE_DIR),
+        pycache_prefix=pycache_prefix,
+        cold=cold,
+        module=module,
+        names=names,
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("literal, no bytecode", "edudata.location_data", ALL_LEVELS, True),
+        ("literal, cached .pyc", "edudata.location_data", ALL_LEVELS, False),
+        ("snapshot, all levels", "edudata.locations", ALL_LEVELS, False),
+        ("snapshot, provinces", "edudata.locations", ["PROVINCES"], False),
+    ]
+
+    # Bytecode for the warm scenarios goes to a private pycache, primed once.
+    warm_prefix = tempfile.mkdtemp(prefix="location-import-pycache-")
+    cold_prefix = tempfile.mkdtemp(prefix="location-import-empty-")
+    for _label, module, names, cold in scenarios:
+        if not cold:
+            run(module, names, warm_prefix, cold=False)
+
+    sys.stdout.write(f"{'scenario':<24}{'time (ms)':>12}{'rss (KiB)':>12}\n")
+    for label, module, names, cold in scenarios:
+        prefix = cold_prefix if cold else warm_prefix
+        results = [run(module, names, prefix, cold) for _ in range(args.repeat)]
+        best_ms = min(r["ms"] for r in results)
+        rss_kib = min(r["rss_kib"] for r in results)
+        sys.stdout.write(f"{label:<24}{best_ms:>12.1f}{rss_kib:>12}\n")
+
+
+if __name__ == "__main__":
+    main()
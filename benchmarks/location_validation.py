@@ -0,0 +1,107 @@
+"""
+Microbenchmark for the location code validators.
+
+Compares the per-call latency of the previous list-scanning implementation of
+`validate_independent_location_codes` / `validate_hierarchical_location_codes`
+with the current one backed by `edudata.location_index`.
+
+Usage:
+    python benchmarks/location_validation.py [--number 200]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "opendataproject.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from edudata.location_data import (  # noqa: E402
+    PROVINCES,
+    DISTRICTS,
+    SECTORS,
+    CELLS,
+    VILLAGES,
+)
+from edudata.validators import (  # noqa: E402
+    validate_independent_location_codes,
+    validate_hierarchical_location_codes,
+)
+
+
+def legacy_independent(province, district, sector, cell, village):
+    """The list-flattening implementation the index replaced."""
+    valid = True
+    valid &= province in [p[0] for p in PROVINCES]
+    valid &= district in [d[0] for ds in DISTRICTS.values() for d in ds]
+    valid &= sector in [s[0] for ss in SECTORS.values() for s in ss]
+    valid &= cell in [c[0] for cs in CELLS.values() for c in cs]
+    valid &= village in [v[0] for vs in VILLAGES.values() for v in vs]
+    return valid
+
+
+def legacy_hierarchical(province, district, sector, cell, village):
+    """The per-parent list scan the index replaced."""
+    valid = True
+    valid &= province in [p[0] for p in PROVINCES]
+    valid &= district in [d[0] for d in DISTRICTS.get(province, [])]
+    valid &= sector in [s[0] for s in SECTORS.get(district, [])]
+    valid &= cell in [c[0] for c in CELLS.get(sector, [])]
+    valid &= village in [v[0] for v in VILLAGES.get(cell, [])]
+    return valid
+
+
+def sample_chain():
+    """Picks the last village in the data set, the worst case for a scan."""
+    cell, villages = list(VILLAGES.items())[-1]
+    village = villages[-1][0]
+    sector = next(s for s, cells in CELLS.items() if cell in dict(cells))
+    district = next(d for d, sectors in SECTORS.items() if sector in dict(sectors))
+    province = next(
+        p for p, districts in DISTRICTS.items() if district in dict(districts)
+    )
+    return {
+        "province": province,
+        "district": district,
+        "sector": sector,
+        "cell": cell,
+        "village": village,
+    }
+
+
+def per_call_us(func, kwargs, number):
+    total = min(timeit.repeat(lambda: func(**kwargs), number=number, repeat=5))
+    return total / number * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    codes = sample_chain()
+    rows = [
+        ("independent", legacy_independent, validate_independent_location_codes),
+        ("hierarchical", legacy_hierarchical, validate_hierarchical_location_codes),
+    ]
+
+    sys.stdout.write(
+        f"{'validator':<14}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}\n"
+    )
+    for name, before_func, after_func in rows:
+        before = per_call_us(before_func, codes, args.number)
+        after = per_call_us(after_func, codes, args.number)
+        sys.stdout.write(
+            f"{name:<14}{before:>14.2f}{after:>14.2f}{before / after:>9.0f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,9 @@ echo "Building Project Packages........"
 python3.12 -m pip install --upgrade pip
 pip3.12 install -r requirements.txt
 
+echo "Checking the location snapshot........"
+python3.12 manage.py build_location_snapshot --check
+
 echo "Migrating the Databases........."
 # python3 manage.py makemigrations --noinput
 python3.12 manage.py migrate --noinput
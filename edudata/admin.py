@@ -1,4 +1,9 @@
-from django.contrib import admin
+import io
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from .models import (
     School,
     SchoolImage,
@@ -9,7 +14,9 @@ from .models import (
     SchoolGovernmentData,
     AdmissionPolicy,
 )
-from .forms import SchoolLocationForm
+from .forms import SchoolLocationForm, SchoolImportForm
+from opendataproject.bulk_import import read_records
+from .school_import import SchoolImporter
 
 
 class SchoolImageInline(admin.TabularInline):
@@ -31,6 +38,51 @@ class SchoolAdmin(admin.ModelAdmin):
     search_fields = ("school_name",)
     inlines = [SchoolImageInline]
 
+    def get_urls(self):
+        return [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="edudata_school_import",
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        """
+        Imports an uploaded CSV or NDJSON file of schools, see
+        edudata.school_import.
+        """
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = SchoolImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            stream = io.TextIOWrapper(
+                form.cleaned_data["file"].file, encoding="utf-8-sig", newline=""
+            )
+            importer = SchoolImporter(
+                created_by=request.user, dry_run=form.cleaned_data["dry_run"]
+            )
+            report = importer.run(read_records(stream, form.cleaned_data["format"]))
+
+            level = messages.WARNING if report.errors else messages.SUCCESS
+            self.message_user(request, report.summary(), level)
+            for line_number, message in report.errors[:20]:
+                self.message_user(
+                    request, f"Line {line_number}: {message}", messages.ERROR
+                )
+            return redirect("admin:edudata_school_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import schools",
+            "form": form,
+        }
+        return TemplateResponse(
+            request, "admin/edudata/school/import_schools.html", context
+        )
+
 
 @admin.register(SchoolImage)
 class SchoolImageAdmin(admin.ModelAdmin):
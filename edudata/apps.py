@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EdudataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "edudata"
+
+    def ready(self):
+        # Connects the receivers that keep the search backend up to date.
+        from . import search_index  # noqa: F401
@@ -1,6 +1,7 @@
 from django import forms
 from .models import SchoolLocation
-from .location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+from . import locations
+from opendataproject.bulk_import import FORMATS, detect_format
 
 
 class SchoolLocationForm(forms.ModelForm):
@@ -8,7 +9,7 @@ class SchoolLocationForm(forms.ModelForm):
         model = SchoolLocation
         fields = "__all__"
         widgets = {
-            "province": forms.Select(choices=[("", "---------")] + list(PROVINCES)),
+            "province": forms.Select(),
             "district": forms.Select(),
             "sector": forms.Select(),
             "cell": forms.Select(),
@@ -18,8 +19,10 @@ class SchoolLocationForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Populate province choices
-        self.fields["province"].widget.choices = [("", "---------")] + list(PROVINCES)
+        # Populate province choices (loaded on first use, not at import)
+        self.fields["province"].widget.choices = [("", "---------")] + list(
+            locations.PROVINCES
+        )
 
         # Get initial values
         province = (
@@ -39,22 +42,44 @@ class SchoolLocationForm(forms.ModelForm):
 
         # Set choices dynamically
         self.fields["district"].widget.choices = (
-            [("", "---------")] + DISTRICTS.get(province, [])
+            [("", "---------")] + locations.DISTRICTS.get(province, [])
             if province
             else [("", "---------")]
         )
         self.fields["sector"].widget.choices = (
-            [("", "---------")] + SECTORS.get(district, [])
+            [("", "---------")] + locations.SECTORS.get(district, [])
             if district
             else [("", "---------")]
         )
         self.fields["cell"].widget.choices = (
-            [("", "---------")] + CELLS.get(sector, [])
+            [("", "---------")] + locations.CELLS.get(sector, [])
             if sector
             else [("", "---------")]
         )
         self.fields["village"].widget.choices = (
-            [("", "---------")] + VILLAGES.get(cell, [])
+            [("", "---------")] + locations.VILLAGES.get(cell, [])
             if cell
             else [("", "---------")]
         )
+
+
+class SchoolImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV with a header row, or newline-delimited JSON (.ndjson)"
+    )
+    format = forms.ChoiceField(
+        choices=[("", "From the file extension")] + [(f, f.upper()) for f in FORMATS],
+        required=False,
+    )
+    dry_run = forms.BooleanField(
+        required=False, help_text="Only validate the file, save nothing"
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get("file")
+        if upload and not cleaned_data.get("format"):
+            cleaned_data["format"] = detect_format(upload.name)
+            if cleaned_data["format"] is None:
+                self.add_error("format", "Choose the format of this file")
+        return cleaned_data
@@ -0,0 +1,152 @@
+"""
+Precomputed lookup tables for the administrative hierarchy in location_data.
+
+The tables are built on first use and shared by the validators, serializers
+and views of both the edudata and healthdata apps. They turn code membership,
+parent-child checks and ancestor resolution into constant-time lookups instead
+of scanning the nested location lists on every request.
+
+Each level is indexed independently, so validating a province code never
+loads the village tables.
+"""
+
+from functools import cache
+
+from . import locations
+
+
+LEVELS = ("province", "district", "sector", "cell", "village")
+
+_CHILDREN_BY_PARENT = {
+    "district": "DISTRICTS",
+    "sector": "SECTORS",
+    "cell": "CELLS",
+    "village": "VILLAGES",
+}
+
+
+@cache
+def parents(level):
+    """
+    Maps every code of a child level to the code of the entry it is listed
+    under. The first occurrence wins when a code is listed more than once.
+    """
+    children_by_parent = getattr(locations, _CHILDREN_BY_PARENT[level])
+    parent_map = {}
+    for parent_code, children in children_by_parent.items():
+        for code, _name in children:
+            parent_map.setdefault(code, parent_code)
+    return parent_map
+
+
+@cache
+def codes(level):
+    """
+    Returns the set of codes that exist at the given level.
+    """
+    if level == "province":
+        return frozenset(code for code, _name in locations.PROVINCES)
+    return frozenset(parents(level))
+
+
+@cache
+def _hierarchy():
+    """
+    Builds the cross-level tables used for ancestor resolution:
+    child code -> parent code, code -> level and code -> display name.
+    The first occurrence wins when a code is listed more than once.
+    """
+    parent_of = {}
+    for level in LEVELS[1:]:
+        parent_of.update(parents(level))
+
+    level_of = {code: level for level in LEVELS for code in codes(level)}
+
+    names = dict(locations.PROVINCES)
+    for level in LEVELS[1:]:
+        children_by_parent = getattr(locations, _CHILDREN_BY_PARENT[level])
+        for children in children_by_parent.values():
+            for code, name in children:
+                names.setdefault(code, name)
+    return parent_of, level_of, names
+
+
+def is_valid_code(level, code):
+    """
+    Returns True if `code` exists at the given administrative level.
+    """
+    return code in codes(level)
+
+
+def is_valid_child(level, code, parent_code):
+    """
+    Returns True if `code` exists at the given level and is listed
+    directly under `parent_code` (e.g. a district under its province).
+    """
+    parent = parents(level).get(code)
+    return parent is not None and parent == parent_code
+
+
+def get_location(code):
+    """
+    Returns {"level", "code", "name"} for any location code,
+    or None if the code does not exist.
+    """
+    _parent_of, level_of, names = _hierarchy()
+    level = level_of.get(code)
+    if level is None:
+        return None
+    return {"level": level, "code": code, "name": names[code]}
+
+
+def get_ancestors(code):
+    """
+    Returns the chain of locations above `code`, ordered from the province
+    down to the direct parent. The chain is at most four entries long, so the
+    lookup takes constant time. Returns None if the code does not exist.
+    """
+    parent_of, level_of, _names = _hierarchy()
+    if code not in level_of:
+        return None
+
+    ancestors = []
+    parent = parent_of.get(code)
+    while parent is not None:
+        ancestors.append(get_location(parent))
+        parent = parent_of.get(parent)
+
+    ancestors.reverse()
+    return ancestors
+
+
+def location_errors(location):
+    """
+    Checks that the codes of a {level: code} mapping form one branch of the
+    hierarchy, returning {level: [message]} for the first wrong level or an
+    empty dict.
+    """
+    parent_level = parent_code = None
+    for level in LEVELS:
+        code = location.get(level)
+        if code is None:
+            return {level: ["This field is required."]}
+        if parent_code is None:
+            if not is_valid_code(level, code):
+                return {level: [f"Invalid {level} code"]}
+        elif not is_valid_child(level, code, parent_code):
+            return {level: [f"Invalid {level} code for the selected {parent_level}"]}
+        parent_level, parent_code = level, code
+    return {}
+
+
+def location_text(location):
+    """
+    Returns the address and the names of the codes of a {level: code}
+    mapping as one string, skipping unknown codes, for search documents.
+    """
+    parts = [location.get("address") or ""]
+    for level in LEVELS:
+        entry = get_location(location.get(level))
+        if entry is not None:
+            parts.append(entry["name"])
+    return " ".join(part for part in parts if part)
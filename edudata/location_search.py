@@ -0,0 +1,146 @@
+"""
+In-memory name search over every level of the administrative hierarchy.
+
+Names are normalized (accents stripped, case folded, punctuation collapsed
+to single spaces) and indexed two ways, built once on first search:
+
+- per level, sorted lists of the names and of every later word-start
+  suffix of each name, so a prefix of the name ("kicu") or of any of its
+  words ("city") is found with a binary search;
+- a trigram -> entries map, used to find matches in the middle of a word
+  when the prefix search does not fill the requested number of results.
+
+Prefix matches come first, ordered by level (provinces first), then names
+starting with the query before names with a later word starting with it,
+then alphabetically. Substring matches follow in the same level order.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import cache
+
+from .location_index import LEVELS, codes, get_location
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """
+    Lowercases `text`, strips accents and collapses anything that is not a
+    letter or digit into single spaces.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _SEPARATORS.sub(" ", stripped.casefold()).strip()
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class LocationSearchIndex:
+    def __init__(self):
+        # Entries are sorted by level then name, so entry ids double as rank.
+        entries = []
+        for level in LEVELS:
+            level_entries = [get_location(code) for code in codes(level)]
+            level_entries.sort(
+                key=lambda entry: (normalize(entry["name"]), entry["code"])
+            )
+            entries.extend(level_entries)
+        self.entries = entries
+        self.names = [normalize(entry["name"]) for entry in entries]
+
+        # Per level: (normalized name, id) and (later word of the name, id).
+        self.name_prefixes = {level: [] for level in LEVELS}
+        self.word_prefixes = {level: [] for level in LEVELS}
+        self.trigrams = {}
+        for entry_id, (entry, name) in enumerate(zip(entries, self.names)):
+            self.name_prefixes[entry["level"]].append((name, entry_id))
+            for match in re.finditer(" ", name):
+                self.word_prefixes[entry["level"]].append(
+                    (name[match.end() :], entry_id)
+                )
+            for trigram in _trigrams(name):
+                self.trigrams.setdefault(trigram, set()).add(entry_id)
+
+        for prefixes in self.word_prefixes.values():
+            prefixes.sort()
+
+    @staticmethod
+    def _prefix_matches(prefixes, query, limit):
+        matches = []
+        position = bisect_left(prefixes, (query,))
+        while position < len(prefixes) and len(matches) < limit:
+            prefix, entry_id = prefixes[position]
+            if not prefix.startswith(query):
+                break
+            matches.append(entry_id)
+            position += 1
+        return matches
+
+    def _substring_matches(self, query, levels):
+        postings = [self.trigrams.get(trigram, set()) for trigram in _trigrams(query)]
+        candidates = set.intersection(*sorted(postings, key=len))
+        return sorted(
+            entry_id
+            for entry_id in candidates
+            if self.entries[entry_id]["level"] in levels
+            and query in self.names[entry_id]
+        )
+
+    def search(self, query, level=None, limit=DEFAULT_LIMIT):
+        """
+        Returns up to `limit` locations whose name contains `query`, preferring
+        names with a word starting with it. `level` restricts the search to one
+        administrative level.
+        """
+        query = normalize(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        levels = LEVELS if level is None else (level,)
+        found = []
+        seen = set()
+
+        def add(entry_ids):
+            for entry_id in entry_ids:
+                if entry_id not in seen and len(found) < limit:
+                    seen.add(entry_id)
+                    found.append(entry_id)
+
+        # Within a level, names starting with the query rank above names
+        # with a later word starting with it.
+        for search_level in levels:
+            add(self._prefix_matches(self.name_prefixes[search_level], query, limit))
+            word_matches = self._prefix_matches(
+                self.word_prefixes[search_level], query, limit
+            )
+            add(sorted(word_matches))
+            if len(found) >= limit:
+                break
+
+        if len(found) < limit and len(query) >= 3:
+            add(self._substring_matches(query, levels))
+
+        return [dict(self.entries[entry_id]) for entry_id in found]
+
+
+@cache
+def get_search_index():
+    """
+    Returns the process-wide search index, building it on first use.
+    """
+    return LocationSearchIndex()
+
+
+def search_locations(query, level=None, limit=DEFAULT_LIMIT):
+    """
+    Searches location names, see LocationSearchIndex.search.
+    """
+    return get_search_index().search(query, level=level, limit=limit)
@@ -0,0 +1,158 @@
+"""
+Pre-serialized snapshot of the administrative hierarchy in location_data.
+
+Importing location_data.py means compiling ~23k lines of nested literals,
+which dominates worker cold starts whenever no bytecode cache is available.
+The snapshot stores the same hierarchy as flat, array-backed tables
+(one row per entry: code suffix, name, parent row; rows grouped by level)
+that are loaded with a single zlib + marshal call.
+
+Rebuild it after editing location_data.py with:
+    python manage.py build_location_snapshot
+"""
+
+import hashlib
+import marshal
+import zlib
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+LEVELS = ("province", "district", "sector", "cell", "village")
+
+FORMAT_VERSION = 1
+SOURCE_PATH = Path(__file__).with_name("location_data.py")
+SNAPSHOT_PATH = Path(__file__).with_name("location_data.snapshot")
+
+
+def source_digest(path=SOURCE_PATH):
+    """
+    Returns the sha256 digest of location_data.py, used to detect a stale snapshot.
+    """
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def build_snapshot():
+    """
+    Compiles location_data into the snapshot format and returns the bytes.
+
+    Child codes are stored as the suffix after their parent code
+    (e.g. "NG" for "RW.KL.NG" under "RW.KL"), and parents as row indexes.
+    """
+    from .location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+
+    suffixes, names, parents = [], [], array("i")
+    level_starts = [0]
+    row_of = {}
+
+    for code, name in PROVINCES:
+        row_of.setdefault(code, len(suffixes))
+        suffixes.append(code)
+        names.append(name)
+        parents.append(-1)
+
+    for children_by_parent in (DISTRICTS, SECTORS, CELLS, VILLAGES):
+        level_starts.append(len(suffixes))
+        for parent_code, children in children_by_parent.items():
+            if parent_code not in row_of:
+                raise ValueError(f"Unknown parent location code: {parent_code}")
+            prefix = f"{parent_code}."
+            for code, name in children:
+                if not code.startswith(prefix):
+                    raise ValueError(
+                        f"Location code {code} is not prefixed by its parent {parent_code}"
+                    )
+                row_of.setdefault(code, len(suffixes))
+                suffixes.append(code[len(prefix) :])
+                names.append(name)
+                parents.append(row_of[parent_code])
+    level_starts.append(len(suffixes))
+
+    payload = {
+        "version": FORMAT_VERSION,
+        "source_digest": source_digest(),
+        "suffixes": tuple(suffixes),
+        "names": tuple(names),
+        "parents": parents.tobytes(),
+        "level_starts": tuple(level_starts),
+    }
+    return zlib.compress(marshal.dumps(payload), 9)
+
+
+def write_snapshot(path=SNAPSHOT_PATH):
+    """
+    Builds the snapshot and writes it to `path`. Returns the number of bytes written.
+    """
+    data = build_snapshot()
+    Path(path).write_bytes(data)
+    return len(data)
+
+
+def read_snapshot(path=SNAPSHOT_PATH):
+    """
+    Reads a snapshot and returns its payload, or None if it is missing,
+    written in another format version, or built from a different
+    location_data.py than the one on disk.
+    """
+    try:
+        payload = marshal.loads(zlib.decompress(Path(path).read_bytes()))
+    except (OSError, ValueError, EOFError, TypeError, zlib.error):
+        return None
+
+    if payload.get("version") != FORMAT_VERSION:
+        return None
+    if payload.get("source_digest") != source_digest():
+        return None
+    return payload
+
+
+def is_current(path=SNAPSHOT_PATH):
+    """
+    Returns True if the snapshot at `path` matches the current location_data.py.
+    """
+    return read_snapshot(path) is not None
+
+
+class LocationTables:
+    """
+    Array-backed view over a snapshot payload.
+
+    Full codes are rebuilt once on construction; the per-level structures
+    exposed by location_data (PROVINCES list, DISTRICTS/... dicts) are only
+    materialized when `level_entries` is called for that level.
+    """
+
+    def __init__(self, payload):
+        self.names = payload["names"]
+        self.parents = array("i")
+        self.parents.frombytes(payload["parents"])
+        self.level_starts = payload["level_starts"]
+
+        codes = []
+        for suffix, parent in zip(payload["suffixes"], self.parents):
+            codes.append(suffix if parent < 0 else f"{codes[parent]}.{suffix}")
+        self.codes = codes
+
+    def level_entries(self, level):
+        """
+        Returns the entries of one level in the shape used by location_data:
+        a list of (code, name) for provinces, and a dict of
+        parent code -> list of (code, name) for every other level.
+        """
+        level_index = LEVELS.index(level)
+        start = self.level_starts[level_index]
+        end = self.level_starts[level_index + 1]
+        rows = zip(
+            self.parents[start:end], self.codes[start:end], self.names[start:end]
+        )
+
+        if level_index == 0:
+            return [(code, name) for _parent, code, name in rows]
+
+        # Rows are stored grouped by parent, in the order of location_data.
+        entries = {}
+        for parent, group in groupby(rows, key=itemgetter(0)):
+            children = entries.setdefault(self.codes[parent], [])
+            children.extend((code, name) for _parent, code, name in group)
+        return entries
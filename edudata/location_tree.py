@@ -0,0 +1,90 @@
+"""
+Pre-rendered location tree responses.
+
+The hierarchy never changes while a process is running, so the tree (or a
+subtree below a given code) is serialized to JSON and gzip-compressed once,
+on first request, and the same bytes are served to every later request.
+
+Every body carries a `version`: a digest of the whole hierarchy that changes
+whenever location_data.py does. Clients can pin it in the URL to get a
+response that is safe to cache forever.
+"""
+
+import gzip
+import hashlib
+import json
+from functools import cache, lru_cache
+from typing import NamedTuple
+
+from . import locations
+from .location_index import LEVELS, get_location
+
+
+_CHILDREN = {
+    "province": "DISTRICTS",
+    "district": "SECTORS",
+    "sector": "CELLS",
+    "cell": "VILLAGES",
+}
+
+
+class RenderedTree(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+def _node(level, code, name):
+    """
+    Builds {"code", "name", "children"} for one location and everything below
+    it. Villages have no children key.
+    """
+    node = {"code": code, "name": name}
+    if level != LEVELS[-1]:
+        child_level = LEVELS[LEVELS.index(level) + 1]
+        children = getattr(locations, _CHILDREN[level]).get(code, [])
+        node["children"] = [
+            _node(child_level, child_code, child_name)
+            for child_code, child_name in children
+        ]
+    return node
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@cache
+def _provinces():
+    return [_node("province", code, name) for code, name in locations.PROVINCES]
+
+
+@cache
+def tree_version():
+    """
+    Returns a short digest of the whole hierarchy.
+    """
+    return hashlib.sha256(_encode(_provinces())).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1024)
+def render_tree(code=None):
+    """
+    Returns the rendered tree below `code` (the whole hierarchy when `code`
+    is None), or None if the code does not exist.
+    """
+    if code is None:
+        data = {"version": tree_version(), "provinces": _provinces()}
+    else:
+        location = get_location(code)
+        if location is None:
+            return None
+        data = {
+            "version": tree_version(),
+            "level": location["level"],
+            **_node(location["level"], code, location["name"]),
+        }
+
+    body = _encode(data)
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return RenderedTree(body, gzip.compress(body, compresslevel=9, mtime=0), digest)
@@ -0,0 +1,50 @@
+"""
+Lazily loaded administrative hierarchy.
+
+Exposes the same PROVINCES, DISTRICTS, SECTORS, CELLS and VILLAGES structures
+as location_data, but nothing is loaded until one of them is first accessed.
+They are then read from the pre-serialized snapshot (see location_snapshot),
+falling back to importing location_data.py when the snapshot is missing or
+out of date. Each level is materialized on its own first access and cached.
+"""
+
+from .location_snapshot import LocationTables, read_snapshot
+
+_ATTRIBUTES = {
+    "PROVINCES": "province",
+    "DISTRICTS": "district",
+    "SECTORS": "sector",
+    "CELLS": "cell",
+    "VILLAGES": "village",
+}
+
+_tables = None
+
+
+def _load_tables():
+    """
+    Returns the snapshot tables, or False if the snapshot cannot be used.
+    """
+    global _tables
+    if _tables is None:
+        payload = read_snapshot()
+        _tables = LocationTables(payload) if payload is not None else False
+    return _tables
+
+
+def __getattr__(name):
+    level = _ATTRIBUTES.get(name)
+    if level is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    tables = _load_tables()
+    if tables:
+        value = tables.level_entries(level)
+    else:
+        from . import location_data
+
+        value = getattr(location_data, name)
+
+    # Cache on the module so later lookups skip __getattr__ entirely.
+    globals()[name] = value
+    return value
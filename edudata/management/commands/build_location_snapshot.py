@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from edudata.location_snapshot import SNAPSHOT_PATH, is_current, write_snapshot
+
+
+class Command(BaseCommand):
+    help = "Compiles edudata/location_data.py into the pre-serialized location snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Exit with an error if the snapshot is missing or out of date",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            if not is_current():
+                raise CommandError(
+                    f"{SNAPSHOT_PATH.name} is out of date. "
+                    "Run `python manage.py build_location_snapshot`."
+                )
+            self.stdout.write(self.style.SUCCESS(f"{SNAPSHOT_PATH.name} is up to date"))
+            return
+
+        size = write_snapshot()
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {SNAPSHOT_PATH.name} ({size / 1024:.1f} KiB)")
+        )
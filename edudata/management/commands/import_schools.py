@@ -0,0 +1,10 @@
+from edudata.school_import import SchoolImporter
+from opendataproject.bulk_import import BaseImportCommand
+
+
+class Command(BaseImportCommand):
+    help = (
+        "Imports schools and their location, contact, fees, government data "
+        "and admission policy from a CSV or NDJSON file"
+    )
+    importer_class = SchoolImporter
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: set up Django and load the URLconf, which
+# imports every view module, the way a worker does before its first request.
+STARTUP_SCRIPT = """
+import django
+from django.conf import settings
+from django.urls import get_resolver
+
+django.setup()
+get_resolver(settings.ROOT_URLCONF).url_patterns
+"""
+
+
+def parse_import_times(output):
+    """
+    Parses the `-X importtime` report into a list of
+    (module, self_us, cumulative_us, depth) tuples.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        rows.append((module, int(fields[0]), int(fields[1]), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports per-module import time of a fresh worker "
+        "(Django setup and URLconf loading)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of modules to list (default: 20)",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Include third-party and standard library modules",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Column to sort by (default: cumulative)",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Ignore existing bytecode caches, as on a freshly deployed worker",
+        )
+
+    def handle(self, *args, **options):
+        env = os.environ.copy()
+        env["DJANGO_SETTINGS_MODULE"] = settings.SETTINGS_MODULE
+
+        with tempfile.TemporaryDirectory() as pycache_prefix:
+            if options["cold"]:
+                env["PYTHONPYCACHEPREFIX"] = pycache_prefix
+                env["PYTHONDONTWRITEBYTECODE"] = "1"
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+
+        rows = parse_import_times(result.stderr)
+        if result.returncode != 0 or not rows:
+            errors = [
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            ]
+            raise CommandError("Worker startup failed:\n" + "\n".join(errors[-20:]))
+
+        total = sum(
+            cumulative for _module, _self, cumulative, depth in rows if depth == 0
+        )
+
+        if not options["all"]:
+            local_packages = {
+                path.name
+                for path in Path(settings.BASE_DIR).iterdir()
+                if (path / "__init__.py").exists()
+            }
+            rows = [row for row in rows if row[0].split(".")[0] in local_packages]
+
+        column = 1 if options["sort"] == "self" else 2
+        rows.sort(key=lambda row: row[column], reverse=True)
+
+        self.stdout.write(f"{'self (ms)':>10} {'cumulative (ms)':>16}  module")
+        for module, self_us, cumulative_us, _depth in rows[: options["top"]]:
+            self.stdout.write(
+                f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>16.1f}  {module}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Total import time: {total / 1000:.1f} ms")
+        )
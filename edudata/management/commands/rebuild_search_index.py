@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from opendataproject.search import get_backend, searchable_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search backend's data for every school and health "
+        "facility, e.g. after adding the search columns or changing how "
+        "documents are built"
+    )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        for model in searchable_models():
+            count = backend.rebuild(model)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {count} indexed")
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edudata", "0007_school_created_by_alter_school_verified_by"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="school",
+            index=models.Index(
+                fields=["average_rating", "id"], name="school_rating_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="school",
+            index=models.Index(
+                fields=["updated_at", "id"], name="school_updated_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edudata", "0010_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="schoollocation",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="school_location_coords_idx"
+            ),
+        ),
+    ]
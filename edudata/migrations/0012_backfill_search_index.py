@@ -0,0 +1,46 @@
+from django.db import migrations
+
+from edudata.location_index import LEVELS, location_text
+from opendataproject.search import UPDATE_BATCH_SIZE, write_search_columns
+
+
+def backfill_search_columns(apps, schema_editor):
+    """
+    Fills the search columns of the schools created before they were added,
+    like School.search_documents. Later changes update them as they happen.
+    """
+    School = apps.get_model("edudata", "School")
+    SchoolLocation = apps.get_model("edudata", "SchoolLocation")
+    pks = list(
+        School.objects.filter(is_deleted=False)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    for start in range(0, len(pks), UPDATE_BATCH_SIZE):
+        batch = pks[start : start + UPDATE_BATCH_SIZE]
+        related = {}
+        for location in SchoolLocation.objects.filter(school__in=batch).values(
+            "school_id", "address", *LEVELS
+        ):
+            related.setdefault(location["school_id"], []).append(
+                location_text(location)
+            )
+        write_search_columns(
+            School,
+            {
+                pk: (name, description, " ".join(related.get(pk, [])))
+                for pk, name, description in School.objects.filter(
+                    pk__in=batch
+                ).values_list("pk", "school_name", "school_description")
+            },
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("edudata", "0011_location_coordinates_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+    ]
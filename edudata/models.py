@@ -1,7 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F, OuterRef, Subquery
 from django.core.validators import MinValueValidator, MaxValueValidator
 import re as regex
 from accounts.models import CustomUser
+from .location_index import LEVELS, location_text
 
 
 class SchoolChoices:
@@ -84,6 +88,8 @@ class School(models.Model):
         max_digits=3, decimal_places=2, blank=True, null=True
     )
     review_count = models.IntegerField(default=0)
+    # Running total of the review ratings, see Review.adjust_ratings.
+    rating_sum = models.IntegerField(default=0)
     verified = models.BooleanField(default=False)
     verified_by = models.ForeignKey(
         CustomUser,
@@ -104,10 +110,56 @@ class School(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
+    # Maintained from search_documents() by the PostgreSQL search backend,
+    # see opendataproject.search.
+    search_name = models.CharField(max_length=500, default="", editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        # Keyset pagination sorts by these keys with the id as tie-breaker.
+        indexes = [
+            models.Index(fields=["average_rating", "id"], name="school_rating_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="school_updated_id_idx"),
+            GinIndex(fields=["search_vector"], name="school_search_idx"),
+        ]
 
     def __str__(self):
         return self.school_name
 
+    @staticmethod
+    def leaderboard_keys():
+        """
+        Expressions for the keys schools are ranked by in leaderboards (see
+        accounts.models.RatingRollup), from the school's first location.
+        """
+        locations = SchoolLocation.objects.filter(school=OuterRef("pk")).order_by("pk")
+        return {
+            "province": Subquery(locations.values("province")[:1]),
+            "district": Subquery(locations.values("district")[:1]),
+            "kind": F("school_type"),
+        }
+
+    @classmethod
+    def search_documents(cls, pks):
+        """
+        Returns {pk: (name, description, related text)} of the given schools
+        that are not deleted, for search (see opendataproject.search), the
+        related text being their locations.
+        """
+        related = {}
+        for location in SchoolLocation.objects.filter(school__in=pks).values(
+            "school_id", "address", *LEVELS
+        ):
+            related.setdefault(location["school_id"], []).append(
+                location_text(location)
+            )
+        return {
+            pk: (name, description, " ".join(related.get(pk, [])))
+            for pk, name, description in cls.objects.filter(
+                pk__in=pks, is_deleted=False
+            ).values_list("pk", "school_name", "school_description")
+        }
+
 
 class SchoolImage(models.Model):
     """
@@ -162,6 +214,14 @@ class SchoolLocation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Bounding-box prefilter of proximity queries, see opendataproject.geo.
+        indexes = [
+            models.Index(
+                fields=["latitude", "longitude"], name="school_location_coords_idx"
+            )
+        ]
+
     def __str__(self):
         return f"{self.province} - {self.district}"
 
@@ -0,0 +1,111 @@
+"""
+Bulk import of schools from CSV or NDJSON registry files.
+
+Each record is a flat row holding a school and, optionally, its location,
+contact, fees, government data and admission policy, with the model field
+names as columns (see SCHOOL_COLUMNS and RELATED_COLUMNS):
+
+    school_code,school_name,school_type,province,district,...,phone_number
+
+Records are validated in Python without any queries: model field rules and
+choices (matched case-insensitively on value or label), and location codes
+against the in-memory hierarchy. A record that fails is reported with its
+line number and skipped, the rest of its batch is still imported.
+
+Valid records are written in batches, one transaction per batch:
+
+- schools are upserted on `school_code` with a single INSERT ... ON CONFLICT,
+  updating the school columns that appear in the batch;
+- for each related model, the batch's schools that have data for it get
+  their existing rows replaced, loaded with PostgreSQL COPY (bulk_create on
+  other databases). Records without any of a model's columns leave that
+  model's rows untouched.
+"""
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from opendataproject.bulk_import import BulkImporter, clean_columns, has_values
+from opendataproject.search import schedule_search_update
+from .location_index import LEVELS, location_errors
+from .models import (
+    School,
+    SchoolLocation,
+    SchoolContact,
+    SchoolFees,
+    SchoolGovernmentData,
+    AdmissionPolicy,
+)
+
+SCHOOL_COLUMNS = [
+    "school_code",
+    "school_name",
+    "school_type",
+    "school_level",
+    "school_gender",
+    "school_ownership",
+    "school_description",
+]
+REQUIRED_COLUMNS = ["school_code", "school_name"]
+RELATED_COLUMNS = {
+    SchoolLocation: [*LEVELS, "address", "latitude", "longitude"],
+    SchoolContact: ["phone_number", "whatsapp", "email", "website"],
+    SchoolFees: ["currency", "amount"],
+    SchoolGovernmentData: ["government_supported", "registration_date"],
+    AdmissionPolicy: ["admission_policy", "discipline_policy", "parental_engagement"],
+}
+
+
+class SchoolImporter(BulkImporter):
+    """
+    Imports records from read_csv/read_ndjson, see the module docstring.
+    """
+
+    model = School
+    key_field = "school_code"
+
+    def __init__(self, created_by=None, **kwargs):
+        super().__init__(**kwargs)
+        self.created_by = created_by
+
+    def clean_record(self, record):
+        """
+        Returns (school values, {related model: values}).
+        """
+        if isinstance(record, str):
+            raise ValidationError(record)
+
+        errors = {}
+        school = clean_columns(School, SCHOOL_COLUMNS, record, errors)
+        for column in REQUIRED_COLUMNS:
+            if column not in record:
+                errors[column] = ["This field is required."]
+
+        related = {}
+        for model, columns in RELATED_COLUMNS.items():
+            if has_values(record, columns):
+                related[model] = clean_columns(model, columns, record, errors)
+        if SchoolLocation in related and not errors.keys() & set(LEVELS):
+            errors.update(location_errors(related[SchoolLocation]))
+
+        if errors:
+            raise ValidationError(errors)
+        return school, related
+
+    def save_rows(self, rows):
+        schools = self.upsert(rows, SCHOOL_COLUMNS, created_by=self.created_by)
+
+        now = timezone.now()
+        for model in RELATED_COLUMNS:
+            records = [
+                model(school=school, created_at=now, updated_at=now, **related[model])
+                for school, (_line, _school, related) in zip(schools, rows)
+                if model in related
+            ]
+            if records:
+                model.objects.filter(
+                    school__in=[record.school_id for record in records]
+                ).delete()
+                self.insert(model, records)
+
+        schedule_search_update(School, [school.pk for school in schools])
@@ -0,0 +1,23 @@
+"""
+Receivers that keep the search backend up to date with schools, see
+opendataproject.search.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from opendataproject.search import schedule_search_update
+from .models import School, SchoolLocation
+
+SEARCHED_FIELDS = {"school_name", "school_description", "is_deleted"}
+
+
+@receiver(post_save, sender=School)
+def school_saved(instance, update_fields=None, **kwargs):
+    if update_fields is None or SEARCHED_FIELDS & set(update_fields):
+        schedule_search_update(School, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=SchoolLocation)
+def location_changed(instance, **kwargs):
+    schedule_search_update(School, [instance.school_id])
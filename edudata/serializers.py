@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.db.models import OuterRef, Prefetch, Subquery
 from rest_framework import serializers
 from .models import (
     School,
@@ -10,7 +12,7 @@ from .models import (
     AdmissionPolicy,
     SchoolChoices,
 )
-from .location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+from .location_index import is_valid_code, is_valid_child
 from .validators import (
     validate_social_media,
     validate_notable_alumni,
@@ -45,6 +47,16 @@ class VillageSerializer(serializers.Serializer):
     name = serializers.CharField()
 
 
+class LocationNodeSerializer(serializers.Serializer):
+    level = serializers.CharField()
+    code = serializers.CharField()
+    name = serializers.CharField()
+
+
+class LocationAncestorsSerializer(LocationNodeSerializer):
+    ancestors = LocationNodeSerializer(many=True)
+
+
 class SchoolLocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = SchoolLocation
@@ -89,32 +101,28 @@ class SchoolLocationSerializer(serializers.ModelSerializer):
             province = data["province"]
             if "district" in data:
                 district = data["district"]
-                valid_districts = [d[0] for d in DISTRICTS.get(province, [])]
-                if district not in valid_districts:
+                if not is_valid_child("district", district, province):
                     errors["district"] = [
                         "Invalid district code for the selected province"
                     ]
 
                 if "sector" in data:
                     sector = data["sector"]
-                    valid_sectors = [s[0] for s in SECTORS.get(district, [])]
-                    if sector not in valid_sectors:
+                    if not is_valid_child("sector", sector, district):
                         errors["sector"] = [
                             "Invalid sector code for the selected district"
                         ]
 
                     if "cell" in data:
                         cell = data["cell"]
-                        valid_cells = [c[0] for c in CELLS.get(sector, [])]
-                        if cell not in valid_cells:
+                        if not is_valid_child("cell", cell, sector):
                             errors["cell"] = [
                                 "Invalid cell code for the selected sector"
                             ]
 
                         if "village" in data:
                             village = data["village"]
-                            valid_villages = [v[0] for v in VILLAGES.get(cell, [])]
-                            if village not in valid_villages:
+                            if not is_valid_child("village", village, cell):
                                 errors["village"] = [
                                     "Invalid village code for the selected cell"
                                 ]
@@ -127,40 +135,35 @@ class SchoolLocationSerializer(serializers.ModelSerializer):
     def validate_province(self, value):
         if not value:
             raise serializers.ValidationError("This field is required.")
-        valid_provinces = [p[0] for p in PROVINCES]
-        if value not in valid_provinces:
+        if not is_valid_code("province", value):
             raise serializers.ValidationError("Invalid province code")
         return value
 
     def validate_district(self, value):
-        # Check if district code exists in DISTRICTS for the given province
+        # Check if district code belongs to the given province
         province_code = self.initial_data.get("province")
-        valid_districts = [d[0] for d in DISTRICTS.get(province_code, [])]
-        if value not in valid_districts:
+        if not is_valid_child("district", value, province_code):
             raise serializers.ValidationError("Invalid district code")
         return value
 
     def validate_sector(self, value):
-        # Check if sector code exists in SECTORS for the given district
+        # Check if sector code belongs to the given district
         district_code = self.initial_data.get("district")
-        valid_sectors = [s[0] for s in SECTORS.get(district_code, [])]
-        if value not in valid_sectors:
+        if not is_valid_child("sector", value, district_code):
             raise serializers.ValidationError("Invalid sector code")
         return value
 
     def validate_cell(self, value):
-        # Check if cell code exists in CELLS for the given sector
+        # Check if cell code belongs to the given sector
         sector_code = self.initial_data.get("sector")
-        valid_cells = [c[0] for c in CELLS.get(sector_code, [])]
-        if value not in valid_cells:
+        if not is_valid_child("cell", value, sector_code):
             raise serializers.ValidationError("Invalid cell code")
         return value
 
     def validate_village(self, value):
-        # Check if village code exists in VILLAGES for the given cell
+        # Check if village code belongs to the given cell
         cell_code = self.initial_data.get("cell")
-        valid_villages = [v[0] for v in VILLAGES.get(cell_code, [])]
-        if value not in valid_villages:
+        if not is_valid_child("village", value, cell_code):
             raise serializers.ValidationError("Invalid village code")
         return value
 
@@ -249,12 +252,8 @@ class AdmissionPolicySerializer(serializers.ModelSerializer):
 
 
 class SchoolListSerializer(serializers.ModelSerializer):
-    phone = serializers.CharField(
-        source="schoolcontact_set.first.phone_number", read_only=True
-    )
-    whatsapp = serializers.CharField(
-        source="schoolcontact_set.first.whatsapp", read_only=True
-    )
+    phone = serializers.CharField(source="first_phone", read_only=True)
+    whatsapp = serializers.CharField(source="first_whatsapp", read_only=True)
     cover = serializers.SerializerMethodField()
 
     class Meta:
@@ -274,12 +273,28 @@ class SchoolListSerializer(serializers.ModelSerializer):
             "cover",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Annotates each school with the phone numbers of its first contact and
+        the path of its first image, so a list renders from a single query
+        instead of three extra queries per school.
+        """
+        contacts = SchoolContact.objects.filter(school=OuterRef("pk")).order_by("pk")
+        images = SchoolImage.objects.filter(school=OuterRef("pk")).order_by("pk")
+        return queryset.annotate(
+            first_phone=Subquery(contacts.values("phone_number")[:1]),
+            first_whatsapp=Subquery(contacts.values("whatsapp")[:1]),
+            cover_image=Subquery(images.values("image")[:1]),
+        )
+
     def get_cover(self, obj):
-        """Retrieve the first image of the school and return the full URL."""
+        """Return the full URL of the first image of the school."""
         request = self.context.get("request")
-        image = obj.images.first()
-        if image and image.image:
-            image_url = image.image.url
+        if obj.cover_image:
+            image_url = SchoolImage._meta.get_field("image").storage.url(
+                obj.cover_image
+            )
             # If request is available, construct the full URL
             if request:
                 return request.build_absolute_uri(image_url)
@@ -326,6 +341,30 @@ class SchoolDetailSerializer(serializers.ModelSerializer):
             "admission",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Prefetches every sub-record of the schools in one query per relation,
+        so any number of schools renders in a fixed number of queries.
+
+        The prefetched querysets are ordered by pk, which lets the
+        `*_set.first` sources read the cached rows instead of querying.
+        """
+        return queryset.prefetch_related(
+            "images",
+            *(
+                Prefetch(related_name, queryset=model.objects.order_by("pk"))
+                for related_name, model in [
+                    ("schoollocation_set", SchoolLocation),
+                    ("schoolfees_set", SchoolFees),
+                    ("schoolcontact_set", SchoolContact),
+                    ("alumninetwork_set", AlumniNetwork),
+                    ("schoolgovernmentdata_set", SchoolGovernmentData),
+                    ("admissionpolicy_set", AdmissionPolicy),
+                ]
+            ),
+        )
+
 
 class SchoolCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -362,3 +401,92 @@ class SchoolCreateSerializer(serializers.ModelSerializer):
             return super().create(validated_data)
         except Exception as e:
             raise  # Re-raise the exception after logging it
+
+
+# Sub-records nested in a school document. The school does not exist yet when
+# they are validated, so it is read-only here and set when the document is
+# saved.
+
+
+class SchoolDocumentLocationSerializer(SchoolLocationSerializer):
+    class Meta(SchoolLocationSerializer.Meta):
+        read_only_fields = SchoolLocationSerializer.Meta.read_only_fields + ["school"]
+
+    @property
+    def initial_data(self):
+        # The per-level validators compare against the submitted parent codes,
+        # which a nested serializer finds in the document's location.
+        return self.parent.initial_data.get(self.field_name, {})
+
+
+class SchoolDocumentFeesSerializer(SchoolFeesSerializer):
+    class Meta(SchoolFeesSerializer.Meta):
+        read_only_fields = ["school"]
+
+
+class SchoolDocumentContactSerializer(SchoolContactSerializer):
+    class Meta(SchoolContactSerializer.Meta):
+        read_only_fields = ["school"]
+
+
+class SchoolDocumentAlumniSerializer(AlumniNetworkSerializer):
+    class Meta(AlumniNetworkSerializer.Meta):
+        read_only_fields = ["school"]
+
+
+class SchoolDocumentGovernmentDataSerializer(SchoolGovernmentDataSerializer):
+    class Meta(SchoolGovernmentDataSerializer.Meta):
+        read_only_fields = ["school"]
+
+
+class SchoolDocumentAdmissionSerializer(AdmissionPolicySerializer):
+    class Meta(AdmissionPolicySerializer.Meta):
+        read_only_fields = ["school"]
+
+
+class SchoolDocumentSerializer(SchoolCreateSerializer):
+    """
+    A whole school with its location, fees, contact, alumni network,
+    government data and admission policy. The document is validated in one
+    pass and saved in a single transaction, so a school is never left
+    half-created.
+    """
+
+    location = SchoolDocumentLocationSerializer(required=False)
+    fees = SchoolDocumentFeesSerializer(required=False)
+    contact = SchoolDocumentContactSerializer(required=False)
+    alumni = SchoolDocumentAlumniSerializer(required=False)
+    government_data = SchoolDocumentGovernmentDataSerializer(required=False)
+    admission = SchoolDocumentAdmissionSerializer(required=False)
+
+    # Document key -> model of the sub-record, in insertion order.
+    related_models = {
+        "location": SchoolLocation,
+        "fees": SchoolFees,
+        "contact": SchoolContact,
+        "alumni": AlumniNetwork,
+        "government_data": SchoolGovernmentData,
+        "admission": AdmissionPolicy,
+    }
+
+    class Meta(SchoolCreateSerializer.Meta):
+        fields = SchoolCreateSerializer.Meta.fields + [
+            "location",
+            "fees",
+            "contact",
+            "alumni",
+            "government_data",
+            "admission",
+        ]
+
+    def create(self, validated_data):
+        related = {
+            name: validated_data.pop(name)
+            for name in self.related_models
+            if name in validated_data
+        }
+        with transaction.atomic():
+            school = super().create(validated_data)
+            for name, data in related.items():
+                self.related_models[name].objects.create(school=school, **data)
+        return school
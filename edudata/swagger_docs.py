@@ -1,15 +1,17 @@
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from .serializers import (
-    SchoolDetailSerializer,
     SchoolLocationSerializer,
-    SchoolListSerializer,
     SchoolCreateSerializer,
+    SchoolDocumentSerializer,
+    SchoolDetailSerializer,
     MultipleSchoolImageSerializer,
     SchoolFeesSerializer,
     AdmissionPolicySerializer,
 )
 from .models import SchoolChoices
+from opendataproject import geo, leaderboard, search
+from opendataproject.batch import MAX_BATCH_SIZE
 
 
 # JSON field examples for School-related models
@@ -154,9 +156,152 @@ get_village_docs = swagger_auto_schema(
     },
 )
 
+get_location_ancestors_docs = swagger_auto_schema(
+    operation_description="Get the full ancestor chain (province -> district -> sector -> cell) of any location code",
+    manual_parameters=[
+        openapi.Parameter(
+            "code",
+            openapi.IN_PATH,
+            description="Location code at any level (e.g., 'RW.KL.NG.NU.RW.RP')",
+            type=openapi.TYPE_STRING,
+            required=True,
+        )
+    ],
+    responses={
+        200: openapi.Response(
+            description="Location and its ancestors retrieved successfully",
+            examples={
+                "application/json": {
+                    "level": "cell",
+                    "code": "RW.KL.NG.NU.RW",
+                    "name": "Rwampara",
+                    "ancestors": [
+                        {"level": "province", "code": "RW.KL", "name": "Kigali"},
+                        {
+                            "level": "district",
+                            "code": "RW.KL.NG",
+                            "name": "Nyarugenge",
+                        },
+                        {
+                            "level": "sector",
+                            "code": "RW.KL.NG.NU",
+                            "name": "Nyarugenge",
+                        },
+                    ],
+                }
+            },
+        ),
+        404: openapi.Response(
+            description="Location code not found",
+            examples={"application/json": {"error": "Location not found"}},
+        ),
+    },
+)
+
+search_locations_docs = swagger_auto_schema(
+    operation_description="Search locations at every level by partial name (case and accent insensitive), for autocomplete",
+    manual_parameters=[
+        openapi.Parameter(
+            "q",
+            openapi.IN_QUERY,
+            description="Part of the location name (at least 2 characters, e.g., 'kicu')",
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+        openapi.Parameter(
+            "level",
+            openapi.IN_QUERY,
+            description="Restrict the search to one level",
+            type=openapi.TYPE_STRING,
+            enum=["province", "district", "sector", "cell", "village"],
+            required=False,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description="Maximum number of results (1-50, default 10)",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Matching locations with their ancestors",
+            examples={
+                "application/json": [
+                    {
+                        "level": "district",
+                        "code": "RW.KL.KK",
+                        "name": "Kicukiro",
+                        "ancestors": [
+                            {"level": "province", "code": "RW.KL", "name": "Kigali"}
+                        ],
+                    }
+                ]
+            },
+        ),
+        400: openapi.Response(
+            description="Invalid search parameters",
+            examples={
+                "application/json": {
+                    "error": {
+                        "q": "Search query must contain at least 2 letters or digits"
+                    }
+                }
+            },
+        ),
+    },
+)
+
+get_location_tree_docs = swagger_auto_schema(
+    operation_description=(
+        "Get the whole location hierarchy, or the subtree below a location code, "
+        "in a single cacheable response. Pass the returned `version` as a query "
+        "parameter to get a response that can be cached forever; an outdated "
+        "version redirects to the current one. Supports If-None-Match."
+    ),
+    manual_parameters=[
+        openapi.Parameter(
+            "version",
+            openapi.IN_QUERY,
+            description="Hierarchy version returned by a previous response",
+            type=openapi.TYPE_STRING,
+            required=False,
+        )
+    ],
+    responses={
+        200: openapi.Response(
+            description="Location tree retrieved successfully",
+            examples={
+                "application/json": {
+                    "version": "3f1c9a0d5e2b7c41",
+                    "level": "sector",
+                    "code": "RW.KL.NG.NU",
+                    "name": "Nyarugenge",
+                    "children": [
+                        {
+                            "code": "RW.KL.NG.NU.RW",
+                            "name": "Rwampara",
+                            "children": [
+                                {"code": "RW.KL.NG.NU.RW.RP", "name": "Rwampara"}
+                            ],
+                        }
+                    ],
+                }
+            },
+        ),
+        302: "Redirect to the current version of the tree",
+        304: "Not modified",
+        404: openapi.Response(
+            description="Location code not found",
+            examples={"application/json": {"error": "Location not found"}},
+        ),
+    },
+)
+
 get_school_lists_docs = swagger_auto_schema(
-    operation_description="Get list of all schools",
-    responses={200: SchoolListSerializer, 404: "School not found"},
+    operation_description="Get a page of schools",
+    responses={404: "School not found"},
 )
 
 filter_school_by_location_docs = swagger_auto_schema(
@@ -194,7 +339,6 @@ filter_school_by_location_docs = swagger_auto_schema(
         ),
     ],
     responses={
-        200: SchoolDetailSerializer(many=True),
         400: "Invalid location code",
     },
 )
@@ -236,7 +380,6 @@ filter_school_by_location_hierarchical_docs = swagger_auto_schema(
         ),
     ],
     responses={
-        200: SchoolDetailSerializer(many=True),
         400: "Invalid location hierarchy",
     },
 )
@@ -307,7 +450,6 @@ filter_school_docs = swagger_auto_schema(
         ),
     ],
     responses={
-        200: SchoolDetailSerializer(many=True),
         400: "Invalid filter parameters",
     },
 )
@@ -383,6 +525,198 @@ get_school_details_docs = swagger_auto_schema(
     ],
 )
 
+
+get_schools_batch_docs = swagger_auto_schema(
+    operation_description="Get several schools by ID or school code, in request order. "
+    "Schools that do not exist are reported inline with an error.",
+    manual_parameters=[
+        openapi.Parameter(
+            "ids",
+            openapi.IN_QUERY,
+            description=f"Comma-separated IDs, at most {MAX_BATCH_SIZE}",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "codes",
+            openapi.IN_QUERY,
+            description="Comma-separated school codes, at most "
+            f"{MAX_BATCH_SIZE}. Use instead of ids.",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Schools in request order",
+            examples={
+                "application/json": {
+                    "results": [
+                        {"id": 3, "school_name": "Lycee de Kigali"},
+                        {"id": 99, "error": "School not found"},
+                    ]
+                }
+            },
+        ),
+        400: "Missing, invalid or too many IDs or codes",
+    },
+)
+
+get_schools_leaderboard_docs = swagger_auto_schema(
+    operation_description="Top rated schools, optionally within a province, a "
+    "district and/or a school type. Schools are ranked by a Bayesian average "
+    "that weighs their rating by their number of reviews, precomputed by "
+    "`manage.py refresh_leaderboards`.",
+    manual_parameters=[
+        openapi.Parameter(
+            "province",
+            openapi.IN_QUERY,
+            description="Only rank within this province code",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "district",
+            openapi.IN_QUERY,
+            description="Only rank within this district code",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "type",
+            openapi.IN_QUERY,
+            description="Only rank this type",
+            type=openapi.TYPE_STRING,
+            enum=SchoolChoices.Type.values,
+            required=False,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=f"Number of entries, at most {leaderboard.MAX_LIMIT} "
+            f"(default: {leaderboard.DEFAULT_LIMIT})",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Schools by rank",
+            examples={
+                "application/json": {
+                    "refreshed_at": "2025-03-16T02:00:00Z",
+                    "results": [
+                        {
+                            "rank": 1,
+                            "score": 4.612,
+                            "school": {"id": 3, "school_name": "Lycee de Kigali"},
+                        }
+                    ],
+                }
+            },
+        ),
+        400: "Invalid location code, type or limit",
+    },
+)
+
+search_schools_docs = swagger_auto_schema(
+    operation_description="Search schools by name, description and location "
+    "names, most relevant first. Matches every word of the query as a word "
+    "prefix, ignoring case and accents, and names with small typos.",
+    manual_parameters=[
+        openapi.Parameter(
+            "q",
+            openapi.IN_QUERY,
+            description="Words or word prefixes to search for, at least "
+            f"{search.MIN_QUERY_LENGTH} letters or digits. Small typos in "
+            "names are tolerated.",
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=f"Number of results, at most {search.MAX_LIMIT} "
+            f"(default: {search.DEFAULT_LIMIT})",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Matching schools",
+            examples={
+                "application/json": {
+                    "results": [
+                        {
+                            "score": 0.608,
+                            "school": {"id": 3, "school_name": "Lycee de Kigali"},
+                        }
+                    ],
+                }
+            },
+        ),
+        400: "Missing or too short query, or invalid limit",
+    },
+)
+
+get_schools_nearby_docs = swagger_auto_schema(
+    operation_description="Schools nearest to a point, with their distance in "
+    "km: those within `radius`, or the `limit` nearest when no radius is given. "
+    "Schools without coordinates are never returned.",
+    manual_parameters=[
+        openapi.Parameter(
+            "near",
+            openapi.IN_QUERY,
+            description="Point to search around, as latitude,longitude "
+            "(e.g. -1.9441,30.0619)",
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+        openapi.Parameter(
+            "radius",
+            openapi.IN_QUERY,
+            description="Only return results within this distance in km, at "
+            f"most {geo.MAX_RADIUS_KM}. Without it, the `limit` nearest are "
+            "returned.",
+            type=openapi.TYPE_NUMBER,
+            required=False,
+        ),
+        openapi.Parameter(
+            "type",
+            openapi.IN_QUERY,
+            description="Only return this type",
+            type=openapi.TYPE_STRING,
+            enum=SchoolChoices.Type.values,
+            required=False,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=f"Number of results, at most {geo.MAX_LIMIT} "
+            f"(default: {geo.DEFAULT_LIMIT})",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Schools, nearest first",
+            examples={
+                "application/json": {
+                    "results": [
+                        {
+                            "distance_km": 1.284,
+                            "school": {"id": 3, "school_name": "Lycee de Kigali"},
+                        }
+                    ],
+                }
+            },
+        ),
+        400: "Invalid point, radius, type or limit",
+    },
+)
+
 create_school_docs = swagger_auto_schema(
     operation_description="Create a new school",
     request_body=SchoolCreateSerializer,
@@ -399,6 +733,28 @@ create_school_docs = swagger_auto_schema(
         ),
     },
 )
+
+# Full School Create Documentation
+create_school_document_docs = swagger_auto_schema(
+    operation_description="Create a school with its location, fees, contact, "
+    "alumni network, government data and admission policy in one request. "
+    "Nothing is saved unless the whole document is valid.",
+    request_body=SchoolDocumentSerializer,
+    responses={
+        201: SchoolDetailSerializer,
+        400: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "field_name": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                )
+            },
+        ),
+        401: "Authentication credentials were not provided",
+    },
+)
+
 # School Contact Create Documentation
 create_school_contact_docs = swagger_auto_schema(
     operation_description="Create contact information for a school",
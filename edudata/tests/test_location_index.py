@@ -0,0 +1,98 @@
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from edudata import location_data
+from edudata.location_index import is_valid_code, is_valid_child
+from edudata.location_search import normalize, search_locations
+from edudata.location_snapshot import LEVELS, LocationTables, read_snapshot
+from edudata.validators import (
+    validate_independent_location_codes,
+    validate_hierarchical_location_codes,
+)
+
+
+class LocationIndexTests(SimpleTestCase):
+    def test_is_valid_code(self):
+        """Test code membership at every level"""
+        self.assertTrue(is_valid_code("province", "RW.KL"))
+        self.assertTrue(is_valid_code("district", "RW.KL.NG"))
+        self.assertTrue(is_valid_code("sector", "RW.KL.NG.NU"))
+        self.assertTrue(is_valid_code("cell", "RW.KL.NG.NU.RW"))
+        self.assertTrue(is_valid_code("village", "RW.KL.NG.NU.RW.RP"))
+        self.assertFalse(is_valid_code("district", "RW.KL"))
+        self.assertFalse(is_valid_code("village", "INVALID"))
+
+    def test_is_valid_child(self):
+        """Test parent-child checks"""
+        self.assertTrue(is_valid_child("district", "RW.KL.NG", "RW.KL"))
+        self.assertTrue(
+            is_valid_child("village", "RW.KL.NG.NU.RW.RP", "RW.KL.NG.NU.RW")
+        )
+        self.assertFalse(is_valid_child("district", "RW.KL.NG", "RW.NO"))
+        self.assertFalse(is_valid_child("district", "INVALID", None))
+
+
+class LocationValidatorTests(SimpleTestCase):
+    def test_independent_validation(self):
+        """Test independent validation accepts codes from any branch"""
+        self.assertTrue(
+            validate_independent_location_codes(
+                province="RW.NO", district="RW.KL.NG", village="RW.KL.NG.NU.RW.RP"
+            )
+        )
+        with self.assertRaises(ValidationError) as ctx:
+            validate_independent_location_codes(sector="INVALID", cell="INVALID")
+        self.assertEqual(set(ctx.exception.detail), {"sector", "cell"})
+
+    def test_hierarchical_validation(self):
+        """Test hierarchical validation rejects codes from another branch"""
+        self.assertTrue(
+            validate_hierarchical_location_codes(
+                province="RW.KL",
+                district="RW.KL.NG",
+                sector="RW.KL.NG.NU",
+                cell="RW.KL.NG.NU.RW",
+                village="RW.KL.NG.NU.RW.RP",
+            )
+        )
+        with self.assertRaises(ValidationError) as ctx:
+            validate_hierarchical_location_codes(province="RW.NO", district="RW.KL.NG")
+        self.assertIn("district", ctx.exception.detail)
+
+
+class LocationSnapshotTests(SimpleTestCase):
+    def test_snapshot_is_current(self):
+        """Test the committed snapshot was built from the current location_data"""
+        self.assertIsNotNone(
+            read_snapshot(),
+            "Run `python manage.py build_location_snapshot` after editing location_data.py",
+        )
+
+    def test_snapshot_matches_location_data(self):
+        """Test every level loaded from the snapshot equals location_data"""
+        tables = LocationTables(read_snapshot())
+        attributes = ["PROVINCES", "DISTRICTS", "SECTORS", "CELLS", "VILLAGES"]
+        for level, attribute in zip(LEVELS, attributes):
+            with self.subTest(level=level):
+                self.assertEqual(
+                    tables.level_entries(level), getattr(location_data, attribute)
+                )
+
+
+class LocationSearchTests(SimpleTestCase):
+    def test_normalize(self):
+        """Test accents, case and punctuation are ignored"""
+        self.assertEqual(normalize("  Kicukíro-Ville "), "kicukiro ville")
+
+    def test_prefix_matches_rank_by_level(self):
+        """Test name prefixes are found and higher levels come first"""
+        results = search_locations("kicukiro")
+        self.assertEqual(
+            [r["level"] for r in results[:3]], ["district", "sector", "cell"]
+        )
+
+    def test_word_and_substring_matches(self):
+        """Test later words and the middle of names are searched"""
+        self.assertIn(
+            "RW.KL.NG", [r["code"] for r in search_locations("rugenge", limit=50)]
+        )
+        self.assertEqual(search_locations("zzzz"), [])
@@ -20,7 +20,7 @@ class SchoolTestBase(TestCase):
     def setUpTestData(cls):
         """Create a single school instance to be shared across all test cases"""
         cls.school = School.objects.create(
-            school_id="101010",
+            school_code=101010,
             school_name="Test School",
             school_type="DAY",
             school_level="SECONDARY",
@@ -0,0 +1,141 @@
+import io
+import json
+import tempfile
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from edudata.models import School, SchoolLocation, SchoolFees, SchoolContact
+from edudata.school_import import SchoolImporter
+from opendataproject.bulk_import import read_csv, read_ndjson
+
+HEADER = (
+    "school_code,school_name,school_type,province,district,sector,cell,village,"
+    "phone_number,currency,amount\n"
+)
+LOCATION = "RW.ES,RW.ES.BG,RW.ES.BG.GS,RW.ES.BG.GS.BI,RW.ES.BG.GS.BI.BI"
+
+
+class SchoolImporterTests(TestCase):
+    def import_csv(self, text, **kwargs):
+        return SchoolImporter(**kwargs).run(read_csv(io.StringIO(text)))
+
+    def test_rows_are_imported_with_related_records(self):
+        """Test schools are created with their location, contact and fees"""
+        report = self.import_csv(
+            HEADER
+            + f"5001,Gashora School,Day,{LOCATION},+250700000001,RWF,1000\n"
+            + "5002,Kigali School,boarding,,,,,,,,\n"
+        )
+        self.assertEqual((report.created, report.updated, report.errors), (2, 0, []))
+
+        school = School.objects.get(school_code=5001)
+        self.assertEqual(school.school_type, "DAY")
+        self.assertEqual(
+            SchoolLocation.objects.get(school=school).village, "RW.ES.BG.GS.BI.BI"
+        )
+        self.assertEqual(
+            SchoolContact.objects.get(school=school).phone_number, "+250700000001"
+        )
+        self.assertFalse(SchoolFees.objects.filter(school__school_code=5002).exists())
+
+    def test_invalid_rows_are_reported_without_aborting(self):
+        """Test invalid rows are skipped and reported with their line number"""
+        report = self.import_csv(
+            HEADER
+            + "5001,Good School,,,,,,,,,\n"
+            + "5002,Bad School,nope,RW.ES,RW.KL.NG,,,,,,\n"
+            + ",Nameless School,,,,,,,,,\n"
+        )
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _message in report.errors], [3, 4])
+        self.assertIn("school_type", report.errors[0][1])
+        self.assertIn("Invalid district code", report.errors[0][1])
+        self.assertIn("school_code", report.errors[1][1])
+        self.assertEqual(
+            list(School.objects.values_list("school_code", flat=True)), [5001]
+        )
+
+    def test_existing_schools_are_updated(self):
+        """Test a school code already imported is updated and its records replaced"""
+        self.import_csv(HEADER + "5001,Old Name,,,,,,,,RWF,1000\n")
+        report = self.import_csv(HEADER + "5001,New Name,,,,,,,,RWF,2000\n")
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual(School.objects.get().school_name, "New Name")
+        self.assertEqual(
+            list(SchoolFees.objects.values_list("amount", flat=True)), [2000]
+        )
+
+    def test_copy_and_insert_store_the_same_rows(self):
+        """Test related rows loaded with COPY match those loaded with INSERT"""
+        text = HEADER + f'5001,"Quoted ""School""",,{LOCATION},"",RWF,1000\n'
+        rows = []
+        for use_copy in (True, False):
+            self.import_csv(text, use_copy=use_copy)
+            rows.append(
+                list(
+                    SchoolLocation.objects.values_list(
+                        "province", "village", "address", "latitude"
+                    )
+                )
+            )
+        self.assertEqual(rows[0], rows[1])
+        self.assertEqual(School.objects.get().school_name, 'Quoted "School"')
+
+    def test_ndjson_records(self):
+        """Test NDJSON lines are read, with malformed lines reported"""
+        lines = [
+            json.dumps({"school_code": 5001, "school_name": "Json School"}),
+            "{not json",
+            json.dumps([1, 2]),
+        ]
+        report = SchoolImporter().run(read_ndjson(io.StringIO("\n".join(lines))))
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _message in report.errors], [2, 3])
+
+
+class ImportSchoolsCommandTests(TestCase):
+    def test_command_imports_file(self):
+        """Test the command imports a file and prints throughput stats"""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as input_file:
+            input_file.write(HEADER + "5001,Command School,,,,,,,,,\n")
+            input_file.flush()
+            stdout = io.StringIO()
+            call_command("import_schools", input_file.name, stdout=stdout)
+        self.assertIn("1 created", stdout.getvalue())
+        self.assertIn("rows/s", stdout.getvalue())
+        self.assertTrue(School.objects.filter(school_code=5001).exists())
+
+    def test_dry_run_saves_nothing(self):
+        """Test --dry-run only validates"""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as input_file:
+            input_file.write(HEADER + "5001,Command School,,,,,,,,,\n")
+            input_file.flush()
+            call_command(
+                "import_schools", input_file.name, "--dry-run", stdout=io.StringIO()
+            )
+        self.assertFalse(School.objects.exists())
+
+
+class SchoolImportAdminTests(TestCase):
+    def test_admin_upload(self):
+        """Test an admin user can import a file from the school changelist"""
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="Password123!",
+            first_name="Ad",
+            last_name="Min",
+        )
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse("admin:edudata_school_changelist"))
+        self.assertContains(response, reverse("admin:edudata_school_import"))
+
+        upload = SimpleUploadedFile(
+            "schools.csv", (HEADER + "5001,Uploaded School,,,,,,,,,\n").encode()
+        )
+        response = self.client.post(
+            reverse("admin:edudata_school_import"), {"file": upload}
+        )
+        self.assertRedirects(response, reverse("admin:edudata_school_changelist"))
+        self.assertEqual(School.objects.get().created_by, admin_user)
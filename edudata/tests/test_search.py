@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase
+from opendataproject.inverted_index import InvertedIndex
+
+
+class InvertedIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.add(1, ("Kibagabaga Hospital", "", "Gasabo Kigali"))
+        self.index.add(2, ("Hospitality School", "", "Kigali"))
+        self.index.add(3, ("Kigali Health Center", "", "Nyarugenge Kigali"))
+
+    def pks(self, query):
+        return [pk for pk, _score in self.index.search(query, 10)]
+
+    def test_every_word_must_match_a_prefix(self):
+        """Test words match as prefixes, and all of them must match"""
+        self.assertEqual(self.pks("kibagab hosp"), [1])
+        self.assertEqual(self.pks("hospital kig"), [1, 2])
+        self.assertEqual(self.pks("hospital nyarugenge"), [])
+
+    def test_ranking(self):
+        """Test exact words rank over prefixes, and names over locations"""
+        self.assertEqual(self.pks("hospital"), [1, 2])
+        self.assertEqual(self.pks("kigali")[0], 3)
+
+    def test_updates(self):
+        """Test replaced and removed documents leave no terms behind"""
+        self.index.add(2, ("Rwamagana School", "", ""))
+        self.index.remove(3)
+        self.assertEqual(self.pks("hospital"), [1])
+        self.assertEqual(self.pks("kigali"), [1])
+        self.assertEqual(self.index.expand("n"), [])
+        self.assertEqual(len(self.index), 2)
@@ -1,13 +1,24 @@
+import gzip
+import json
+from unittest import mock
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.cache import has_vary_header
 from edudata.models import (
     School,
     SchoolLocation,
     SchoolFees,
     SchoolContact,
     SchoolImage,
+    AdmissionPolicy,
 )
+from edudata.views import SchoolNearbyView
+from opendataproject.pagination import KeysetCursorPagination
 from ..location_data import PROVINCES, DISTRICTS, SECTORS
 
 
@@ -16,7 +27,7 @@ class BaseAPITestCase(APITestCase):
     def setUpTestData(cls):
         """Create a single school instance to be shared across all test cases"""
         cls.school = School.objects.create(
-            school_id="101011",
+            school_code=101011,
             school_name="Test School",
             school_type="DAY",
             school_level="SECONDARY",
@@ -124,6 +135,350 @@ class SchoolLocationTests(BaseAPITestCase):
         self.assertIn("province", response.data)
 
 
+class SchoolListPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create schools with repeated and missing ratings"""
+        ratings = [None, "4.50", "3.00", "4.50", None, "2.00", "4.50"] * 4
+        cls.schools = [
+            School.objects.create(
+                school_code=1000 + i,
+                school_name=f"School {i}",
+                average_rating=rating,
+            )
+            for i, rating in enumerate(ratings)
+        ]
+        cls.url = reverse("school-list")
+
+    def collect_pages(self, params):
+        ids, pages = [], []
+        response = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response)
+            ids.extend(school["id"] for school in response.data["results"])
+            if not response.data["next"]:
+                return ids, pages
+            response = self.client.get(response.data["next"])
+
+    def test_pages_cover_every_school_in_order(self):
+        """Test paging by rating visits each school once, NULL ratings last"""
+        ids, pages = self.collect_pages({"ordering": "-average_rating", "page_size": 5})
+        rated = sorted(
+            (s for s in self.schools if s.average_rating is not None),
+            key=lambda s: (s.average_rating, s.id),
+            reverse=True,
+        )
+        unrated = sorted(
+            (s for s in self.schools if s.average_rating is None),
+            key=lambda s: s.id,
+            reverse=True,
+        )
+        self.assertEqual(ids, [s.id for s in rated + unrated])
+        self.assertEqual(len(pages), 6)
+        self.assertIsNone(pages[0].data["previous"])
+
+        # Stepping back from any page returns the page before it.
+        for page, previous_page in zip(pages[1:], pages):
+            response = self.client.get(page.data["previous"])
+            self.assertEqual(response.data["results"], previous_page.data["results"])
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 20)
+
+        with mock.patch.object(KeysetCursorPagination, "max_page_size", 10):
+            response = self.client.get(self.url, {"page_size": 1000})
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_invalid_ordering_and_cursor(self):
+        response = self.client.get(self.url, {"ordering": "school_name"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SchoolListQueryCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create schools that each have contacts and images"""
+        for i in range(10):
+            school = School.objects.create(
+                school_code=2000 + i, school_name=f"School {i}"
+            )
+            for n in range(2):
+                SchoolContact.objects.create(
+                    school=school,
+                    phone_number=f"+25070000{i}{n}",
+                    whatsapp=f"+25078000{i}{n}",
+                )
+                SchoolImage.objects.create(school=school, image=f"cover_{i}_{n}.jpg")
+
+    def count_queries(self, page_size, url_name="school-list"):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name), {"page_size": page_size})
+        self.assertEqual(len(response.data["results"]), page_size)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test the list is rendered in the same number of queries for any page size"""
+        _response, small_page_queries = self.count_queries(2)
+        response, large_page_queries = self.count_queries(10)
+        self.assertEqual(small_page_queries, large_page_queries)
+
+        first_school = response.data["results"][0]
+        self.assertEqual(first_school["phone"], "+2507000000")
+        self.assertEqual(first_school["whatsapp"], "+2507800000")
+        self.assertTrue(first_school["cover"].endswith("cover_0_0.jpg"))
+
+    def test_detailed_lists_use_a_fixed_number_of_queries(self):
+        """Test detailed school lists batch their sub-records per page"""
+        for url_name in ["schools-by-filters", "schools-by-location-independent"]:
+            _response, small_page_queries = self.count_queries(2, url_name)
+            response, large_page_queries = self.count_queries(10, url_name)
+            self.assertEqual(small_page_queries, large_page_queries)
+
+            first_school = response.data["results"][0]
+            self.assertEqual(first_school["contact"]["phone_number"], "+2507000000")
+            self.assertEqual(len(first_school["images"]), 2)
+
+
+class SchoolBatchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create schools that each have contacts and images"""
+        cls.schools = []
+        for i in range(5):
+            school = School.objects.create(
+                school_code=3000 + i, school_name=f"School {i}"
+            )
+            SchoolContact.objects.create(school=school, phone_number=f"+25070000{i}")
+            SchoolImage.objects.create(school=school, image=f"cover_{i}.jpg")
+            cls.schools.append(school)
+
+    def get_batch(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("school-batch"), params)
+        return response, len(queries)
+
+    def test_schools_are_returned_in_request_order(self):
+        """Test schools come back in request order with missing ids reported inline"""
+        ids = [self.schools[3].id, 0, self.schools[1].id]
+        response, _queries = self.get_batch({"ids": ",".join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.data["results"]
+        self.assertEqual(results[0]["school_name"], "School 3")
+        self.assertEqual(results[0]["contact"]["phone_number"], "+250700003")
+        self.assertEqual(results[1], {"id": 0, "error": "School not found"})
+        self.assertEqual(results[2]["school_name"], "School 1")
+
+    def test_schools_are_looked_up_by_code(self):
+        """Test schools can be requested by school code"""
+        response, _queries = self.get_batch({"codes": "3004,3000"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [school["school_name"] for school in response.data["results"]],
+            ["School 4", "School 0"],
+        )
+
+    def test_batch_results_match_the_detail_endpoint(self):
+        """Test a batch returns each school as the detail endpoint does"""
+        school = self.schools[2]
+        detail = self.client.get(reverse("school-detail", args=[school.id]))
+        response, _queries = self.get_batch({"ids": str(school.id)})
+        self.assertEqual(response.data["results"], [detail.data])
+        self.assertTrue(
+            response.data["results"][0]["images"][0]["image"].startswith("http://")
+        )
+
+    def test_query_count_does_not_grow_with_ids(self):
+        """Test a batch is loaded in the same number of queries for any size"""
+        _response, two_queries = self.get_batch(
+            {"ids": ",".join(str(school.id) for school in self.schools[:2])}
+        )
+        _response, five_queries = self.get_batch(
+            {"ids": ",".join(str(school.id) for school in self.schools)}
+        )
+        self.assertEqual(two_queries, five_queries)
+
+    def test_invalid_batches_are_rejected(self):
+        """Test missing, malformed and oversized batches are rejected"""
+        for params in [
+            {},
+            {"ids": "1", "codes": "3000"},
+            {"ids": "1,abc"},
+            {"ids": ",".join(map(str, range(1, 52)))},
+        ]:
+            response, _queries = self.get_batch(params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
+
+
+class SchoolSearchTests(APITestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lycee = School.objects.create(
+                school_code=8001,
+                school_name="Lycée de Kigali",
+                school_description="Secondary school with science laboratories",
+            )
+            self.other = School.objects.create(
+                school_code=8002, school_name="Groupe Scolaire Rwamagana"
+            )
+            SchoolLocation.objects.create(school=self.other, province="RW.KL")
+
+    def search(self, query):
+        response = self.client.get(reverse("school-search"), {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [entry["school"]["id"] for entry in response.data["results"]]
+
+    def test_search_matches_word_prefixes(self):
+        """Test names, descriptions and location names match, ignoring accents"""
+        self.assertEqual(self.search("lycee kig"), [self.lycee.id])
+        self.assertEqual(self.search("science lab"), [self.lycee.id])
+        # The name of the location's province
+        self.assertEqual(self.search("kigali"), [self.lycee.id, self.other.id])
+        self.assertEqual(self.search("nyanza"), [])
+
+    def test_search_columns_follow_changes(self):
+        """Test renaming a school updates the search backend on commit"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lycee.school_name = "Lycée Notre-Dame"
+            self.lycee.save()
+        self.assertEqual(self.search("notre dame"), [self.lycee.id])
+
+    def test_invalid_query(self):
+        """Test queries shorter than two letters or digits are rejected"""
+        response = self.client.get(reverse("school-search"), {"q": " é "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.data["error"])
+
+
+class SchoolMemorySearchTests(SchoolSearchTests):
+    """The same searches with the in-process search backend"""
+
+    def setUp(self):
+        # A new backend, so each test loads its own index.
+        self.enterContext(
+            override_settings(
+                SEARCH_BACKEND="opendataproject.inverted_index.MemorySearchBackend"
+            )
+        )
+        super().setUp()
+
+
+class SchoolNearbyTests(APITestCase):
+    # Kigali city centre
+    NEAR = "-1.9441,30.0619"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = School.objects.create(school_code=8101, school_name="Campus")
+        cls.far = School.objects.create(
+            school_code=8102, school_name="Far", school_type="BOARDING"
+        )
+        School.objects.create(school_code=8103, school_name="No coordinates")
+        # The campus school's nearest location counts: about 1.1 km away.
+        for school, latitude, longitude in [
+            (cls.campus, -1.9541, 30.0619),
+            (cls.campus, -2.5, 29.7),
+            (cls.far, -1.5, 29.6),
+        ]:
+            SchoolLocation.objects.create(
+                school=school, latitude=latitude, longitude=longitude
+            )
+
+    def nearby(self, **params):
+        response = self.client.get(
+            reverse("school-nearby"), {"near": self.NEAR, **params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            (entry["school"]["id"], round(entry["distance_km"]))
+            for entry in response.data["results"]
+        ]
+
+    def test_nearest_schools(self):
+        """Test the k nearest schools by their nearest location, then radius"""
+        self.assertEqual(self.nearby(), [(self.campus.id, 1), (self.far.id, 71)])
+        self.assertEqual(self.nearby(limit=1), [(self.campus.id, 1)])
+        self.assertEqual(self.nearby(radius=50), [(self.campus.id, 1)])
+        self.assertEqual(self.nearby(type="boarding"), [(self.far.id, 71)])
+
+    def test_schools_deleted_meanwhile_are_left_out(self):
+        """Test a school deleted after its location was read is skipped"""
+        get_queryset = SchoolNearbyView.get_queryset
+
+        def delete_campus_first(view):
+            self.campus.delete()
+            return get_queryset(view)
+
+        with mock.patch.object(SchoolNearbyView, "get_queryset", delete_campus_first):
+            self.assertEqual(self.nearby(), [(self.far.id, 71)])
+
+    def test_invalid_point(self):
+        """Test malformed points and radii are rejected"""
+        response = self.client.get(
+            reverse("school-nearby"), {"near": "-1.9", "radius": "1000"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data["error"]), {"near", "radius"})
+
+
+class SchoolDocumentCreateTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="editor@example.com",
+            password="Password123!",
+            first_name="Edi",
+            last_name="Tor",
+        )
+        self.client.force_authenticate(self.user)
+        self.document = {
+            "school_code": 4000,
+            "school_name": "Full School",
+            "location": {
+                "province": "RW.ES",
+                "district": "RW.ES.BG",
+                "sector": "RW.ES.BG.GS",
+                "cell": "RW.ES.BG.GS.BI",
+                "village": "RW.ES.BG.GS.BI.BI",
+            },
+            "fees": {"currency": "RWF", "amount": "150000.00"},
+            "contact": {"phone_number": "+250700000000"},
+            "admission": {"parental_engagement": "Monthly meetings"},
+        }
+
+    def test_school_is_created_with_its_sub_records(self):
+        """Test the school and all nested records are created in one request"""
+        response = self.client.post(
+            reverse("school-document-create"), self.document, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["location"]["village"], "RW.ES.BG.GS.BI.BI")
+        self.assertEqual(response.data["fees"]["amount"], "150000.00")
+        self.assertIsNone(response.data["alumni"])
+
+        school = School.objects.get(school_code=4000)
+        self.assertEqual(school.created_by, self.user)
+        self.assertEqual(
+            SchoolContact.objects.get(school=school).phone_number, "+250700000000"
+        )
+        self.assertTrue(AdmissionPolicy.objects.filter(school=school).exists())
+
+    def test_invalid_document_creates_nothing(self):
+        """Test an invalid nested record leaves no school behind"""
+        self.document["location"]["village"] = "RW.KL.NG.XX.YY.ZZ"
+        response = self.client.post(
+            reverse("school-document-create"), self.document, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("village", response.data["location"])
+        self.assertFalse(School.objects.exists())
+        self.assertFalse(SchoolFees.objects.exists())
+
+
 class LocationEndpointsTest(APITestCase):
     def test_get_provinces(self):
         url = reverse("provinces")
@@ -167,3 +522,95 @@ class LocationEndpointsTest(APITestCase):
         expected_sectors = SECTORS.get(district_code, [])
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), len(expected_sectors))
+
+    def test_get_location_ancestors(self):
+        url = reverse("location-ancestors", kwargs={"code": "RW.KL.NG.NU.RW.RP"})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["level"], "village")
+        self.assertEqual(
+            [a["code"] for a in response.data["ancestors"]],
+            ["RW.KL", "RW.KL.NG", "RW.KL.NG.NU", "RW.KL.NG.NU.RW"],
+        )
+
+    def test_get_location_ancestors_invalid_code(self):
+        url = reverse("location-ancestors", kwargs={"code": "INVALID"})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_locations(self):
+        url = reverse("location-search")
+        response = self.client.get(url, {"q": "KICU", "level": "district"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["code"], "RW.KL.KK")
+        self.assertEqual([a["code"] for a in response.data[0]["ancestors"]], ["RW.KL"])
+
+    def test_search_locations_invalid_params(self):
+        url = reverse("location-search")
+        response = self.client.get(url, {"q": "k", "level": "country"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.data["error"])
+        self.assertIn("level", response.data["error"])
+
+    def test_get_location_tree(self):
+        response = self.client.get(reverse("location-tree"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+
+        tree = response.json()
+        self.assertEqual(len(tree["provinces"]), len(PROVINCES))
+        first_province = tree["provinces"][0]
+        self.assertEqual(first_province["code"], PROVINCES[0][0])
+        self.assertEqual(
+            len(first_province["children"]), len(DISTRICTS[PROVINCES[0][0]])
+        )
+
+        self.assertTrue(has_vary_header(response, "Accept-Encoding"))
+
+        response = self.client.get(
+            reverse("location-tree"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertTrue(has_vary_header(response, "Accept-Encoding"))
+
+    def test_location_tree_honours_gzip_quality(self):
+        """Test gzip is only served when Accept-Encoding allows it"""
+        for accept_encoding, gzipped in [
+            ("gzip, deflate, br", True),
+            ("br;q=1.0, GZIP;q=0.5", True),
+            ("*", True),
+            ("gzip;q=0", False),
+            ("gzip;q=0.000, *", False),
+            ("x-gzip-unsupported", False),
+            ("identity", False),
+            ("", False),
+        ]:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(
+                    reverse("location-tree"), HTTP_ACCEPT_ENCODING=accept_encoding
+                )
+                self.assertEqual("Content-Encoding" in response, gzipped)
+
+    def test_get_location_subtree(self):
+        district_code = DISTRICTS[PROVINCES[0][0]][0][0]
+        url = reverse("location-subtree", kwargs={"code": district_code})
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        subtree = json.loads(gzip.decompress(response.content))
+        self.assertEqual(subtree["level"], "district")
+        self.assertEqual(
+            [sector["code"] for sector in subtree["children"]],
+            [code for code, _name in SECTORS[district_code]],
+        )
+
+        response = self.client.get(url, {"version": subtree["version"]})
+        self.assertIn("immutable", response["Cache-Control"])
+        response = self.client.get(url, {"version": "outdated"})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+    def test_get_location_subtree_invalid_code(self):
+        url = reverse("location-subtree", kwargs={"code": "INVALID"})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
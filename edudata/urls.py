@@ -5,8 +5,15 @@ from .views import (
     SectorAPIView,
     CellAPIView,
     VillageAPIView,
+    LocationAncestorsAPIView,
+    LocationTreeAPIView,
+    LocationSearchAPIView,
     SchoolLocationCreateView,
     SchoolDetailView,
+    SchoolBatchView,
+    SchoolLeaderboardView,
+    SchoolSearchView,
+    SchoolNearbyView,
     SchoolListAPIView,
     UserSchoolListsAPIView,
     SchoolListByHierarchicalLocationAPIView,
@@ -14,6 +21,7 @@ from .views import (
     SchoolFilterOptionsAPIView,
     SchoolListByFiltersAPIView,
     SchoolCreateView,
+    SchoolDocumentCreateView,
     SchoolImageCreateView,
     SchoolContactCreateView,
     SchoolFeesCreateView,
@@ -28,6 +36,18 @@ urlpatterns = [
     path("sectors/", SectorAPIView.as_view(), name="sectors"),
     path("cells/", CellAPIView.as_view(), name="cells"),
     path("villages/", VillageAPIView.as_view(), name="villages"),
+    path("locations/search/", LocationSearchAPIView.as_view(), name="location-search"),
+    path("locations/tree/", LocationTreeAPIView.as_view(), name="location-tree"),
+    path(
+        "locations/tree/<str:code>/",
+        LocationTreeAPIView.as_view(),
+        name="location-subtree",
+    ),
+    path(
+        "locations/<str:code>/ancestors/",
+        LocationAncestorsAPIView.as_view(),
+        name="location-ancestors",
+    ),
     path("schools/", SchoolListAPIView.as_view(), name="school-list"),
     path(
         "schools/user-schools/",
@@ -35,6 +55,14 @@ urlpatterns = [
         name="users-school-list",
     ),
     path("schools/<int:pk>/", SchoolDetailView.as_view(), name="school-detail"),
+    path("schools/batch/", SchoolBatchView.as_view(), name="school-batch"),
+    path(
+        "schools/leaderboard/",
+        SchoolLeaderboardView.as_view(),
+        name="school-leaderboard",
+    ),
+    path("schools/search/", SchoolSearchView.as_view(), name="school-search"),
+    path("schools/nearby/", SchoolNearbyView.as_view(), name="school-nearby"),
     path(
         "schools/by-location/independent/",
         SchoolListByIndependentLocationAPIView.as_view(),
@@ -56,6 +84,11 @@ urlpatterns = [
         name="schools-by-filters",
     ),
     path("schools/create/", SchoolCreateView.as_view(), name="school-create"),
+    path(
+        "schools/create-full/",
+        SchoolDocumentCreateView.as_view(),
+        name="school-document-create",
+    ),
     path(
         "school-locations/create/",
         SchoolLocationCreateView.as_view(),
@@ -1,5 +1,6 @@
 from rest_framework.exceptions import ValidationError
-from .location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+from .location_index import LEVELS, is_valid_code, is_valid_child
+from .location_search import MAX_LIMIT, MIN_QUERY_LENGTH, normalize
 from .models import SchoolChoices
 from datetime import datetime
 
@@ -13,28 +14,20 @@ def validate_independent_location_codes(
     """
     errors = {}
 
-    if province and province not in [p[0] for p in PROVINCES]:
+    if province and not is_valid_code("province", province):
         errors["province"] = f"Invalid province code: {province}"
 
-    if district:
-        all_districts = [d[0] for districts in DISTRICTS.values() for d in districts]
-        if district not in all_districts:
-            errors["district"] = f"Invalid district code: {district}"
+    if district and not is_valid_code("district", district):
+        errors["district"] = f"Invalid district code: {district}"
 
-    if sector:
-        all_sectors = [s[0] for sectors in SECTORS.values() for s in sectors]
-        if sector not in all_sectors:
-            errors["sector"] = f"Invalid sector code: {sector}"
+    if sector and not is_valid_code("sector", sector):
+        errors["sector"] = f"Invalid sector code: {sector}"
 
-    if cell:
-        all_cells = [c[0] for cells in CELLS.values() for c in cells]
-        if cell not in all_cells:
-            errors["cell"] = f"Invalid cell code: {cell}"
+    if cell and not is_valid_code("cell", cell):
+        errors["cell"] = f"Invalid cell code: {cell}"
 
-    if village:
-        all_villages = [v[0] for villages in VILLAGES.values() for v in villages]
-        if village not in all_villages:
-            errors["village"] = f"Invalid village code: {village}"
+    if village and not is_valid_code("village", village):
+        errors["village"] = f"Invalid village code: {village}"
 
     if errors:
         raise ValidationError(errors)
@@ -57,14 +50,13 @@ def validate_hierarchical_location_codes(
         raise ValidationError({"province": "Province code is required"})
 
     # Validate province
-    if province not in [p[0] for p in PROVINCES]:
+    if not is_valid_code("province", province):
         errors["province"] = f"Invalid province code: {province}"
         raise ValidationError(errors)
 
     # Validate district if provided
     if district:
-        valid_districts = [d[0] for d in DISTRICTS.get(province, [])]
-        if district not in valid_districts:
+        if not is_valid_child("district", district, province):
             errors["district"] = f"Invalid district code for province {province}"
 
     # Validate sector if provided
@@ -72,8 +64,7 @@ def validate_hierarchical_location_codes(
         if not district:
             errors["sector"] = "District code is required when specifying sector"
         else:
-            valid_sectors = [s[0] for s in SECTORS.get(district, [])]
-            if sector not in valid_sectors:
+            if not is_valid_child("sector", sector, district):
                 errors["sector"] = f"Invalid sector code for district {district}"
 
     # Validate cell if provided
@@ -81,8 +72,7 @@ def validate_hierarchical_location_codes(
         if not sector:
             errors["cell"] = "Sector code is required when specifying cell"
         else:
-            valid_cells = [c[0] for c in CELLS.get(sector, [])]
-            if cell not in valid_cells:
+            if not is_valid_child("cell", cell, sector):
                 errors["cell"] = f"Invalid cell code for sector {sector}"
 
     # Validate village if provided
@@ -90,8 +80,7 @@ def validate_hierarchical_location_codes(
         if not cell:
             errors["village"] = "Cell code is required when specifying village"
         else:
-            valid_villages = [v[0] for v in VILLAGES.get(cell, [])]
-            if village not in valid_villages:
+            if not is_valid_child("village", village, cell):
                 errors["village"] = f"Invalid village code for cell {cell}"
 
     if errors:
@@ -157,6 +146,31 @@ def validate_school_filters(
     return True
 
 
+def validate_location_search(query=None, level=None, limit=None):
+    """
+    Validates location search parameters.
+    """
+    errors = {}
+
+    if not query or len(normalize(query)) < MIN_QUERY_LENGTH:
+        errors[
+            "q"
+        ] = f"Search query must contain at least {MIN_QUERY_LENGTH} letters or digits"
+
+    if level and level not in LEVELS:
+        errors[
+            "level"
+        ] = f"Invalid location level: {level}. Valid choices are: {list(LEVELS)}"
+
+    if limit and not (limit.isdigit() and 1 <= int(limit) <= MAX_LIMIT):
+        errors["limit"] = f"Limit must be a number between 1 and {MAX_LIMIT}"
+
+    if errors:
+        raise ValidationError(errors)
+
+    return True
+
+
 def validate_social_media(social_media):
     """
     Validates social media JSON structure.
@@ -3,17 +3,25 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from .location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+from django.http import HttpResponse, HttpResponseNotModified, HttpResponseRedirect
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from . import locations
+from .location_index import get_location, get_ancestors
+from .location_tree import render_tree, tree_version
+from .location_search import DEFAULT_LIMIT, search_locations
 from .serializers import (
     ProvinceSerializer,
     DistrictSerializer,
     SectorSerializer,
     CellSerializer,
     VillageSerializer,
+    LocationAncestorsSerializer,
     SchoolLocationSerializer,
     SchoolDetailSerializer,
     SchoolListSerializer,
     SchoolCreateSerializer,
+    SchoolDocumentSerializer,
     SchoolImageSerializer,
     MultipleSchoolImageSerializer,
     SchoolFeesSerializer,
@@ -22,33 +30,20 @@ from .serializers import (
     AlumniNetworkSerializer,
     AdmissionPolicySerializer,
 )
-from .models import School, SchoolChoices
+from .models import School, SchoolChoices, SchoolLocation
 from .validators import (
     validate_independent_location_codes,
     validate_hierarchical_location_codes,
     validate_school_filters,
+    validate_location_search,
 )
-from .swagger_docs import (
-    get_province_docs,
-    get_district_docs,
-    get_sector_docs,
-    get_cell_docs,
-    get_village_docs,
-    get_school_lists_docs,
-    filter_school_by_location_docs,
-    filter_school_by_location_hierarchical_docs,
-    get_school_filters_docs,
-    filter_school_docs,
-    create_school_location_docs,
-    get_school_details_docs,
-    create_school_contact_docs,
-    create_alumni_network_docs,
-    create_school_government_data_docs,
-    create_school_docs,
-    create_school_image_docs,
-    create_school_fees_docs,
-    create_school_admission_policy_docs,
-)
+from opendataproject.api_docs import lazy_docs
+from opendataproject.batch import BatchRetrieveView
+from opendataproject.geo import NearbyView
+from opendataproject.leaderboard import LeaderboardView
+from opendataproject.search import SearchView
+
+docs = lazy_docs("edudata.swagger_docs")
 
 
 class ProvinceAPIView(APIView):
@@ -58,9 +53,9 @@ class ProvinceAPIView(APIView):
     This endpoint provides a list of all provinces with their codes and names.
     """
 
-    @get_province_docs
+    @docs.get_province_docs
     def get(self, request):
-        provinces = [{"code": p[0], "name": p[1]} for p in PROVINCES]
+        provinces = [{"code": p[0], "name": p[1]} for p in locations.PROVINCES]
         serializer = ProvinceSerializer(provinces, many=True)
         return Response(serializer.data)
 
@@ -72,10 +67,10 @@ class DistrictAPIView(APIView):
     This endpoint provides districts for a specific province code.
     """
 
-    @get_district_docs
+    @docs.get_district_docs
     def get(self, request):
         province_code = request.query_params.get("province_code")
-        districts = DISTRICTS.get(province_code, [])
+        districts = locations.DISTRICTS.get(province_code, [])
         districts_data = [{"code": d[0], "name": d[1]} for d in districts]
         serializer = DistrictSerializer(districts_data, many=True)
         return Response(serializer.data)
@@ -88,10 +83,10 @@ class SectorAPIView(APIView):
     This endpoint provides sectors for a specific district code.
     """
 
-    @get_sector_docs
+    @docs.get_sector_docs
     def get(self, request):
         district_code = request.query_params.get("district_code")
-        sectors = SECTORS.get(district_code, [])
+        sectors = locations.SECTORS.get(district_code, [])
         sectors_data = [{"code": s[0], "name": s[1]} for s in sectors]
         serializer = SectorSerializer(sectors_data, many=True)
         return Response(serializer.data)
@@ -104,10 +99,10 @@ class CellAPIView(APIView):
     This endpoint provides cells for a specific sector code.
     """
 
-    @get_cell_docs
+    @docs.get_cell_docs
     def get(self, request):
         sector_code = request.query_params.get("sector_code")
-        cells = CELLS.get(sector_code, [])
+        cells = locations.CELLS.get(sector_code, [])
         cells_data = [{"code": c[0], "name": c[1]} for c in cells]
         serializer = CellSerializer(cells_data, many=True)
         return Response(serializer.data)
@@ -120,15 +115,134 @@ class VillageAPIView(APIView):
     This endpoint provides villages for a specific cell code.
     """
 
-    @get_village_docs
+    @docs.get_village_docs
     def get(self, request):
         cell_code = request.query_params.get("cell_code")
-        villages = VILLAGES.get(cell_code, [])
+        villages = locations.VILLAGES.get(cell_code, [])
         villages_data = [{"code": v[0], "name": v[1]} for v in villages]
         serializer = VillageSerializer(villages_data, many=True)
         return Response(serializer.data)
 
 
+class LocationAncestorsAPIView(APIView):
+    """
+    API endpoint for resolving the ancestors of a location code.
+
+    Given a code at any level, returns the location itself together with its
+    province -> district -> sector -> cell chain in a single request.
+    """
+
+    @docs.get_location_ancestors_docs
+    def get(self, request, code):
+        location = get_location(code)
+        if location is None:
+            return Response(
+                {"error": "Location not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        location["ancestors"] = get_ancestors(code)
+        serializer = LocationAncestorsSerializer(location)
+        return Response(serializer.data)
+
+
+class LocationSearchAPIView(APIView):
+    """
+    API endpoint for finding locations by name.
+
+    Matches a partial name at every level, ignoring case and accents, and
+    returns the matching codes with their ancestor chain. Intended for
+    type-ahead inputs.
+    """
+
+    @docs.search_locations_docs
+    def get(self, request):
+        query = request.query_params.get("q")
+        level = request.query_params.get("level")
+        limit = request.query_params.get("limit")
+        try:
+            validate_location_search(query=query, level=level, limit=limit)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        locations_found = search_locations(
+            query, level=level or None, limit=int(limit or DEFAULT_LIMIT)
+        )
+        for location in locations_found:
+            location["ancestors"] = get_ancestors(location["code"])
+        serializer = LocationAncestorsSerializer(locations_found, many=True)
+        return Response(serializer.data)
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Whether an Accept-Encoding header allows gzip: listed as gzip or x-gzip,
+    or covered by *, with a q-value above 0.
+    """
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    for name in ("gzip", "x-gzip", "*"):
+        if name in qualities:
+            return qualities[name] > 0
+    return False
+
+
+class LocationTreeAPIView(APIView):
+    """
+    API endpoint for retrieving the location hierarchy as a tree.
+
+    Returns the whole hierarchy, or the subtree below a location code. Bodies
+    are rendered and gzip-compressed once per process and served with a strong
+    ETag, so a cascading dropdown needs one cacheable request and repeat
+    requests are answered with 304 Not Modified. Requests that pin the current
+    `version` are marked immutable.
+    """
+
+    @docs.get_location_tree_docs
+    def get(self, request, code=None):
+        tree = render_tree(code)
+        if tree is None:
+            return Response(
+                {"error": "Location not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        version = request.query_params.get("version")
+        if version is not None and version != tree_version():
+            query = request.query_params.copy()
+            query["version"] = tree_version()
+            return HttpResponseRedirect(f"{request.path}?{query.urlencode()}")
+
+        gzipped = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        etag = f'"{tree.etag}-gzip"' if gzipped else f'"{tree.etag}"'
+
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in if_none_match or etag in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                tree.gzipped if gzipped else tree.body,
+                content_type="application/json",
+            )
+            if gzipped:
+                response["Content-Encoding"] = "gzip"
+
+        response["ETag"] = etag
+        patch_vary_headers(response, ["Accept-Encoding"])
+        if version is None:
+            response["Cache-Control"] = "public, no-cache"
+        else:
+            response["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 # class SchoolCreateView(generics.CreateAPIView):
 #     """
 #     API endpoint for creating a new school.
@@ -148,7 +262,7 @@ class SchoolCreateView(generics.CreateAPIView):
 
     serializer_class = SchoolCreateSerializer
 
-    @create_school_docs
+    @docs.create_school_docs
     def post(self, request, *args, **kwargs):
         try:
             return super().post(request, *args, **kwargs)
@@ -156,6 +270,31 @@ class SchoolCreateView(generics.CreateAPIView):
             raise  # Re-raise the exception after logging it
 
 
+class SchoolDocumentCreateView(generics.CreateAPIView):
+    """
+    API endpoint for creating a school together with its location, fees,
+    contact, alumni network, government data and admission policy in one
+    request.
+    """
+
+    serializer_class = SchoolDocumentSerializer
+    permission_classes = [IsAuthenticated]
+
+    @docs.create_school_document_docs
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        school = serializer.save()
+
+        school = SchoolDetailSerializer.setup_eager_loading(School.objects.all()).get(
+            pk=school.pk
+        )
+        return Response(
+            SchoolDetailSerializer(school, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class SchoolListAPIView(generics.ListAPIView):
     """
     API endpoint for retrieving a list of schools.
@@ -163,10 +302,10 @@ class SchoolListAPIView(generics.ListAPIView):
     This endpoint provides a list of all schools with their codes and names.
     """
 
-    queryset = School.objects.all()
+    queryset = SchoolListSerializer.setup_eager_loading(School.objects.all())
     serializer_class = SchoolListSerializer
 
-    @get_school_lists_docs
+    @docs.get_school_lists_docs
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
@@ -179,7 +318,7 @@ class SchoolListByIndependentLocationAPIView(generics.ListAPIView):
 
     serializer_class = SchoolDetailSerializer
 
-    @filter_school_by_location_docs
+    @docs.filter_school_by_location_docs
     def get(self, request, *args, **kwargs):
         try:
             # Get and validate location parameters
@@ -203,7 +342,7 @@ class SchoolListByIndependentLocationAPIView(generics.ListAPIView):
             if value:
                 queryset = queryset.filter(**{f"schoollocation__{param}": value})
 
-        return queryset.distinct()
+        return SchoolDetailSerializer.setup_eager_loading(queryset.distinct())
 
 
 class SchoolListByHierarchicalLocationAPIView(generics.ListAPIView):
@@ -214,7 +353,7 @@ class SchoolListByHierarchicalLocationAPIView(generics.ListAPIView):
 
     serializer_class = SchoolDetailSerializer
 
-    @filter_school_by_location_hierarchical_docs
+    @docs.filter_school_by_location_hierarchical_docs
     def get(self, request, *args, **kwargs):
         try:
             # Get and validate location parameters
@@ -238,7 +377,7 @@ class SchoolListByHierarchicalLocationAPIView(generics.ListAPIView):
             if value:
                 queryset = queryset.filter(**{f"schoollocation__{param}": value})
 
-        return queryset.distinct()
+        return SchoolDetailSerializer.setup_eager_loading(queryset.distinct())
 
 
 class SchoolFilterOptionsAPIView(APIView):
@@ -247,7 +386,7 @@ class SchoolFilterOptionsAPIView(APIView):
     This helps frontend developers understand available choices for filtering schools.
     """
 
-    @get_school_filters_docs
+    @docs.get_school_filters_docs
     def get(self, request):
         filter_options = {
             "ownership_types": [
@@ -287,7 +426,7 @@ class SchoolListByFiltersAPIView(generics.ListAPIView):
 
     serializer_class = SchoolDetailSerializer
 
-    @filter_school_docs
+    @docs.filter_school_docs
     def get(self, request, *args, **kwargs):
         try:
             # Get filter parameters
@@ -341,7 +480,7 @@ class SchoolListByFiltersAPIView(generics.ListAPIView):
         if discipline:
             queryset = queryset.filter(admissionpolicy__discipline_policy=discipline)
 
-        return queryset.distinct()
+        return SchoolDetailSerializer.setup_eager_loading(queryset.distinct())
 
 
 class SchoolLocationCreateView(generics.CreateAPIView):
@@ -354,7 +493,7 @@ class SchoolLocationCreateView(generics.CreateAPIView):
 
     serializer_class = SchoolLocationSerializer
 
-    @create_school_location_docs
+    @docs.create_school_location_docs
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -364,14 +503,89 @@ class SchoolDetailView(generics.RetrieveAPIView):
     API endpoint for retrieving detailed information about a school.
     """
 
-    queryset = School.objects.all()
+    queryset = SchoolDetailSerializer.setup_eager_loading(School.objects.all())
     serializer_class = SchoolDetailSerializer
 
-    @get_school_details_docs
+    @docs.get_school_details_docs
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
 
+class SchoolBatchView(BatchRetrieveView):
+    """
+    API endpoint for retrieving several schools at once, by id or by school
+    code, in request order.
+    """
+
+    lookup_params = {"ids": "id", "codes": "school_code"}
+    serializer_class = SchoolDetailSerializer
+    not_found_message = "School not found"
+
+    def get_queryset(self):
+        return SchoolDetailSerializer.setup_eager_loading(School.objects.all())
+
+    @docs.get_schools_batch_docs
+    def get(self, request):
+        return self.batch_retrieve(request)
+
+
+class SchoolLeaderboardView(LeaderboardView):
+    """
+    API endpoint for the top rated schools, optionally by province, district
+    and school type.
+    """
+
+    model = School
+    serializer_class = SchoolListSerializer
+    object_name = "school"
+    kind_field = "school_type"
+
+    def get_queryset(self):
+        return SchoolListSerializer.setup_eager_loading(School.objects.all())
+
+    @docs.get_schools_leaderboard_docs
+    def get(self, request):
+        return self.leaderboard(request)
+
+
+class SchoolSearchView(SearchView):
+    """
+    API endpoint for searching schools by name, description and location.
+    """
+
+    model = School
+    serializer_class = SchoolListSerializer
+    object_name = "school"
+
+    def get_queryset(self):
+        return SchoolListSerializer.setup_eager_loading(School.objects.all())
+
+    @docs.search_schools_docs
+    def get(self, request):
+        return self.search(request)
+
+
+class SchoolNearbyView(NearbyView):
+    """
+    API endpoint for the schools nearest to a point, optionally by type and
+    within a radius.
+    """
+
+    model = School
+    serializer_class = SchoolListSerializer
+    object_name = "school"
+    kind_field = "school_type"
+    location_model = SchoolLocation
+    owner_field = "school"
+
+    def get_queryset(self):
+        return SchoolListSerializer.setup_eager_loading(School.objects.all())
+
+    @docs.get_schools_nearby_docs
+    def get(self, request):
+        return self.nearby(request)
+
+
 class SchoolImageCreateView(generics.CreateAPIView):
     """
     API endpoint for uploading multiple images for a school.
@@ -379,7 +593,7 @@ class SchoolImageCreateView(generics.CreateAPIView):
 
     serializer_class = MultipleSchoolImageSerializer
 
-    @create_school_image_docs
+    @docs.create_school_image_docs
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -401,7 +615,7 @@ class SchoolFeesCreateView(generics.CreateAPIView):
 
     serializer_class = SchoolFeesSerializer
 
-    @create_school_fees_docs
+    @docs.create_school_fees_docs
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -413,7 +627,7 @@ class SchoolContactCreateView(generics.CreateAPIView):
 
     serializer_class = SchoolContactSerializer
 
-    @create_school_contact_docs
+    @docs.create_school_contact_docs
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -425,7 +639,7 @@ class AlumniNetworkCreateView(generics.CreateAPIView):
 
     serializer_class = AlumniNetworkSerializer
 
-    @create_alumni_network_docs
+    @docs.create_alumni_network_docs
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -437,7 +651,7 @@ class SchoolGovernmentDataCreateView(generics.CreateAPIView):
 
     serializer_class = SchoolGovernmentDataSerializer
 
-    @create_school_government_data_docs
+    @docs.create_school_government_data_docs
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -449,7 +663,7 @@ class AdmissionPolicyCreateView(generics.CreateAPIView):
 
     serializer_class = AdmissionPolicySerializer
 
-    @create_school_admission_policy_docs
+    @docs.create_school_admission_policy_docs
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -460,4 +674,6 @@ class UserSchoolListsAPIView(generics.ListAPIView):
 
     def get_queryset(self):
         current_user = self.request.user
-        return School.objects.filter(created_by=current_user)
+        return SchoolListSerializer.setup_eager_loading(
+            School.objects.filter(created_by=current_user)
+        )
@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from rest_framework import serializers
 from .models import (
     HealthFacility,
@@ -12,15 +14,87 @@ from .models import (
     GovernmentData,
     AdvancedFacilityData,
 )
-from edudata.location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+from edudata.location_index import is_valid_code, is_valid_child
+from opendataproject.search import schedule_search_update
+from .service_catalogue import resolve_services
 from .validators import (
     validate_special_programs,
     validate_performance_metrics,
     validate_laboratories,
+    validate_facility_expansion,
 )
 
 
-class HealthFacilityListSerializer(serializers.ModelSerializer):
+class FacilityExpansionMixin:
+    """
+    Lets a facility serializer embed a chosen set of related records
+    (`include`) and return only chosen fields of the facility itself
+    (`fields`), so a client can fetch everything one screen needs in a single
+    request. `None` keeps the serializer's own defaults. Relations that are
+    not included are neither serialized nor loaded, see setup_eager_loading.
+    """
+
+    def __init__(self, *args, include=None, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.include = include
+        self.only_fields = fields
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.include is not None:
+            for name, (serializer_class, many) in FACILITY_RELATIONS.items():
+                if name not in self.include:
+                    fields.pop(name, None)
+                elif name not in fields:
+                    fields[name] = serializer_class(many=many, read_only=True)
+        if self.only_fields is not None:
+            for name in list(fields):
+                if name not in self.only_fields and name not in FACILITY_RELATIONS:
+                    del fields[name]
+        return fields
+
+    @classmethod
+    def get_expansion(cls, query_params):
+        """
+        Reads the comma-separated `include` and `fields` query parameters,
+        returning the keyword arguments for the serializer. Raises a
+        ValidationError for unknown names.
+        """
+        expansion = {}
+        for param in ("include", "fields"):
+            value = query_params.get(param)
+            if value is not None:
+                expansion[param] = [name for name in value.split(",") if name]
+
+        field_choices = [
+            name for name in cls().fields if name not in FACILITY_RELATIONS
+        ]
+        validate_facility_expansion(
+            include=expansion.get("include"),
+            fields=expansion.get("fields"),
+            include_choices=list(FACILITY_RELATIONS),
+            field_choices=field_choices,
+        )
+        return expansion
+
+    @staticmethod
+    def include_related(queryset, include):
+        """
+        Loads the included relations: one-to-one records are joined in, and
+        population statistics, images and offered services are prefetched.
+        """
+        joined = [name for name in include if not FACILITY_RELATIONS[name][1]]
+        prefetched = [name for name in include if FACILITY_RELATIONS[name][1]]
+        if "services" in include:
+            prefetched.append("services__offered_services")
+        # select_related() without arguments would follow every foreign key
+        # instead of keeping the joins already on the queryset.
+        if joined:
+            queryset = queryset.select_related(*joined)
+        return queryset.prefetch_related(*prefetched)
+
+
+class HealthFacilityListSerializer(FacilityExpansionMixin, serializers.ModelSerializer):
     """Serializer for listing health facilities with limited details"""
 
     address = serializers.CharField(source="location.address", read_only=True)
@@ -48,20 +122,36 @@ class HealthFacilityListSerializer(serializers.ModelSerializer):
             "cover",
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, include=()):
+        """
+        Joins the location and contact details and annotates the first offered
+        service and the first image of each facility, so a list renders from
+        a single query instead of several queries per facility. Included
+        relations are loaded alongside, a fixed number of queries per page.
+        """
+        services = Service.objects.filter(
+            healthfacilityservices__facility=OuterRef("pk")
+        ).order_by("pk")
+        images = FacilityImage.objects.filter(facility=OuterRef("pk")).order_by("pk")
+        queryset = queryset.select_related("location", "contact_info").annotate(
+            first_service_name=Subquery(services.values("service_name")[:1]),
+            cover_image=Subquery(images.values("image")[:1]),
+        )
+        return cls.include_related(queryset, include)
+
     def get_service_name(self, obj):
         """
         Retrieves the first available service name for the facility.
         If the facility has no services, returns None.
         """
-        if hasattr(obj, "services") and obj.services is not None:
-            services = obj.services.offered_services.all()
-            return services[0].service_name if services.exists() else None
-        return None
+        return obj.first_service_name
 
     def get_cover(self, obj):
         """Retrieve the first image of the facility"""
-        image = obj.images.first()
-        return image.image.url if image else None
+        if obj.cover_image:
+            return FacilityImage._meta.get_field("image").storage.url(obj.cover_image)
+        return None
 
 
 class LocationSerializer(serializers.ModelSerializer):
@@ -101,32 +191,28 @@ class LocationSerializer(serializers.ModelSerializer):
             province = data["province"]
             if "district" in data:
                 district = data["district"]
-                valid_districts = [d[0] for d in DISTRICTS.get(province, [])]
-                if district not in valid_districts:
+                if not is_valid_child("district", district, province):
                     errors["district"] = [
                         "Invalid district code for the selected province"
                     ]
 
                 if "sector" in data:
                     sector = data["sector"]
-                    valid_sectors = [s[0] for s in SECTORS.get(district, [])]
-                    if sector not in valid_sectors:
+                    if not is_valid_child("sector", sector, district):
                         errors["sector"] = [
                             "Invalid sector code for the selected district"
                         ]
 
                     if "cell" in data:
                         cell = data["cell"]
-                        valid_cells = [c[0] for c in CELLS.get(sector, [])]
-                        if cell not in valid_cells:
+                        if not is_valid_child("cell", cell, sector):
                             errors["cell"] = [
                                 "Invalid cell code for the selected sector"
                             ]
 
                         if "village" in data:
                             village = data["village"]
-                            valid_villages = [v[0] for v in VILLAGES.get(cell, [])]
-                            if village not in valid_villages:
+                            if not is_valid_child("village", village, cell):
                                 errors["village"] = [
                                     "Invalid village code for the selected cell"
                                 ]
@@ -139,40 +225,35 @@ class LocationSerializer(serializers.ModelSerializer):
     def validate_province(self, value):
         if not value:
             raise serializers.ValidationError("This field is required.")
-        valid_provinces = [p[0] for p in PROVINCES]
-        if value not in valid_provinces:
+        if not is_valid_code("province", value):
             raise serializers.ValidationError("Invalid province code")
         return value
 
     def validate_district(self, value):
-        # Check if district code exists in DISTRICTS for the given province
+        # Check if district code belongs to the given province
         province_code = self.initial_data.get("province")
-        valid_districts = [d[0] for d in DISTRICTS.get(province_code, [])]
-        if value not in valid_districts:
+        if not is_valid_child("district", value, province_code):
             raise serializers.ValidationError("Invalid district code")
         return value
 
     def validate_sector(self, value):
-        # Check if sector code exists in SECTORS for the given district
+        # Check if sector code belongs to the given district
         district_code = self.initial_data.get("district")
-        valid_sectors = [s[0] for s in SECTORS.get(district_code, [])]
-        if value not in valid_sectors:
+        if not is_valid_child("sector", value, district_code):
             raise serializers.ValidationError("Invalid sector code")
         return value
 
     def validate_cell(self, value):
-        # Check if cell code exists in CELLS for the given sector
+        # Check if cell code belongs to the given sector
         sector_code = self.initial_data.get("sector")
-        valid_cells = [c[0] for c in CELLS.get(sector_code, [])]
-        if value not in valid_cells:
+        if not is_valid_child("cell", value, sector_code):
             raise serializers.ValidationError("Invalid cell code")
         return value
 
     def validate_village(self, value):
-        # Check if village code exists in VILLAGES for the given cell
+        # Check if village code belongs to the given cell
         cell_code = self.initial_data.get("cell")
-        valid_villages = [v[0] for v in VILLAGES.get(cell_code, [])]
-        if value not in valid_villages:
+        if not is_valid_child("village", value, cell_code):
             raise serializers.ValidationError("Invalid village code")
         return value
 
@@ -181,6 +262,9 @@ class ServiceDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
         fields = ["service_name", "description"]
+        # Offered services are looked up by name when saved, so naming an
+        # existing service is valid.
+        extra_kwargs = {"service_name": {"validators": []}}
 
 
 class FacilityImageSerializer(serializers.ModelSerializer):
@@ -248,15 +332,35 @@ class ServicesSerializer(serializers.ModelSerializer):
         health_facility_service = HealthFacilityServices.objects.create(
             **validated_data
         )
+        self.link_services(
+            [(health_facility_service, resolve_services(offered_services_data))]
+        )
+        return health_facility_service
 
-        # Handling ManyToMany relationship
-        offered_services_instances = []
-        for service_data in offered_services_data:
-            service_instance, created = Service.objects.get_or_create(**service_data)
-            offered_services_instances.append(service_instance)
+    def update(self, instance, validated_data):
+        offered_services_data = validated_data.pop("offered_services", None)
+        instance = super().update(instance, validated_data)
+        if offered_services_data is not None:
+            instance.offered_services.clear()
+            self.link_services([(instance, resolve_services(offered_services_data))])
+        return instance
 
-        health_facility_service.offered_services.set(offered_services_instances)
-        return health_facility_service
+    @staticmethod
+    def link_services(entries):
+        """
+        Links each services record of (record, services) `entries` to its
+        offered services, with one insert for all of them.
+        """
+        Link = HealthFacilityServices.offered_services.through
+        Link.objects.bulk_create(
+            Link(healthfacilityservices=record, service=service)
+            for record, services in entries
+            for service in services
+        )
+        # bulk_create sends no m2m_changed signal.
+        schedule_search_update(
+            HealthFacility, [record.facility_id for record, _ in entries]
+        )
 
 
 class ResourcesSerializer(serializers.ModelSerializer):
@@ -299,7 +403,21 @@ class ContactSerializer(serializers.ModelSerializer):
         return value
 
 
-class HealthFacilitySerializer(serializers.ModelSerializer):
+# Relations a facility serializer can embed: name -> (serializer, many).
+FACILITY_RELATIONS = {
+    "location": (LocationSerializer, False),
+    "services": (ServicesSerializer, False),
+    "resources": (ResourcesSerializer, False),
+    "contact_info": (ContactSerializer, False),
+    "population_stats": (PopulationStatsSerializer, True),
+    "fees": (FacilityFeesSerializer, False),
+    "government_data": (GovernmentDataSerializer, False),
+    "advanced_data": (AdvancedDataSerializer, False),
+    "images": (FacilityImageSerializer, True),
+}
+
+
+class HealthFacilitySerializer(FacilityExpansionMixin, serializers.ModelSerializer):
     location = LocationSerializer(required=False)
     services = ServicesSerializer(required=False)
     resources = ResourcesSerializer(required=False)
@@ -312,9 +430,19 @@ class HealthFacilitySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = HealthFacility
-        fields = "__all__"
+        exclude = ("search_name", "search_vector")
         read_only_fields = ("facility_id",)
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, include=None):
+        """
+        Loads the included relations of each facility, all of them when
+        `include` is None.
+        """
+        if include is None:
+            include = FACILITY_RELATIONS
+        return cls.include_related(queryset, include)
+
     def validate(self, data):
         if "facility_name" in data and len(data["facility_name"]) < 3:
             raise serializers.ValidationError(
@@ -392,3 +520,104 @@ class HealthFacilityUpdateSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class FacilityDocumentLocationSerializer(LocationSerializer):
+    @property
+    def initial_data(self):
+        # Nested in a facility document: the per-level validators read the
+        # submitted parent codes from the document's location.
+        return self.parent.initial_data.get(self.field_name, {})
+
+
+class HealthFacilityDocumentSerializer(HealthFacilityCreateSerializer):
+    """
+    A health facility with its location, services, resources, contact,
+    population statistics, fees, government data and advanced data. The
+    document is validated in one pass and written in one transaction, with
+    population rows and services inserted in bulk. Saving over an existing
+    facility replaces all of these records; images are kept.
+    """
+
+    location = FacilityDocumentLocationSerializer(required=False)
+    services = ServicesSerializer(required=False)
+    resources = ResourcesSerializer(required=False)
+    contact_info = ContactSerializer(required=False)
+    population_stats = PopulationStatsSerializer(many=True, required=False)
+    fees = FacilityFeesSerializer(required=False)
+    government_data = GovernmentDataSerializer(required=False)
+    advanced_data = AdvancedDataSerializer(required=False)
+
+    # Document key -> model of the one-to-one records.
+    related_models = {
+        "location": HealthFacilityLocation,
+        "resources": FacilityResources,
+        "contact_info": ContactInformation,
+        "fees": FacilityFees,
+        "government_data": GovernmentData,
+        "advanced_data": AdvancedFacilityData,
+    }
+    nested_fields = [*related_models, "services", "population_stats"]
+
+    class Meta(HealthFacilityCreateSerializer.Meta):
+        fields = HealthFacilityCreateSerializer.Meta.fields + [
+            "location",
+            "services",
+            "resources",
+            "contact_info",
+            "population_stats",
+            "fees",
+            "government_data",
+            "advanced_data",
+        ]
+
+    def validate_population_stats(self, value):
+        years = [row["year"] for row in value]
+        if len(years) != len(set(years)):
+            raise serializers.ValidationError(
+                "Population statistics can only be given once per year"
+            )
+        return value
+
+    def create(self, validated_data):
+        nested = self.pop_nested(validated_data)
+        with transaction.atomic():
+            facility = super().create(validated_data)
+            self.save_nested(facility, nested)
+        return facility
+
+    def update(self, instance, validated_data):
+        nested = self.pop_nested(validated_data)
+        with transaction.atomic():
+            facility = super().update(instance, validated_data)
+            for model in self.related_models.values():
+                model.objects.filter(facility=facility).delete()
+            HealthFacilityServices.objects.filter(facility=facility).delete()
+            HealthFacilityPopulation.objects.filter(facility=facility).delete()
+            self.save_nested(facility, nested)
+        return facility
+
+    def pop_nested(self, validated_data):
+        return {
+            name: validated_data.pop(name)
+            for name in self.nested_fields
+            if name in validated_data
+        }
+
+    def save_nested(self, facility, nested):
+        for name, model in self.related_models.items():
+            if name in nested:
+                model.objects.create(facility=facility, **nested[name])
+
+        HealthFacilityPopulation.objects.bulk_create(
+            HealthFacilityPopulation(facility=facility, **row)
+            for row in nested.get("population_stats", [])
+        )
+
+        if "services" in nested:
+            services_data = dict(nested["services"])
+            offered = resolve_services(services_data.pop("offered_services", []))
+            facility_services = HealthFacilityServices.objects.create(
+                facility=facility, **services_data
+            )
+            ServicesSerializer.link_services([(facility_services, offered)])
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class HealthdataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "healthdata"
+
+    def ready(self):
+        # Connects the receivers that keep the Service cache and the search
+        # backend up to date.
+        from . import search_index, service_catalogue  # noqa: F401
@@ -0,0 +1,300 @@
+"""
+Bulk import of health facilities from CSV or NDJSON registry files.
+
+Each record holds a facility and, optionally, its location, contact, fees,
+services and population statistics, with the model field names as columns
+(see FACILITY_COLUMNS, RELATED_COLUMNS and SERVICES_COLUMNS):
+
+    facility_code,facility_name,facility_type,ownership,province,...,phone
+
+Two columns hold several values:
+
+- `offered_services`: a list of service names, `;`-separated in CSV;
+- `population_stats`: a list of objects with the HealthFacilityPopulation
+  fields, JSON text in CSV.
+
+Records are validated in Python without queries, like the school import. A
+record that fails is reported with its line number and skipped.
+
+Valid records are written in batches, one transaction per batch:
+
+- facilities are upserted on `facility_code` with a single INSERT ... ON
+  CONFLICT, so importing the same file twice leaves the same rows. Records
+  without a code are new facilities; the batch's codes for them are
+  allocated with one query;
+- location, contact, fees, services and population rows are replaced for
+  the batch's facilities that have data for them, loaded with PostgreSQL
+  COPY (bulk_create on other databases);
+- the service names of the whole batch are resolved at once from the
+  cached service catalogue, and the missing services created with one
+  insert.
+"""
+
+import json
+from django.core.exceptions import ValidationError
+
+from edudata.location_index import LEVELS, location_errors
+from opendataproject.bulk_import import BulkImporter, clean_columns, has_values
+from opendataproject.search import schedule_search_update
+from .models import (
+    HealthFacility,
+    HealthFacilityLocation,
+    HealthFacilityServices,
+    HealthFacilityPopulation,
+    ContactInformation,
+    FacilityFees,
+    Service,
+)
+from .service_catalogue import resolve_services
+
+FACILITY_COLUMNS = [
+    "facility_code",
+    "facility_name",
+    "facility_type",
+    "level",
+    "ownership",
+]
+REQUIRED_COLUMNS = ["facility_name", "facility_type", "ownership"]
+RELATED_COLUMNS = {
+    HealthFacilityLocation: ["address", *LEVELS, "latitude", "longitude"],
+    ContactInformation: ["phone", "whatsapp", "email", "website"],
+    FacilityFees: ["consultation_fee", "insurance_accepted"],
+}
+SERVICES_COLUMNS = ["accreditation_status", "emergency_services"]
+POPULATION_COLUMNS = [
+    "year",
+    "total_patients",
+    "male_patients",
+    "female_patients",
+    "total_staff",
+    "doctors",
+    "nurses",
+    "other_staff",
+]
+
+
+def clean_related(model, columns, record, errors):
+    """
+    Cleans the values of a related record, which is replaced as a whole, so
+    missing columns get their default or are required.
+    """
+    return clean_columns(
+        model, columns, {column: record.get(column) for column in columns}, errors
+    )
+
+
+def clean_service_names(value):
+    if isinstance(value, str):
+        value = value.split(";")
+    if not isinstance(value, list):
+        raise ValidationError("Expected a list of service names.")
+    max_length = Service._meta.get_field("service_name").max_length
+    names = []
+    for name in value:
+        if not isinstance(name, str):
+            raise ValidationError("Expected a list of service names.")
+        name = name.strip()
+        if len(name) > max_length:
+            raise ValidationError(
+                f"Service names have at most {max_length} characters."
+            )
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def clean_population_stats(value, errors):
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = None
+    if not isinstance(value, list) or not all(
+        isinstance(entry, dict) for entry in value
+    ):
+        errors["population_stats"] = ["Expected a list of objects."]
+        return []
+
+    stats = []
+    for index, entry in enumerate(value):
+        entry_errors = {}
+        stats.append(
+            clean_related(
+                HealthFacilityPopulation, POPULATION_COLUMNS, entry, entry_errors
+            )
+        )
+        for column, messages in entry_errors.items():
+            errors[f"population_stats[{index}].{column}"] = messages
+    years = [row["year"] for row in stats if "year" in row]
+    if len(years) != len(set(years)):
+        errors["population_stats"] = [
+            "Population statistics can only be given once per year."
+        ]
+    return stats
+
+
+class FacilityImporter(BulkImporter):
+    """
+    Imports records from read_csv/read_ndjson, see the module docstring.
+    """
+
+    model = HealthFacility
+    key_field = "facility_code"
+
+    def clean_record(self, record):
+        """
+        Returns (facility values, {related model: values}), where the values
+        are a list for population statistics and a (values, service names)
+        pair for services.
+        """
+        if isinstance(record, str):
+            raise ValidationError(record)
+
+        errors = {}
+        columns = FACILITY_COLUMNS
+        if record.get("facility_code") in (None, ""):
+            columns = [column for column in columns if column != "facility_code"]
+        facility = clean_columns(HealthFacility, columns, record, errors)
+        for column in REQUIRED_COLUMNS:
+            if column not in record:
+                errors[column] = ["This field is required."]
+
+        related = {}
+        for model, columns in RELATED_COLUMNS.items():
+            if has_values(record, columns):
+                related[model] = clean_related(model, columns, record, errors)
+        if HealthFacilityLocation in related and not errors.keys() & set(LEVELS):
+            errors.update(location_errors(related[HealthFacilityLocation]))
+
+        if has_values(record, [*SERVICES_COLUMNS, "offered_services"]):
+            values = clean_related(
+                HealthFacilityServices, SERVICES_COLUMNS, record, errors
+            )
+            try:
+                names = clean_service_names(record.get("offered_services") or [])
+            except ValidationError as e:
+                errors["offered_services"] = e.messages
+                names = []
+            related[HealthFacilityServices] = (values, names)
+
+        if record.get("population_stats") not in (None, ""):
+            related[HealthFacilityPopulation] = clean_population_stats(
+                record["population_stats"], errors
+            )
+
+        if errors:
+            raise ValidationError(errors)
+        return facility, related
+
+    def write_batch(self, batch, report):
+        new = [
+            (line_number, values)
+            for line_number, values, _related in batch
+            if self.key_field not in values
+        ]
+        if self.dry_run:
+            # Nothing is saved, so no code is used up: a placeholder per line
+            # keeps the new rows apart.
+            codes = [f"new facility on line {line_number}" for line_number, _ in new]
+        else:
+            # Explicit codes are reserved first, so none is allocated below.
+            HealthFacility.reserve_facility_codes(
+                [
+                    values[self.key_field]
+                    for _line, values, _related in batch
+                    if self.key_field in values
+                ]
+            )
+            codes = HealthFacility.allocate_facility_codes(len(new))
+        for (_line, values), code in zip(new, codes):
+            values[self.key_field] = code
+        self.allocated_codes = set(codes)
+        super().write_batch(batch, report)
+
+    def save_facilities(self, rows):
+        """
+        Saves the facilities of `rows`, returning them in the same order.
+        Rows with an allocated code are plain inserts, so a code that is
+        taken after all fails the batch instead of overwriting a facility.
+        """
+        new = [row for row in rows if row[1][self.key_field] in self.allocated_codes]
+        given = [
+            row for row in rows if row[1][self.key_field] not in self.allocated_codes
+        ]
+        saved = {
+            facility.facility_code: facility
+            for facility in [
+                *self.upsert(given, FACILITY_COLUMNS),
+                *HealthFacility.objects.bulk_create(
+                    HealthFacility(**values) for _line, values, _related in new
+                ),
+            ]
+        }
+        return [saved[values[self.key_field]] for _line, values, _related in rows]
+
+    def save_rows(self, rows):
+        facilities = self.save_facilities(rows)
+        with_data = {
+            model: [
+                (facility, related[model])
+                for facility, (_line, _facility, related) in zip(facilities, rows)
+                if model in related
+            ]
+            for model in [
+                *RELATED_COLUMNS,
+                HealthFacilityServices,
+                HealthFacilityPopulation,
+            ]
+        }
+        for model, entries in with_data.items():
+            if entries:
+                model.objects.filter(
+                    facility__in=[facility.pk for facility, _data in entries]
+                ).delete()
+
+        for model in RELATED_COLUMNS:
+            records = [
+                model(facility=facility, **values)
+                for facility, values in with_data[model]
+            ]
+            if records:
+                self.insert(model, records)
+
+        population = [
+            HealthFacilityPopulation(facility=facility, **row)
+            for facility, stats in with_data[HealthFacilityPopulation]
+            for row in stats
+        ]
+        if population:
+            self.insert(HealthFacilityPopulation, population)
+        self.save_services(with_data[HealthFacilityServices])
+        schedule_search_update(HealthFacility, [facility.pk for facility in facilities])
+
+    def save_services(self, entries):
+        """
+        Creates the services records of `entries` and links their offered
+        services, resolving every name of the batch at once.
+        """
+        if not entries:
+            return
+        # bulk_create rather than COPY: the new ids are needed for the links.
+        facility_services = HealthFacilityServices.objects.bulk_create(
+            HealthFacilityServices(facility=facility, **values)
+            for facility, (values, _names) in entries
+        )
+        names = {name for _facility, (_values, names) in entries for name in names}
+        services = {
+            service.service_name: service
+            for service in resolve_services([{"service_name": name} for name in names])
+        }
+        Link = HealthFacilityServices.offered_services.through
+        self.insert(
+            Link,
+            [
+                Link(healthfacilityservices=record, service=services[name])
+                for record, (_facility, (_values, names)) in zip(
+                    facility_services, entries
+                )
+                for name in names
+            ],
+        )
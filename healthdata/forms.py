@@ -1,6 +1,6 @@
 from django import forms
 from .models import HealthFacilityLocation
-from edudata.location_data import PROVINCES, DISTRICTS, SECTORS, CELLS, VILLAGES
+from edudata import locations
 
 
 class HealthFacilityLocationForm(forms.ModelForm):
@@ -8,7 +8,7 @@ class HealthFacilityLocationForm(forms.ModelForm):
         model = HealthFacilityLocation
         fields = "__all__"
         widgets = {
-            "province": forms.Select(choices=[("", "---------")] + list(PROVINCES)),
+            "province": forms.Select(),
             "district": forms.Select(),
             "sector": forms.Select(),
             "cell": forms.Select(),
@@ -18,8 +18,10 @@ class HealthFacilityLocationForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Populate province choices
-        self.fields["province"].widget.choices = [("", "---------")] + list(PROVINCES)
+        # Populate province choices (loaded on first use, not at import)
+        self.fields["province"].widget.choices = [("", "---------")] + list(
+            locations.PROVINCES
+        )
 
         # Get initial values
         province = (
@@ -39,22 +41,22 @@ class HealthFacilityLocationForm(forms.ModelForm):
 
         # Set choices dynamically
         self.fields["district"].widget.choices = (
-            [("", "---------")] + DISTRICTS.get(province, [])
+            [("", "---------")] + locations.DISTRICTS.get(province, [])
             if province
             else [("", "---------")]
         )
         self.fields["sector"].widget.choices = (
-            [("", "---------")] + SECTORS.get(district, [])
+            [("", "---------")] + locations.SECTORS.get(district, [])
             if district
             else [("", "---------")]
         )
         self.fields["cell"].widget.choices = (
-            [("", "---------")] + CELLS.get(sector, [])
+            [("", "---------")] + locations.CELLS.get(sector, [])
             if sector
             else [("", "---------")]
         )
         self.fields["village"].widget.choices = (
-            [("", "---------")] + VILLAGES.get(cell, [])
+            [("", "---------")] + locations.VILLAGES.get(cell, [])
             if cell
             else [("", "---------")]
         )
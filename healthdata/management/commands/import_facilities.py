@@ -0,0 +1,10 @@
+from healthdata.facility_import import FacilityImporter
+from opendataproject.bulk_import import BaseImportCommand
+
+
+class Command(BaseImportCommand):
+    help = (
+        "Imports health facilities and their location, contact, fees, services "
+        "and population statistics from a CSV or NDJSON file"
+    )
+    importer_class = FacilityImporter
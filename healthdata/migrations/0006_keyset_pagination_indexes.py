@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("healthdata", "0005_alter_healthfacility_verified_by"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="healthfacility",
+            index=models.Index(
+                fields=["average_rating", "id"], name="facility_rating_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="healthfacility",
+            index=models.Index(
+                fields=["updated_at", "id"], name="facility_updated_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+# Allocated codes are RW followed by 0 and 7 digits, the sequence stops at
+# 9999999 instead of running into the RW10000000-RW99999999 codes generated
+# at random before. It starts after any existing code in its range.
+CREATE_SEQUENCE = """
+CREATE SEQUENCE healthdata_facility_code_seq MINVALUE 1 MAXVALUE 9999999;
+SELECT setval(
+    'healthdata_facility_code_seq',
+    COALESCE(MAX(SUBSTRING(facility_code FROM 3)::integer), 0) + 1,
+    false
+)
+FROM healthdata_healthfacility
+WHERE facility_code ~ '^RW0[0-9]{7}$';
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("healthdata", "0006_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_SEQUENCE,
+            reverse_sql="DROP SEQUENCE healthdata_facility_code_seq;",
+        ),
+    ]
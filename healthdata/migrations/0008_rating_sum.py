@@ -0,0 +1,45 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:47
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_sum(apps, schema_editor):
+    """
+    Sets the rating sum from the existing reviews. On a new database there
+    are no reviews, nor yet a content type to look them up by.
+    """
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Review = apps.get_model("accounts", "Review")
+    HealthFacility = apps.get_model("healthdata", "HealthFacility")
+    content_type = ContentType.objects.filter(
+        app_label="healthdata", model="healthfacility"
+    ).first()
+    if content_type is None:
+        return
+    totals = (
+        Review.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .order_by()
+        .values("object_id")
+        .annotate(total=Sum("rating"))
+        .values("total")
+    )
+    HealthFacility.objects.update(rating_sum=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_review"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("healthdata", "0007_facility_code_sequence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="healthfacility",
+            name="rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-16 23:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Installs pg_trgm and indexes the normalized names for typo-tolerant
+    search, when the server provides the extension. Without it, search
+    falls back to word prefixes (see opendataproject.search).
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS facility_search_name_trgm_idx "
+        "ON healthdata_healthfacility USING gin (search_name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS facility_search_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("healthdata", "0008_rating_sum"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="healthfacility",
+            name="search_name",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="healthfacility",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="healthfacility",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="facility_search_idx"
+            ),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
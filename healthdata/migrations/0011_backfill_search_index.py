@@ -0,0 +1,53 @@
+from django.db import migrations
+
+from edudata.location_index import LEVELS, location_text
+from opendataproject.search import UPDATE_BATCH_SIZE, write_search_columns
+
+
+def backfill_search_columns(apps, schema_editor):
+    """
+    Fills the search columns of the facilities created before they were
+    added, like HealthFacility.search_documents. Later changes update them
+    as they happen.
+    """
+    HealthFacility = apps.get_model("healthdata", "HealthFacility")
+    HealthFacilityLocation = apps.get_model("healthdata", "HealthFacilityLocation")
+    HealthFacilityServices = apps.get_model("healthdata", "HealthFacilityServices")
+    Link = HealthFacilityServices.offered_services.through
+    pks = list(
+        HealthFacility.objects.filter(is_deleted=False)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    for start in range(0, len(pks), UPDATE_BATCH_SIZE):
+        batch = pks[start : start + UPDATE_BATCH_SIZE]
+        related = {}
+        for location in HealthFacilityLocation.objects.filter(
+            facility__in=batch
+        ).values("facility_id", "address", *LEVELS):
+            related.setdefault(location["facility_id"], []).append(
+                location_text(location)
+            )
+        for facility_id, service_name in Link.objects.filter(
+            healthfacilityservices__facility__in=batch
+        ).values_list("healthfacilityservices__facility_id", "service__service_name"):
+            related.setdefault(facility_id, []).append(service_name)
+        write_search_columns(
+            HealthFacility,
+            {
+                pk: (name, "", " ".join(related.get(pk, [])))
+                for pk, name in HealthFacility.objects.filter(pk__in=batch).values_list(
+                    "pk", "facility_name"
+                )
+            },
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("healthdata", "0010_location_coordinates_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+    ]
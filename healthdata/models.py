@@ -1,8 +1,17 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models
+from django.db.models import F
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 import re as regex
-import random
 from accounts.models import CustomUser
+from edudata.location_index import LEVELS, location_text
+
+# Database sequence the facility codes are allocated from, see
+# migration 0007_facility_code_sequence.
+FACILITY_CODE_SEQUENCE = "healthdata_facility_code_seq"
+# Codes in the range of the sequence.
+SEQUENCE_CODE = regex.compile(r"^RW0\d{7}$")
 
 
 class HealthChoices:
@@ -90,6 +99,8 @@ class HealthFacility(models.Model):
         max_digits=3, decimal_places=2, blank=True, null=True
     )
     review_count = models.IntegerField(default=0)
+    # Running total of the review ratings, see Review.adjust_ratings.
+    rating_sum = models.IntegerField(default=0)
     verified = models.BooleanField(default=False)
     verified_by = models.ForeignKey(
         CustomUser,
@@ -101,18 +112,115 @@ class HealthFacility(models.Model):
     is_deleted = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained from search_documents() by the PostgreSQL search backend,
+    # see opendataproject.search.
+    search_name = models.CharField(max_length=255, default="", editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        # Keyset pagination sorts by these keys with the id as tie-breaker.
+        indexes = [
+            models.Index(
+                fields=["average_rating", "id"], name="facility_rating_id_idx"
+            ),
+            models.Index(fields=["updated_at", "id"], name="facility_updated_id_idx"),
+            GinIndex(fields=["search_vector"], name="facility_search_idx"),
+        ]
 
     def __str__(self):
         return f"{self.facility_name} ({self.facility_code})"
 
     @staticmethod
-    def generate_facility_code():
+    def leaderboard_keys():
+        """
+        Expressions for the keys facilities are ranked by in leaderboards
+        (see accounts.models.RatingRollup).
+        """
+        return {
+            "province": F("location__province"),
+            "district": F("location__district"),
+            "kind": F("facility_type"),
+        }
+
+    @classmethod
+    def search_documents(cls, pks):
+        """
+        Returns {pk: (name, description, related text)} of the given
+        facilities that are not deleted, for search (see
+        opendataproject.search), the related text being their location and
+        the names of their offered services.
+        """
+        related = {}
+        for location in HealthFacilityLocation.objects.filter(facility__in=pks).values(
+            "facility_id", "address", *LEVELS
+        ):
+            related.setdefault(location["facility_id"], []).append(
+                location_text(location)
+            )
+        Link = HealthFacilityServices.offered_services.through
+        for facility_id, service_name in Link.objects.filter(
+            healthfacilityservices__facility__in=pks
+        ).values_list("healthfacilityservices__facility_id", "service__service_name"):
+            related.setdefault(facility_id, []).append(service_name)
+        return {
+            pk: (name, "", " ".join(related.get(pk, [])))
+            for pk, name in cls.objects.filter(
+                pk__in=pks, is_deleted=False
+            ).values_list("pk", "facility_name")
+        }
+
+    @staticmethod
+    def allocate_facility_codes(count):
+        """
+        Returns `count` new facility codes in the format RW0#######, taken
+        from a database sequence in one query. Codes are never handed out
+        twice, even to concurrent transactions, so no existence check is
+        needed. The leading 0 keeps them apart from the codes generated at
+        random before (RW10000000 to RW99999999).
+        """
+        if count <= 0:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [FACILITY_CODE_SEQUENCE, count],
+            )
+            return [f"RW{value:08d}" for (value,) in cursor.fetchall()]
+
+    @classmethod
+    def generate_facility_code(cls):
+        """
+        Returns a new facility code, see allocate_facility_codes.
+        """
+        return cls.allocate_facility_codes(1)[0]
+
+    @staticmethod
+    def reserve_facility_codes(codes):
         """
-        Generates a random facility ID in the format RW#####.
+        Moves the code sequence past the given codes, so codes in its range
+        that are set explicitly (imports, the API) are not allocated again.
+        Other codes are ignored. Reservations hold an advisory lock, so two
+        of them cannot move the sequence back.
         """
-        # Generate a random 5-digit number
-        random_number = random.randint(10000000, 99999999)
-        return f"RW{random_number}"
+        values = [int(code[2:]) for code in codes if SEQUENCE_CODE.match(code)]
+        if not values:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_lock(hashtext(%s))", [FACILITY_CODE_SEQUENCE]
+            )
+            try:
+                # Until nextval is called, last_value itself is still unused.
+                cursor.execute(
+                    f"SELECT setval(%s, %s, true) FROM {FACILITY_CODE_SEQUENCE} "
+                    "WHERE CASE WHEN is_called THEN last_value ELSE last_value - 1 END"
+                    " < %s",
+                    [FACILITY_CODE_SEQUENCE, max(values), max(values)],
+                )
+            finally:
+                cursor.execute(
+                    "SELECT pg_advisory_unlock(hashtext(%s))", [FACILITY_CODE_SEQUENCE]
+                )
 
     def save(self, *args, **kwargs):
         """
@@ -120,11 +228,8 @@ class HealthFacility(models.Model):
         """
         if not self.facility_code:
             self.facility_code = self.generate_facility_code()
-            # Ensure the generated ID is unique
-            while HealthFacility.objects.filter(
-                facility_code=self.facility_code
-            ).exists():
-                self.facility_id = self.generate_facility_code()
+        elif self._state.adding:
+            self.reserve_facility_codes([self.facility_code])
         super().save(*args, **kwargs)
 
 
@@ -165,6 +270,12 @@ class HealthFacilityLocation(models.Model):
 
     class Meta:
         verbose_name = "Facility Location"
+        # Bounding-box prefilter of proximity queries, see opendataproject.geo.
+        indexes = [
+            models.Index(
+                fields=["latitude", "longitude"], name="facility_location_coords_idx"
+            )
+        ]
 
 
 class Service(models.Model):
@@ -0,0 +1,71 @@
+"""
+Receivers that keep the search backend up to date with health facilities,
+see opendataproject.search.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from opendataproject.search import schedule_search_update
+from .models import (
+    HealthFacility,
+    HealthFacilityLocation,
+    HealthFacilityServices,
+    Service,
+)
+
+Link = HealthFacilityServices.offered_services.through
+
+
+def facilities_offering(service_ids):
+    return Link.objects.filter(service__in=service_ids).values_list(
+        "healthfacilityservices__facility_id", flat=True
+    )
+
+
+@receiver(post_save, sender=HealthFacility)
+def facility_saved(instance, update_fields=None, **kwargs):
+    if update_fields is None or {"facility_name", "is_deleted"} & set(update_fields):
+        schedule_search_update(HealthFacility, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=HealthFacilityLocation)
+@receiver(post_delete, sender=HealthFacilityServices)
+def related_changed(instance, **kwargs):
+    schedule_search_update(HealthFacility, [instance.facility_id])
+
+
+@receiver(m2m_changed, sender=Link)
+def offered_services_changed(instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            schedule_search_update(HealthFacility, [instance.facility_id])
+    elif action == "pre_clear":
+        # Clearing a service's facilities reports no pk_set afterwards.
+        instance._search_facilities = list(facilities_offering([instance.pk]))
+    elif action == "post_clear":
+        schedule_search_update(HealthFacility, instance._search_facilities)
+    elif action in ("post_add", "post_remove"):
+        schedule_search_update(
+            HealthFacility,
+            HealthFacilityServices.objects.filter(pk__in=pk_set).values_list(
+                "facility_id", flat=True
+            ),
+        )
+
+
+@receiver(post_save, sender=Service)
+def service_saved(instance, created, **kwargs):
+    if not created:
+        schedule_search_update(HealthFacility, facilities_offering([instance.pk]))
+
+
+@receiver(pre_delete, sender=Service)
+def service_deleting(instance, **kwargs):
+    # The links are deleted with the service, so they are read beforehand.
+    instance._search_facilities = list(facilities_offering([instance.pk]))
+
+
+@receiver(post_delete, sender=Service)
+def service_deleted(instance, **kwargs):
+    schedule_search_update(HealthFacility, instance._search_facilities)
@@ -0,0 +1,122 @@
+"""
+Process-local cache of the Service catalogue.
+
+Services are a small table read on every write of a facility's services, so
+each worker keeps them in memory as {service_name: Service}, loaded with one
+query on first use. Saving or deleting a Service in this process clears the
+cache (see the receivers below); changes made by other workers are picked up
+once the cache is older than CATALOGUE_TTL seconds.
+
+Services deleted by another worker may still be cached, so resolved services
+are checked against the table, and locked against deletion until the
+transaction ends, before they are linked to.
+
+A catalogue read inside a transaction may hold rows that are rolled back
+later, so it is only shared once that transaction commits.
+"""
+
+import threading
+import time
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Service
+
+CATALOGUE_TTL = 300
+
+_lock = threading.Lock()
+_catalogue = None
+_loaded_at = 0.0
+
+
+def _publish(catalogue, loaded_at):
+    global _catalogue, _loaded_at
+    with _lock:
+        _catalogue, _loaded_at = catalogue, loaded_at
+
+
+def get_catalogue():
+    """
+    Returns the services by name, from the cache when it is fresh.
+    """
+    with _lock:
+        if _catalogue is not None and time.monotonic() - _loaded_at < CATALOGUE_TTL:
+            return _catalogue
+
+    loaded_at = time.monotonic()
+    catalogue = {service.service_name: service for service in Service.objects.all()}
+    transaction.on_commit(lambda: _publish(catalogue, loaded_at))
+    return catalogue
+
+
+def invalidate():
+    _publish(None, 0.0)
+
+
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_on_change(**kwargs):
+    invalidate()
+    # Also after commit: a catalogue read later in the same transaction is
+    # published on commit, and may not have seen every change.
+    transaction.on_commit(invalidate)
+
+
+def lock_services(services):
+    """
+    Returns the ids of `services` that still exist, locking their rows
+    against deletion (but not against other links) until the transaction
+    ends.
+    """
+    if not services:
+        return set()
+    table = connection.ops.quote_name(Service._meta.db_table)
+    pk_column = connection.ops.quote_name(Service._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {pk_column} FROM {table} WHERE {pk_column} = ANY(%s) "
+            "FOR KEY SHARE",
+            [[service.pk for service in services]],
+        )
+        return {pk for (pk,) in cursor.fetchall()}
+
+
+def resolve_services(services_data):
+    """
+    Returns the services named in `services_data`, creating the ones that do
+    not exist yet. Known names are resolved from the cache and checked with
+    one query; the missing services, including cached ones another worker
+    has deleted, are inserted with one query, skipping names another worker
+    has just created, and read back with one more.
+    """
+    by_name = {}
+    for service_data in services_data:
+        by_name.setdefault(service_data["service_name"], service_data)
+
+    catalogue = get_catalogue()
+    known = [catalogue[name] for name in by_name if name in catalogue]
+    existing = lock_services(known)
+    if len(existing) < len(known):
+        invalidate()
+        catalogue = {
+            name: service
+            for name, service in catalogue.items()
+            if name not in by_name or service.pk in existing
+        }
+    missing = [
+        Service(**service_data)
+        for name, service_data in by_name.items()
+        if name not in catalogue
+    ]
+    if missing:
+        # ignore_conflicts inserts without returning the new ids.
+        Service.objects.bulk_create(missing, ignore_conflicts=True)
+        created = Service.objects.filter(
+            service_name__in=[service.service_name for service in missing]
+        )
+        catalogue = {
+            **catalogue,
+            **{service.service_name: service for service in created},
+        }
+        transaction.on_commit(invalidate)
+    return [catalogue[name] for name in by_name]
@@ -3,6 +3,7 @@ from drf_yasg.utils import swagger_auto_schema
 from .Serializers import (
     HealthFacilitySerializer,
     HealthFacilityCreateSerializer,
+    HealthFacilityDocumentSerializer,
     HealthFacilityUpdateSerializer,
     LocationSerializer,
     ServicesSerializer,
@@ -14,7 +15,11 @@ from .Serializers import (
     AdvancedDataSerializer,
     FacilityImageBulkSerializer,
     FacilityImageSerializer,
+    FACILITY_RELATIONS,
 )
+from .models import HealthChoices
+from opendataproject import geo, leaderboard, search
+from opendataproject.batch import MAX_BATCH_SIZE
 
 
 # JSON field examples for Health Facility-related models
@@ -76,68 +81,111 @@ HEALTH_FACILITY_JSON_EXAMPLES = {
 }
 
 
+def facility_expansion_parameters(default_include):
+    return [
+        openapi.Parameter(
+            "include",
+            openapi.IN_QUERY,
+            description=(
+                "Comma-separated related records to embed in each facility, "
+                f"from: {', '.join(FACILITY_RELATIONS)} (default: {default_include})"
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "fields",
+            openapi.IN_QUERY,
+            description=(
+                "Comma-separated facility fields to return (default: all). "
+                "Included relations are always returned."
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+    ]
+
+
 get_facility_lists = swagger_auto_schema(
     operation_description="Retrieve a list of health facilities with summarized details.",
+    manual_parameters=facility_expansion_parameters("none"),
     responses={
         200: openapi.Response(
-            description="List of health facilities with limited details.",
+            description="Page of health facilities with limited details.",
             schema=openapi.Schema(
-                type=openapi.TYPE_ARRAY,
-                items=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        "facility_name": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Name of the health facility.",
-                        ),
-                        "facility_type": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Type of the health facility.",
-                        ),
-                        "level": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Level of the health facility.",
-                        ),
-                        "ownership": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Ownership type of the facility.",
-                        ),
-                        "average_rating": openapi.Schema(
-                            type=openapi.TYPE_NUMBER,
-                            format=openapi.FORMAT_FLOAT,
-                            description="Average rating based on user reviews.",
-                        ),
-                        "verified": openapi.Schema(
-                            type=openapi.TYPE_BOOLEAN,
-                            description="Indicates if the facility is verified.",
-                        ),
-                        "address": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Physical address of the facility.",
-                        ),
-                        "service_name": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Main service offered by the facility.",
-                        ),
-                        "phone": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="Primary contact phone number.",
-                        ),
-                        "whatsapp": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            description="WhatsApp contact number.",
-                        ),
-                        "review_count": openapi.Schema(
-                            type=openapi.TYPE_INTEGER,
-                            description="Number of users who have rated this facility.",
-                        ),
-                        "image_url": openapi.Schema(
-                            type=openapi.TYPE_STRING,
-                            format=openapi.FORMAT_URI,
-                            description="URL of the facility's main image.",
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "next": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        format=openapi.FORMAT_URI,
+                        x_nullable=True,
+                        description="Link to the next page, if any.",
+                    ),
+                    "previous": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        format=openapi.FORMAT_URI,
+                        x_nullable=True,
+                        description="Link to the previous page, if any.",
+                    ),
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                "facility_name": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Name of the health facility.",
+                                ),
+                                "facility_type": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Type of the health facility.",
+                                ),
+                                "level": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Level of the health facility.",
+                                ),
+                                "ownership": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Ownership type of the facility.",
+                                ),
+                                "average_rating": openapi.Schema(
+                                    type=openapi.TYPE_NUMBER,
+                                    format=openapi.FORMAT_FLOAT,
+                                    description="Average rating based on user reviews.",
+                                ),
+                                "verified": openapi.Schema(
+                                    type=openapi.TYPE_BOOLEAN,
+                                    description="Indicates if the facility is verified.",
+                                ),
+                                "address": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Physical address of the facility.",
+                                ),
+                                "service_name": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Main service offered by the facility.",
+                                ),
+                                "phone": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="Primary contact phone number.",
+                                ),
+                                "whatsapp": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="WhatsApp contact number.",
+                                ),
+                                "review_count": openapi.Schema(
+                                    type=openapi.TYPE_INTEGER,
+                                    description="Number of users who have rated this facility.",
+                                ),
+                                "image_url": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    format=openapi.FORMAT_URI,
+                                    description="URL of the facility's main image.",
+                                ),
+                            },
                         ),
-                    },
-                ),
+                    ),
+                },
             ),
         )
     },
@@ -146,6 +194,7 @@ get_facility_lists = swagger_auto_schema(
 
 get_facility_details = swagger_auto_schema(
     operation_description="Get details of a specific health facility",
+    manual_parameters=facility_expansion_parameters("all"),
     responses={
         200: HealthFacilitySerializer,
         404: openapi.Schema(
@@ -161,6 +210,217 @@ get_facility_details = swagger_auto_schema(
 )
 
 
+get_facilities_batch_docs = swagger_auto_schema(
+    operation_description="Get several health facilities by ID or facility code, "
+    "in request order. Facilities that do not exist are reported inline with an error.",
+    manual_parameters=[
+        openapi.Parameter(
+            "ids",
+            openapi.IN_QUERY,
+            description=f"Comma-separated IDs, at most {MAX_BATCH_SIZE}",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "codes",
+            openapi.IN_QUERY,
+            description="Comma-separated facility codes, at most "
+            f"{MAX_BATCH_SIZE}. Use instead of ids.",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+    ]
+    + facility_expansion_parameters("all"),
+    responses={
+        200: openapi.Response(
+            description="Health facilities in request order",
+            examples={
+                "application/json": {
+                    "results": [
+                        {"id": 3, "facility_name": "Kibagabaga Hospital"},
+                        {
+                            "facility_code": "RW00000000",
+                            "error": "Health facility not found",
+                        },
+                    ]
+                }
+            },
+        ),
+        400: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={"error": openapi.Schema(type=openapi.TYPE_OBJECT)},
+        ),
+    },
+)
+
+
+get_facilities_leaderboard_docs = swagger_auto_schema(
+    operation_description="Top rated health facilities, optionally within a "
+    "province, a district and/or a facility type. Facilities are ranked by a "
+    "Bayesian average that weighs their rating by their number of reviews, "
+    "precomputed by `manage.py refresh_leaderboards`.",
+    manual_parameters=[
+        openapi.Parameter(
+            "province",
+            openapi.IN_QUERY,
+            description="Only rank within this province code",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "district",
+            openapi.IN_QUERY,
+            description="Only rank within this district code",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "type",
+            openapi.IN_QUERY,
+            description="Only rank this type",
+            type=openapi.TYPE_STRING,
+            enum=HealthChoices.FacilityType.values,
+            required=False,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=f"Number of entries, at most {leaderboard.MAX_LIMIT} "
+            f"(default: {leaderboard.DEFAULT_LIMIT})",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Health facilities by rank",
+            examples={
+                "application/json": {
+                    "refreshed_at": "2025-03-16T02:00:00Z",
+                    "results": [
+                        {
+                            "rank": 1,
+                            "score": 4.612,
+                            "facility": {
+                                "id": 3,
+                                "facility_name": "Kibagabaga Hospital",
+                            },
+                        }
+                    ],
+                }
+            },
+        ),
+        400: "Invalid location code, type or limit",
+    },
+)
+
+
+search_facilities_docs = swagger_auto_schema(
+    operation_description="Search health facilities by name, offered services "
+    "and location names, most relevant first. Matches every word of the query "
+    "as a word prefix, ignoring case and accents, and names with small typos.",
+    manual_parameters=[
+        openapi.Parameter(
+            "q",
+            openapi.IN_QUERY,
+            description="Words or word prefixes to search for, at least "
+            f"{search.MIN_QUERY_LENGTH} letters or digits. Small typos in "
+            "names are tolerated.",
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=f"Number of results, at most {search.MAX_LIMIT} "
+            f"(default: {search.DEFAULT_LIMIT})",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Matching health facilities",
+            examples={
+                "application/json": {
+                    "results": [
+                        {
+                            "score": 0.608,
+                            "facility": {
+                                "id": 3,
+                                "facility_name": "Kibagabaga Hospital",
+                            },
+                        }
+                    ],
+                }
+            },
+        ),
+        400: "Missing or too short query, or invalid limit",
+    },
+)
+
+
+get_facilities_nearby_docs = swagger_auto_schema(
+    operation_description="Health facilities nearest to a point, with their distance in "
+    "km: those within `radius`, or the `limit` nearest when no radius is given. "
+    "Health facilities without coordinates are never returned.",
+    manual_parameters=[
+        openapi.Parameter(
+            "near",
+            openapi.IN_QUERY,
+            description="Point to search around, as latitude,longitude "
+            "(e.g. -1.9441,30.0619)",
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+        openapi.Parameter(
+            "radius",
+            openapi.IN_QUERY,
+            description="Only return results within this distance in km, at "
+            f"most {geo.MAX_RADIUS_KM}. Without it, the `limit` nearest are "
+            "returned.",
+            type=openapi.TYPE_NUMBER,
+            required=False,
+        ),
+        openapi.Parameter(
+            "type",
+            openapi.IN_QUERY,
+            description="Only return this type",
+            type=openapi.TYPE_STRING,
+            enum=HealthChoices.FacilityType.values,
+            required=False,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=f"Number of results, at most {geo.MAX_LIMIT} "
+            f"(default: {geo.DEFAULT_LIMIT})",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Health facilities, nearest first",
+            examples={
+                "application/json": {
+                    "results": [
+                        {
+                            "distance_km": 1.284,
+                            "facility": {
+                                "id": 3,
+                                "facility_name": "Kibagabaga Hospital",
+                            },
+                        }
+                    ],
+                }
+            },
+        ),
+        400: "Invalid point, radius, type or limit",
+    },
+)
+
+
 create_facility_services_docs = swagger_auto_schema(
     operation_description="Create services information for a health facility",
     request_body=openapi.Schema(
@@ -218,6 +478,45 @@ create_health_facility_docs = swagger_auto_schema(
     },
 )
 
+create_health_facility_document_docs = swagger_auto_schema(
+    operation_description="Create a health facility with its location, services, "
+    "resources, contact, population statistics, fees, government data and advanced "
+    "data in one request. Nothing is saved unless the whole document is valid.",
+    request_body=HealthFacilityDocumentSerializer,
+    responses={
+        201: HealthFacilitySerializer,
+        400: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "field_name": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                )
+            },
+        ),
+    },
+)
+
+replace_health_facility_document_docs = swagger_auto_schema(
+    operation_description="Replace a health facility and all of its sub-resources "
+    "with the given document. Sub-resources missing from the document are deleted; "
+    "images are kept.",
+    request_body=HealthFacilityDocumentSerializer,
+    responses={
+        200: HealthFacilitySerializer,
+        400: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "field_name": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                )
+            },
+        ),
+        404: "Health facility not found",
+    },
+)
+
 update_health_facility_docs = swagger_auto_schema(
     operation_description="Update a health facility",
     request_body=HealthFacilityUpdateSerializer,
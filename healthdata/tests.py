@@ -0,0 +1,710 @@
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import (
+    HealthFacility,
+    HealthFacilityLocation,
+    HealthFacilityServices,
+    ContactInformation,
+    Service,
+    FacilityImage,
+    FacilityFees,
+    HealthFacilityPopulation,
+    FACILITY_CODE_SEQUENCE,
+)
+from .facility_import import FacilityImporter
+from . import service_catalogue
+from opendataproject.bulk_import import read_csv, read_ndjson
+
+
+class HealthFacilityListQueryCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create facilities with a location, contact, services and images"""
+        cls.services = [
+            Service.objects.create(service_name=name)
+            for name in ["Dentistry", "Maternity", "Pharmacy"]
+        ]
+        for i in range(10):
+            facility = HealthFacility.objects.create(
+                facility_code=f"RW{10000000 + i}",
+                facility_name=f"Facility {i}",
+                facility_type="CLINIC",
+                ownership="PRIVATE",
+            )
+            HealthFacilityLocation.objects.create(
+                facility=facility,
+                address=f"Street {i}",
+                province="RW.KL",
+                district="RW.KL.NG",
+            )
+            ContactInformation.objects.create(
+                facility=facility, phone=f"+25070000000{i}"
+            )
+            facility_services = HealthFacilityServices.objects.create(
+                facility=facility, accreditation_status="ACCREDITED"
+            )
+            facility_services.offered_services.set(cls.services[1:])
+            for n in range(2):
+                FacilityImage.objects.create(
+                    facility=facility, image=f"facility_{i}_{n}.jpg"
+                )
+
+    def count_queries(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("facility-list"), {"page_size": page_size}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test the list is rendered in the same number of queries for any page size"""
+        _response, small_page_queries = self.count_queries(2)
+        response, large_page_queries = self.count_queries(10)
+        self.assertEqual(small_page_queries, large_page_queries)
+
+        first_facility = response.data["results"][0]
+        self.assertEqual(first_facility["address"], "Street 0")
+        self.assertEqual(first_facility["phone"], "+250700000000")
+        self.assertEqual(first_facility["service_name"], "Maternity")
+        self.assertTrue(first_facility["cover"].endswith("facility_0_0.jpg"))
+
+
+class FacilitySubResourceViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create a facility with fees and one year of population statistics"""
+        cls.facility = HealthFacility.objects.create(
+            facility_code="RW20000000",
+            facility_name="Facility",
+            facility_type="CLINIC",
+            ownership="PRIVATE",
+        )
+        cls.empty_facility = HealthFacility.objects.create(
+            facility_code="RW20000001",
+            facility_name="Empty facility",
+            facility_type="CLINIC",
+            ownership="PRIVATE",
+        )
+        FacilityFees.objects.create(facility=cls.facility, consultation_fee="5000.00")
+        cls.population = HealthFacilityPopulation.objects.create(
+            facility=cls.facility,
+            year=2024,
+            total_patients=100,
+            male_patients=40,
+            female_patients=60,
+            total_staff=10,
+            doctors=2,
+            nurses=5,
+            other_staff=3,
+        )
+
+    def test_existing_record_is_fetched_in_one_query(self):
+        """Test a sub-resource that exists is read with a single query"""
+        url = reverse("fees-detail", args=[self.facility.id])
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["consultation_fee"], "5000.00")
+
+    def test_missing_facility_and_missing_record_are_distinguished(self):
+        """Test the 404 message tells a missing facility from a missing record"""
+        response = self.client.get(reverse("fees-detail", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data, {"error": "Health facility not found"})
+
+        response = self.client.get(
+            reverse("fees-detail", args=[self.empty_facility.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            response.data, {"error": "Fee information not found for this facility"}
+        )
+
+    def test_population_record_is_updated_by_id(self):
+        """Test population statistics are updated through their own URL"""
+        url = reverse(
+            "population-item-detail", args=[self.facility.id, self.population.id]
+        )
+        response = self.client.put(url, {"total_patients": 120}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.population.refresh_from_db()
+        self.assertEqual(self.population.total_patients, 120)
+
+        url = reverse(
+            "population-item-detail", args=[self.empty_facility.id, self.population.id]
+        )
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(HealthFacilityPopulation.objects.exists())
+
+
+class FacilityIncludeTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create a facility with a location, fees and population statistics"""
+        cls.facility = HealthFacility.objects.create(
+            facility_code="RW30000000",
+            facility_name="Facility",
+            facility_type="CLINIC",
+            ownership="PRIVATE",
+        )
+        HealthFacilityLocation.objects.create(
+            facility=cls.facility,
+            address="Street",
+            province="RW.KL",
+            district="RW.KL.NG",
+        )
+        FacilityFees.objects.create(facility=cls.facility, consultation_fee="5000.00")
+        for year in (2023, 2024):
+            HealthFacilityPopulation.objects.create(
+                facility=cls.facility,
+                year=year,
+                total_patients=100,
+                male_patients=40,
+                female_patients=60,
+                total_staff=10,
+                doctors=2,
+                nurses=5,
+                other_staff=3,
+            )
+
+    def test_detail_returns_only_included_relations(self):
+        """Test the detail endpoint embeds and loads only the requested relations"""
+        url = reverse("facility-detail", args=[self.facility.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url,
+                {
+                    "include": "location,fees,population_stats",
+                    "fields": "facility_name",
+                },
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data),
+            {"facility_name", "location", "fees", "population_stats"},
+        )
+        self.assertEqual(response.data["location"]["address"], "Street")
+        self.assertEqual(response.data["fees"]["consultation_fee"], "5000.00")
+        self.assertEqual(len(response.data["population_stats"]), 2)
+        # The facility joined with its location and fees, then the statistics.
+        self.assertEqual(len(queries), 2)
+
+    def test_detail_includes_every_relation_by_default(self):
+        """Test the detail endpoint keeps returning all relations without include"""
+        response = self.client.get(reverse("facility-detail", args=[self.facility.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("images", response.data)
+        self.assertIsNone(response.data["government_data"])
+
+    def test_list_embeds_included_relations(self):
+        """Test list items embed included relations"""
+        response = self.client.get(
+            reverse("facility-list"), {"include": "fees", "fields": "id"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "id": self.facility.id,
+                    "fees": response.data["results"][0]["fees"],
+                }
+            ],
+        )
+        self.assertEqual(
+            response.data["results"][0]["fees"]["consultation_fee"], "5000.00"
+        )
+
+    def test_unknown_names_are_rejected(self):
+        """Test unknown relations and fields are rejected"""
+        url = reverse("facility-detail", args=[self.facility.id])
+        response = self.client.get(url, {"include": "owner", "fields": "colour"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data["error"]), {"include", "fields"})
+
+        response = self.client.get(reverse("facility-list"), {"include": "owner"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"error"})
+        self.assertEqual(set(response.data["error"]), {"include"})
+
+    def test_batch_returns_facilities_in_request_order(self):
+        """Test the batch endpoint keeps request order and reports missing codes"""
+        response = self.client.get(
+            reverse("facility-batch"),
+            {"codes": "RW00000000,RW30000000", "include": "fees"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        missing, facility = response.data["results"]
+        self.assertEqual(
+            missing,
+            {"facility_code": "RW00000000", "error": "Health facility not found"},
+        )
+        self.assertEqual(facility["fees"]["consultation_fee"], "5000.00")
+        self.assertNotIn("location", facility)
+
+
+class HealthFacilityDocumentTests(APITestCase):
+    def setUp(self):
+        Service.objects.create(service_name="Maternity")
+        self.document = {
+            "facility_name": "Gashora Health Centre",
+            "facility_type": "CLINIC",
+            "ownership": "PRIVATE",
+            "location": {
+                "address": "Main road",
+                "province": "RW.ES",
+                "district": "RW.ES.BG",
+                "sector": "RW.ES.BG.GS",
+                "cell": "RW.ES.BG.GS.BI",
+                "village": "RW.ES.BG.GS.BI.BI",
+            },
+            "services": {
+                "accreditation_status": "ACCREDITED",
+                "offered_services": [
+                    {"service_name": "Maternity"},
+                    {"service_name": "Dentistry"},
+                ],
+            },
+            "contact_info": {"phone": "+250700000000"},
+            "population_stats": [
+                {
+                    "year": year,
+                    "total_patients": 100,
+                    "male_patients": 40,
+                    "female_patients": 60,
+                    "total_staff": 10,
+                    "doctors": 2,
+                    "nurses": 5,
+                    "other_staff": 3,
+                }
+                for year in (2023, 2024)
+            ],
+            "fees": {"consultation_fee": "5000.00"},
+        }
+
+    def test_facility_is_created_with_its_sub_resources(self):
+        """Test a facility and all nested records are created in one request"""
+        response = self.client.post(
+            reverse("facility-document-create"), self.document, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["location"]["address"], "Main road")
+        self.assertEqual(len(response.data["population_stats"]), 2)
+        self.assertEqual(
+            sorted(
+                service["service_name"]
+                for service in response.data["services"]["offered_services"]
+            ),
+            ["Dentistry", "Maternity"],
+        )
+        self.assertEqual(Service.objects.count(), 2)
+        self.assertIsNone(response.data["government_data"])
+
+    def test_invalid_document_creates_nothing(self):
+        """Test an invalid nested record leaves no facility behind"""
+        self.document["population_stats"].append(self.document["population_stats"][0])
+        response = self.client.post(
+            reverse("facility-document-create"), self.document, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("population_stats", response.data)
+        self.assertFalse(HealthFacility.objects.exists())
+
+    def test_document_replaces_sub_resources(self):
+        """Test saving over a facility replaces its nested records"""
+        response = self.client.post(
+            reverse("facility-document-create"), self.document, format="json"
+        )
+        facility_id = response.data["id"]
+
+        self.document["population_stats"] = self.document["population_stats"][1:]
+        del self.document["fees"]
+        response = self.client.put(
+            reverse("facility-document-replace", args=[facility_id]),
+            self.document,
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["year"] for row in response.data["population_stats"]], [2024]
+        )
+        self.assertIsNone(response.data["fees"])
+        self.assertFalse(FacilityFees.objects.exists())
+
+
+class ServiceCatalogueTests(APITestCase):
+    def setUp(self):
+        service_catalogue.invalidate()
+        self.facility = HealthFacility.objects.create(
+            facility_code="RW30000001",
+            facility_name="Services Clinic",
+            facility_type="CLINIC",
+            ownership="PRIVATE",
+        )
+        Service.objects.create(service_name="Dentistry")
+
+    def post_services(self, names):
+        return self.client.post(
+            reverse("services-create", args=[self.facility.id]),
+            {
+                "offered_services": [{"service_name": name} for name in names],
+                "accreditation_status": "ACCREDITED",
+            },
+            format="json",
+        )
+
+    def test_services_are_resolved_in_bulk(self):
+        """Test the query count does not grow with the number of services"""
+        names = ["Dentistry"] + [f"Service {i}" for i in range(10)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_services(names)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertLess(len(queries), 12)
+        self.assertEqual(Service.objects.count(), 11)
+        self.assertEqual(
+            sorted(
+                self.facility.services.offered_services.values_list(
+                    "service_name", flat=True
+                )
+            ),
+            sorted(names),
+        )
+
+    def test_catalogue_is_cached_and_invalidated_on_change(self):
+        """Test committed lookups are cached until a service changes"""
+        with self.captureOnCommitCallbacks(execute=True):
+            service_catalogue.get_catalogue()
+        # Only the check that the cached services still exist.
+        with self.assertNumQueries(1):
+            [service] = service_catalogue.resolve_services(
+                [{"service_name": "Dentistry"}]
+            )
+        self.assertEqual(service.service_name, "Dentistry")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(service_name="Maternity")
+        with self.assertNumQueries(2):
+            service_catalogue.resolve_services([{"service_name": "Maternity"}])
+
+    def test_services_deleted_elsewhere_are_not_linked(self):
+        """Test a cached service deleted by another worker is created again"""
+        with self.captureOnCommitCallbacks(execute=True):
+            service_catalogue.get_catalogue()
+        # A delete in another process sends no signal to this one.
+        Service.objects.filter(service_name="Dentistry")._raw_delete(Service.objects.db)
+        response = self.post_services(["Dentistry"])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(
+                self.facility.services.offered_services.values_list(
+                    "service_name", flat=True
+                )
+            ),
+            ["Dentistry"],
+        )
+
+
+class FacilitySearchTests(APITestCase):
+    def setUp(self):
+        service_catalogue.invalidate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.facility = HealthFacility.objects.create(
+                facility_code="RW30000002",
+                facility_name="Kibagabaga Hospital",
+                facility_type="HOSPITAL",
+                ownership="PUBLIC",
+            )
+
+    def search(self, query):
+        response = self.client.get(reverse("facility-search"), {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [entry["facility"]["id"] for entry in response.data["results"]]
+
+    def test_offered_services_are_searchable(self):
+        """Test facilities are found by the services they offer"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("services-create", args=[self.facility.id]),
+                {
+                    "offered_services": [{"service_name": "Maternity"}],
+                    "accreditation_status": "ACCREDITED",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.search("matern"), [self.facility.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.filter(service_name="Maternity").get().delete()
+        self.assertEqual(self.search("matern"), [])
+        self.assertEqual(self.search("kibagabaga"), [self.facility.id])
+
+
+class FacilityNearbyTests(APITestCase):
+    def test_closest_health_center(self):
+        """Test the nearest facility of a type, skipping deleted facilities"""
+        facilities = {}
+        for code, (name, facility_type, latitude, is_deleted) in enumerate(
+            [
+                ("Clinic", "CLINIC", -1.95, False),
+                ("Closed center", "HEALTH_CENTER", -1.95, True),
+                ("Center", "HEALTH_CENTER", -1.97, False),
+                ("Far center", "HEALTH_CENTER", -2.1, False),
+            ],
+            start=30000010,
+        ):
+            facility = HealthFacility.objects.create(
+                facility_code=f"RW{code}",
+                facility_name=name,
+                facility_type=facility_type,
+                ownership="PUBLIC",
+                is_deleted=is_deleted,
+            )
+            HealthFacilityLocation.objects.create(
+                facility=facility,
+                address="KN 3 Rd",
+                province="RW.KL",
+                district="RW.KL.NY",
+                latitude=latitude,
+                longitude=30.06,
+            )
+            facilities[name] = facility
+
+        response = self.client.get(
+            reverse("facility-nearby"),
+            {"near": "-1.94,30.06", "type": "health_center", "limit": 1},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [entry] = response.data["results"]
+        self.assertEqual(entry["facility"]["id"], facilities["Center"].id)
+        self.assertAlmostEqual(entry["distance_km"], 3.336, places=2)
+
+
+class FacilityCodeAllocationTests(APITestCase):
+    def test_codes_are_allocated_in_bulk_without_collisions(self):
+        """Test codes come from the sequence in one query, all distinct"""
+        with CaptureQueriesContext(connection) as queries:
+            codes = HealthFacility.allocate_facility_codes(100)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(set(codes)), 100)
+        self.assertTrue(all(code.startswith("RW0") for code in codes))
+
+    def test_save_generates_a_code(self):
+        """Test facilities saved without a code get distinct valid codes"""
+        facilities = [
+            HealthFacility.objects.create(
+                facility_name=f"Facility {i}",
+                facility_type="CLINIC",
+                ownership="PRIVATE",
+            )
+            for i in range(2)
+        ]
+        self.assertNotEqual(facilities[0].facility_code, facilities[1].facility_code)
+        for facility in facilities:
+            facility.full_clean()
+
+    def test_explicit_codes_are_not_allocated_again(self):
+        """Test codes in the sequence's range that are set explicitly are skipped"""
+        code = HealthFacility.allocate_facility_codes(1)[0]
+        explicit = f"RW{int(code[2:]) + 1:08d}"
+        HealthFacility.objects.create(
+            facility_code=explicit,
+            facility_name="Original Hospital",
+            facility_type="HOSPITAL",
+            ownership="GOVERNMENT",
+        )
+        facility = HealthFacility.objects.create(
+            facility_name="New Hospital",
+            facility_type="HOSPITAL",
+            ownership="GOVERNMENT",
+        )
+        self.assertGreater(facility.facility_code, explicit)
+
+    def test_explicit_code_is_reserved_on_an_unused_sequence(self):
+        """Test an explicit code equal to the next unused value is skipped"""
+        value = int(HealthFacility.allocate_facility_codes(1)[0][2:]) + 10
+        with connection.cursor() as cursor:
+            # As left by migration 0007: nextval returns `value` next.
+            cursor.execute(
+                "SELECT setval(%s, %s, false)", [FACILITY_CODE_SEQUENCE, value]
+            )
+        HealthFacility.objects.create(
+            facility_code=f"RW{value:08d}",
+            facility_name="Original Hospital",
+            facility_type="HOSPITAL",
+            ownership="GOVERNMENT",
+        )
+        facility = HealthFacility.objects.create(
+            facility_name="New Hospital",
+            facility_type="HOSPITAL",
+            ownership="GOVERNMENT",
+        )
+        self.assertEqual(facility.facility_code, f"RW{value + 1:08d}")
+
+
+FACILITY_HEADER = (
+    "facility_code,facility_name,facility_type,ownership,address,province,"
+    "district,sector,cell,village,phone,accreditation_status,offered_services\n"
+)
+FACILITY_LOCATION = "RW.ES,RW.ES.BG,RW.ES.BG.GS,RW.ES.BG.GS.BI,RW.ES.BG.GS.BI.BI"
+
+
+class FacilityImporterTests(APITestCase):
+    def import_csv(self, text, **kwargs):
+        return FacilityImporter(**kwargs).run(read_csv(io.StringIO(text)))
+
+    def test_rows_are_imported_with_related_records(self):
+        """Test facilities are created with their location, contact and services"""
+        Service.objects.create(service_name="Dentistry")
+        report = self.import_csv(
+            FACILITY_HEADER
+            + f"RW20000001,Gashora Clinic,clinic,Private,Main Road,{FACILITY_LOCATION},"
+            + "+250700000001,Accredited,Dentistry;Maternity\n"
+            + "RW20000002,Kigali Post,HEALTH_POST,NGO,,,,,,,,,\n"
+        )
+        self.assertEqual((report.created, report.updated, report.errors), (2, 0, []))
+
+        facility = HealthFacility.objects.get(facility_code="RW20000001")
+        self.assertEqual(facility.facility_type, "CLINIC")
+        self.assertEqual(facility.location.village, "RW.ES.BG.GS.BI.BI")
+        self.assertEqual(facility.contact_info.phone, "+250700000001")
+        self.assertEqual(
+            sorted(
+                facility.services.offered_services.values_list(
+                    "service_name", flat=True
+                )
+            ),
+            ["Dentistry", "Maternity"],
+        )
+        self.assertEqual(Service.objects.count(), 2)
+        self.assertFalse(
+            HealthFacilityServices.objects.filter(
+                facility__facility_code="RW20000002"
+            ).exists()
+        )
+
+    def test_imported_codes_are_not_allocated_again(self):
+        """Test a facility without a code never takes an imported code"""
+        code = HealthFacility.allocate_facility_codes(1)[0]
+        explicit = f"RW{int(code[2:]) + 1:08d}"
+        self.import_csv(
+            FACILITY_HEADER
+            + f"{explicit},Original Hospital,HOSPITAL,GOVERNMENT,,,,,,,,,\n"
+        )
+        report = self.import_csv(
+            FACILITY_HEADER + ",New Hospital,HOSPITAL,GOVERNMENT,,,,,,,,,\n"
+        )
+        self.assertEqual((report.created, report.updated, report.errors), (1, 0, []))
+        self.assertEqual(
+            HealthFacility.objects.get(facility_code=explicit).facility_name,
+            "Original Hospital",
+        )
+        self.assertEqual(HealthFacility.objects.count(), 2)
+
+    def test_invalid_rows_are_reported_without_aborting(self):
+        """Test invalid rows are skipped and reported with their line number"""
+        report = self.import_csv(
+            FACILITY_HEADER
+            + "RW20000001,Good Clinic,CLINIC,PRIVATE,,,,,,,,,\n"
+            + "XX1,Bad Clinic,CLINIC,PRIVATE,Road,RW.ES,RW.KL.NG,,,,,,\n"
+            + "RW20000003,No Accreditation,CLINIC,PRIVATE,,,,,,,,,Dentistry\n"
+        )
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _message in report.errors], [3, 4])
+        self.assertIn("facility_code", report.errors[0][1])
+        self.assertIn("Invalid district code", report.errors[0][1])
+        self.assertIn("accreditation_status", report.errors[1][1])
+
+    def test_records_without_a_code_get_allocated_codes(self):
+        """Test facilities without a code are created with allocated codes"""
+        report = self.import_csv(
+            FACILITY_HEADER
+            + ",New Clinic,CLINIC,PRIVATE,,,,,,,,,\n"
+            + ",Other Clinic,CLINIC,PRIVATE,,,,,,,,,\n"
+        )
+        self.assertEqual((report.created, report.errors), (2, []))
+        codes = HealthFacility.objects.values_list("facility_code", flat=True)
+        self.assertEqual(len(set(codes)), 2)
+
+    def test_dry_run_allocates_no_codes(self):
+        """Test a dry run counts new facilities without using up codes"""
+        before = HealthFacility.allocate_facility_codes(1)[0]
+        report = self.import_csv(
+            FACILITY_HEADER
+            + ",New Clinic,CLINIC,PRIVATE,,,,,,,,,\n"
+            + ",Other Clinic,CLINIC,PRIVATE,,,,,,,,,\n",
+            dry_run=True,
+        )
+        self.assertEqual((report.created, report.errors), (2, []))
+        self.assertFalse(HealthFacility.objects.exists())
+        after = HealthFacility.allocate_facility_codes(1)[0]
+        self.assertEqual(int(after[2:]), int(before[2:]) + 1)
+
+    def test_reimport_is_idempotent(self):
+        """Test importing a file twice updates the facilities in place"""
+        lines = [
+            json.dumps(
+                {
+                    "facility_code": "RW20000001",
+                    "facility_name": name,
+                    "facility_type": "CLINIC",
+                    "ownership": "PRIVATE",
+                    "population_stats": [
+                        {
+                            "year": 2023,
+                            "total_patients": 10,
+                            "male_patients": 4,
+                            "female_patients": 6,
+                            "total_staff": 3,
+                            "doctors": 1,
+                            "nurses": 1,
+                            "other_staff": 1,
+                        }
+                    ],
+                }
+            )
+            for name in ("Old Name", "New Name")
+        ]
+        FacilityImporter().run(read_ndjson(io.StringIO(lines[0])))
+        report = FacilityImporter().run(read_ndjson(io.StringIO(lines[1])))
+
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual(HealthFacility.objects.get().facility_name, "New Name")
+        self.assertEqual(HealthFacilityPopulation.objects.count(), 1)
+
+    def test_command_resumes_from_checkpoint(self):
+        """Test an import with a checkpoint skips the lines already imported"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "facilities.csv")
+            checkpoint = os.path.join(directory, "checkpoint.json")
+            with open(path, "w") as input_file:
+                input_file.write(
+                    FACILITY_HEADER
+                    + "RW20000001,First,CLINIC,PRIVATE,,,,,,,,,\n"
+                    + "RW20000002,Second,CLINIC,PRIVATE,,,,,,,,,\n"
+                )
+            with open(checkpoint, "w") as checkpoint_file:
+                json.dump({"source": os.path.abspath(path), "line": 2}, checkpoint_file)
+
+            stdout = io.StringIO()
+            call_command(
+                "import_facilities", path, "--checkpoint", checkpoint, stdout=stdout
+            )
+            self.assertFalse(os.path.exists(checkpoint))
+
+        self.assertIn("Resuming after line 2", stdout.getvalue())
+        self.assertEqual(
+            list(HealthFacility.objects.values_list("facility_code", flat=True)),
+            ["RW20000002"],
+        )
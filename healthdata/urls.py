@@ -2,7 +2,13 @@ from django.urls import path
 from .views import (
     HealthFacilityListView,
     HealthFacilityDetailView,
+    HealthFacilityBatchView,
+    HealthFacilityLeaderboardView,
+    HealthFacilitySearchView,
+    HealthFacilityNearbyView,
     HealthFacilityCreateView,
+    HealthFacilityDocumentCreateView,
+    HealthFacilityDocumentReplaceView,
     LocationCreateView,
     LocationDetailView,
     ServicesCreateView,
@@ -25,7 +31,33 @@ from .views import (
 
 urlpatterns = [
     path("facilities/", HealthFacilityCreateView.as_view(), name="facility-create"),
+    path(
+        "facilities/full/",
+        HealthFacilityDocumentCreateView.as_view(),
+        name="facility-document-create",
+    ),
+    path(
+        "facilities/<int:facility_id>/full/",
+        HealthFacilityDocumentReplaceView.as_view(),
+        name="facility-document-replace",
+    ),
     path("facilities/list/", HealthFacilityListView.as_view(), name="facility-list"),
+    path("facilities/batch/", HealthFacilityBatchView.as_view(), name="facility-batch"),
+    path(
+        "facilities/leaderboard/",
+        HealthFacilityLeaderboardView.as_view(),
+        name="facility-leaderboard",
+    ),
+    path(
+        "facilities/search/",
+        HealthFacilitySearchView.as_view(),
+        name="facility-search",
+    ),
+    path(
+        "facilities/nearby/",
+        HealthFacilityNearbyView.as_view(),
+        name="facility-nearby",
+    ),
     path(
         "facilities/<int:facility_id>/",
         HealthFacilityDetailView.as_view(),
@@ -84,6 +116,11 @@ urlpatterns = [
         HealthFacilityPopulationDetailView.as_view(),
         name="population-detail",
     ),
+    path(
+        "facilities/<int:facility_id>/population/<int:population_id>/",
+        HealthFacilityPopulationDetailView.as_view(),
+        name="population-item-detail",
+    ),
     # Facility Fees URLs
     path(
         "facilities/<int:facility_id>/create-fees/",
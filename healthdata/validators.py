@@ -99,3 +99,31 @@ def validate_laboratories(labs):
             continue
         if not isinstance(value, bool):
             raise ValidationError(f"Field '{field}' must be a boolean")
+
+
+def validate_facility_expansion(
+    include=None, fields=None, include_choices=(), field_choices=()
+):
+    """
+    Validates the relations and fields requested from a facility endpoint.
+    """
+    errors = {}
+
+    invalid = [name for name in include or () if name not in include_choices]
+    if invalid:
+        errors["include"] = (
+            f"Invalid include: {', '.join(invalid)}. "
+            f"Valid choices are: {list(include_choices)}"
+        )
+
+    invalid = [name for name in fields or () if name not in field_choices]
+    if invalid:
+        errors["fields"] = (
+            f"Invalid fields: {', '.join(invalid)}. "
+            f"Valid choices are: {list(field_choices)}"
+        )
+
+    if errors:
+        raise ValidationError(errors)
+
+    return True
@@ -1,6 +1,7 @@
 from rest_framework import serializers, status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
 from django.db import transaction
@@ -20,6 +21,7 @@ from .Serializers import (
     HealthFacilitySerializer,
     HealthFacilityListSerializer,
     HealthFacilityCreateSerializer,
+    HealthFacilityDocumentSerializer,
     HealthFacilityUpdateSerializer,
     LocationSerializer,
     ServicesSerializer,
@@ -32,55 +34,167 @@ from .Serializers import (
     FacilityImageBulkSerializer,
     FacilityImageSerializer,
 )
-from .swagger_docs import (
-    get_facility_lists,
-    get_facility_details,
-    create_facility_services_docs,
-    get_facility_services_details_docs,
-    get_facility_resources_details_docs,
-    get_facility_advanceddata_details_docs,
-    get_facility_contactinfo_details_docs,
-    get_facility_fees_details_docs,
-    get_facility_governmentdata_details_docs,
-    get_facility_images_details_docs,
-    get_facility_location_details_docs,
-    get_facility_population_details_docs,
-    create_facility_governmentdata_docs,
-    create_facility_advanceddata_docs,
-    create_facility_contactinfo_docs,
-    create_facility_fees_docs,
-    create_facility_population_docs,
-    create_facility_resources_docs,
-    create_facility_location_docs,
-    create_health_facility_docs,
-    create_facility_images_docs,
-    update_facility_advanceddata_docs,
-    update_facility_contactinfo_docs,
-    update_facility_fees_docs,
-    update_facility_governmentdata_docs,
-    update_facility_images_docs,
-    update_facility_location_docs,
-    update_facility_population_docs,
-    update_facility_resources_docs,
-    update_facility_services_docs,
-    update_health_facility_docs,
-    delete_health_facility_docs,
-    delete_facility_advanceddata_docs,
-    delete_facility_contactinfo_docs,
-    delete_facility_location_docs,
-    delete_facility_population_docs,
-    delete_facility_advanceddata_docs,
-    delete_facility_services_docs,
-    delete_facility_resources_docs,
-    delete_facility_fees_docs,
-    delete_facility_governmentdata_docs,
-)
+from opendataproject.api_docs import lazy_docs
+from opendataproject.batch import BatchRetrieveView
+from opendataproject.geo import NearbyView
+from opendataproject.leaderboard import LeaderboardView
+from opendataproject.search import SearchView
+
+docs = lazy_docs("healthdata.swagger_docs")
+
+
+class FacilitySubResourceView(APIView):
+    """
+    Base view for a record attached to a health facility (location, fees,
+    images, ...), addressed by the facility id and, for records a facility can
+    have several of, the record's own id.
+
+    The record is fetched with a single query filtered on `facility_id`. Only
+    when it is missing does a second query check whether the facility exists,
+    so both cases keep their own 404 message.
+    """
+
+    model = None
+    serializer_class = None
+    not_found_message = None
+
+    def get_object(self, facility_id, pk=None):
+        filters = {"facility_id": facility_id}
+        if pk is not None:
+            filters["pk"] = pk
+        try:
+            return self.model.objects.get(**filters)
+        except self.model.DoesNotExist:
+            if HealthFacility.objects.filter(id=facility_id).exists():
+                raise NotFound(self.not_found_message)
+            raise NotFound("Health facility not found")
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotFound):
+            return Response({"error": exc.detail}, status=status.HTTP_404_NOT_FOUND)
+        return super().handle_exception(exc)
+
+    def retrieve(self, request, facility_id, pk=None):
+        instance = self.get_object(facility_id, pk)
+        serializer = self.serializer_class(instance)
+        return Response(serializer.data)
+
+    def update(self, request, facility_id, pk=None):
+        instance = self.get_object(facility_id, pk)
+        serializer = self.serializer_class(instance, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    def destroy(self, request, facility_id, pk=None):
+        instance = self.get_object(facility_id, pk)
+        instance.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class HealthFacilityBatchView(BatchRetrieveView):
+    """
+    API endpoint for retrieving several health facilities at once, by id or
+    by facility code, in request order. Accepts the same `include` and
+    `fields` parameters as the detail endpoint.
+    """
+
+    lookup_params = {"ids": "id", "codes": "facility_code"}
+    serializer_class = HealthFacilitySerializer
+    not_found_message = "Health facility not found"
+
+    def get_queryset(self):
+        return HealthFacilitySerializer.setup_eager_loading(
+            HealthFacility.objects.all(), self.expansion.get("include")
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.expansion)
+        return super().get_serializer(*args, **kwargs)
+
+    @docs.get_facilities_batch_docs
+    def get(self, request):
+        """Get several health facilities by ID or facility code"""
+        try:
+            self.expansion = HealthFacilitySerializer.get_expansion(
+                request.query_params
+            )
+        except serializers.ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return self.batch_retrieve(request)
+
+
+class HealthFacilityLeaderboardView(LeaderboardView):
+    """
+    API endpoint for the top rated health facilities, optionally by province,
+    district and facility type.
+    """
+
+    model = HealthFacility
+    serializer_class = HealthFacilityListSerializer
+    object_name = "facility"
+    kind_field = "facility_type"
+
+    def get_queryset(self):
+        return HealthFacilityListSerializer.setup_eager_loading(
+            HealthFacility.objects.all()
+        )
+
+    @docs.get_facilities_leaderboard_docs
+    def get(self, request):
+        """Get the top rated health facilities"""
+        return self.leaderboard(request)
+
+
+class HealthFacilitySearchView(SearchView):
+    """
+    API endpoint for searching health facilities by name, offered services
+    and location.
+    """
+
+    model = HealthFacility
+    serializer_class = HealthFacilityListSerializer
+    object_name = "facility"
+
+    def get_queryset(self):
+        return HealthFacilityListSerializer.setup_eager_loading(
+            HealthFacility.objects.all()
+        )
+
+    @docs.search_facilities_docs
+    def get(self, request):
+        """Search health facilities"""
+        return self.search(request)
+
+
+class HealthFacilityNearbyView(NearbyView):
+    """
+    API endpoint for the health facilities nearest to a point, optionally by
+    type and within a radius.
+    """
+
+    model = HealthFacility
+    serializer_class = HealthFacilityListSerializer
+    object_name = "facility"
+    kind_field = "facility_type"
+    location_model = HealthFacilityLocation
+    owner_field = "facility"
+
+    def get_queryset(self):
+        return HealthFacilityListSerializer.setup_eager_loading(
+            HealthFacility.objects.all()
+        )
+
+    @docs.get_facilities_nearby_docs
+    def get(self, request):
+        """Get the health facilities nearest to a point"""
+        return self.nearby(request)
 
 
 class HealthFacilityCreateView(APIView):
     """API view for creating health facilities"""
 
-    @create_health_facility_docs
+    @docs.create_health_facility_docs
     def post(self, request, *args, **kwargs):
         """Create a new health facility"""
         serializer = HealthFacilityCreateSerializer(
@@ -95,43 +209,95 @@ class HealthFacilityCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
+class HealthFacilityDocumentView(APIView):
+    """
+    Base view for writing a health facility together with all of its
+    sub-resources in one request.
+    """
+
+    def save_document(self, request, facility=None):
+        serializer = HealthFacilityDocumentSerializer(
+            facility, data=request.data, context={"request": request}
+        )
+        try:
+            serializer.is_valid(raise_exception=True)
+        except serializers.ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        saved = serializer.save()
+
+        saved = HealthFacilitySerializer.setup_eager_loading(
+            HealthFacility.objects.all()
+        ).get(id=saved.id)
+        return Response(
+            HealthFacilitySerializer(saved).data,
+            status=status.HTTP_200_OK if facility else status.HTTP_201_CREATED,
+        )
+
+
+class HealthFacilityDocumentCreateView(HealthFacilityDocumentView):
+    @docs.create_health_facility_document_docs
+    def post(self, request):
+        """Create a health facility with all of its sub-resources"""
+        return self.save_document(request)
+
+
+class HealthFacilityDocumentReplaceView(HealthFacilityDocumentView):
+    @docs.replace_health_facility_document_docs
+    def put(self, request, facility_id):
+        """Replace a health facility and all of its sub-resources"""
+        try:
+            facility = HealthFacility.objects.get(id=facility_id)
+        except HealthFacility.DoesNotExist:
+            return Response(
+                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return self.save_document(request, facility)
+
+
 class HealthFacilityListView(generics.ListAPIView):
     """API view for listing health facilities"""
 
-    queryset = HealthFacility.objects.prefetch_related(
-        "location", "contact_info", "services", "images"
-    )
     serializer_class = HealthFacilityListSerializer
 
-    @get_facility_lists
+    expansion = {}
+
+    def get_queryset(self):
+        return HealthFacilityListSerializer.setup_eager_loading(
+            HealthFacility.objects.all(), self.expansion.get("include", ())
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.expansion)
+        return super().get_serializer(*args, **kwargs)
+
+    @docs.get_facility_lists
     def get(self, request, *args, **kwargs):
         """List all health facilities with summarized details"""
+        try:
+            self.expansion = HealthFacilityListSerializer.get_expansion(
+                request.query_params
+            )
+        except serializers.ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         return super().get(request, *args, **kwargs)
 
 
 class HealthFacilityDetailView(APIView):
-    @get_facility_details
+    @docs.get_facility_details
     def get(self, request, facility_id):
         """Get a specific health facility by ID"""
         try:
-            # Use select_related and prefetch_related to optimize queries
-            facility = (
-                HealthFacility.objects.select_related(
-                    "location",
-                    "services",
-                    "resources",
-                    "contact_info",
-                    "fees",
-                    "government_data",
-                    "advanced_data",
-                )
-                .prefetch_related(
-                    "population_stats", "images", "services__offered_services"
-                )
-                .get(id=facility_id)
-            )
+            expansion = HealthFacilitySerializer.get_expansion(request.query_params)
+        except serializers.ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Load only the relations that will be serialized
+            facility = HealthFacilitySerializer.setup_eager_loading(
+                HealthFacility.objects.all(), expansion.get("include")
+            ).get(id=facility_id)
 
-            serializer = HealthFacilitySerializer(facility)
+            serializer = HealthFacilitySerializer(facility, **expansion)
             return Response(serializer.data)
         except HealthFacility.DoesNotExist:
             return Response(
@@ -139,7 +305,7 @@ class HealthFacilityDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-    @update_health_facility_docs
+    @docs.update_health_facility_docs
     def put(self, request, facility_id):
         """Update a health facility"""
         try:
@@ -154,7 +320,7 @@ class HealthFacilityDetailView(APIView):
         except serializers.ValidationError as e:
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
-    @delete_health_facility_docs
+    @docs.delete_health_facility_docs
     def delete(self, request, facility_id):
         """Delete a health facility"""
         facility = get_object_or_404(HealthFacility, id=facility_id)
@@ -163,7 +329,7 @@ class HealthFacilityDetailView(APIView):
 
 
 class LocationCreateView(APIView):
-    @create_facility_location_docs
+    @docs.create_facility_location_docs
     def post(self, request, facility_id):
         """Create location details for a specific health facility"""
         try:
@@ -180,68 +346,29 @@ class LocationCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LocationDetailView(APIView):
-    @get_facility_location_details_docs
+class LocationDetailView(FacilitySubResourceView):
+    model = HealthFacilityLocation
+    serializer_class = LocationSerializer
+    not_found_message = "Location not found for this facility"
+
+    @docs.get_facility_location_details_docs
     def get(self, request, facility_id):
         """Get location details for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            location = HealthFacilityLocation.objects.get(facility=facility)
-            serializer = LocationSerializer(location)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityLocation.DoesNotExist:
-            return Response(
-                {"error": "Location not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_location_docs
+    @docs.update_facility_location_docs
     def put(self, request, facility_id):
         """Update location details for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            location = HealthFacilityLocation.objects.get(facility=facility)
-            serializer = LocationSerializer(location, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityLocation.DoesNotExist:
-            return Response(
-                {"error": "Location not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_location_docs
+    @docs.delete_facility_location_docs
     def delete(self, request, facility_id):
         """Delete location details for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            location = HealthFacilityLocation.objects.get(facility=facility)
-            location.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityLocation.DoesNotExist:
-            return Response(
-                {"error": "Location not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class ServicesCreateView(APIView):
-    @create_facility_services_docs
+    @docs.create_facility_services_docs
     def post(self, request, facility_id):
         """Create services information for a specific health facility"""
         try:
@@ -258,68 +385,29 @@ class ServicesCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class HealthFacilityServicesDetailView(APIView):
-    @get_facility_services_details_docs
+class HealthFacilityServicesDetailView(FacilitySubResourceView):
+    model = HealthFacilityServices
+    serializer_class = ServicesSerializer
+    not_found_message = "Services information not found for this facility"
+
+    @docs.get_facility_services_details_docs
     def get(self, request, facility_id):
         """Get services information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            services = HealthFacilityServices.objects.get(facility=facility)
-            serializer = ServicesSerializer(services)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityServices.DoesNotExist:
-            return Response(
-                {"error": "Services information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_services_docs
+    @docs.update_facility_services_docs
     def put(self, request, facility_id):
         """Update services information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            services = HealthFacilityServices.objects.get(facility=facility)
-            serializer = ServicesSerializer(services, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityServices.DoesNotExist:
-            return Response(
-                {"error": "Services information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_services_docs
+    @docs.delete_facility_services_docs
     def delete(self, request, facility_id):
         """Delete services information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            services = HealthFacilityServices.objects.get(facility=facility)
-            services.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityServices.DoesNotExist:
-            return Response(
-                {"error": "Services information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class FacilityResourcesCreateView(APIView):
-    @create_facility_resources_docs
+    @docs.create_facility_resources_docs
     def post(self, request, facility_id):
         """Create resources information for a specific health facility"""
         try:
@@ -345,68 +433,29 @@ class FacilityResourcesCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class FacilityResourcesDetailView(APIView):
-    @get_facility_resources_details_docs
+class FacilityResourcesDetailView(FacilitySubResourceView):
+    model = FacilityResources
+    serializer_class = ResourcesSerializer
+    not_found_message = "Resources not found for this facility"
+
+    @docs.get_facility_resources_details_docs
     def get(self, request, facility_id):
         """Get resources details for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            resources = FacilityResources.objects.get(facility=facility)
-            serializer = ResourcesSerializer(resources)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityResources.DoesNotExist:
-            return Response(
-                {"error": "Resources not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_resources_docs
+    @docs.update_facility_resources_docs
     def put(self, request, facility_id):
         """Update resources information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            resources = FacilityResources.objects.get(facility=facility)
-            serializer = ResourcesSerializer(resources, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityResources.DoesNotExist:
-            return Response(
-                {"error": "Resources not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_resources_docs
+    @docs.delete_facility_resources_docs
     def delete(self, request, facility_id):
         """Delete resources information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            resources = FacilityResources.objects.get(facility=facility)
-            resources.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityResources.DoesNotExist:
-            return Response(
-                {"error": "Resources not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class ContactInformationCreateView(APIView):
-    @create_facility_contactinfo_docs
+    @docs.create_facility_contactinfo_docs
     def post(self, request, facility_id):
         """Create contact information for a specific health facility"""
         try:
@@ -423,70 +472,29 @@ class ContactInformationCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ContactInformationDetailView(APIView):
-    @get_facility_contactinfo_details_docs
+class ContactInformationDetailView(FacilitySubResourceView):
+    model = ContactInformation
+    serializer_class = ContactSerializer
+    not_found_message = "Contact information not found for this facility"
+
+    @docs.get_facility_contactinfo_details_docs
     def get(self, request, facility_id):
         """Get contact information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            contact_info = ContactInformation.objects.get(facility=facility)
-            serializer = ContactSerializer(contact_info)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except ContactInformation.DoesNotExist:
-            return Response(
-                {"error": "Contact information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_contactinfo_docs
+    @docs.update_facility_contactinfo_docs
     def put(self, request, facility_id):
         """Update contact information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            contact_info = ContactInformation.objects.get(facility=facility)
-            serializer = ContactSerializer(
-                contact_info, data=request.data, partial=True
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except ContactInformation.DoesNotExist:
-            return Response(
-                {"error": "Contact information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_contactinfo_docs
+    @docs.delete_facility_contactinfo_docs
     def delete(self, request, facility_id):
         """Delete contact information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            contact_info = ContactInformation.objects.get(facility=facility)
-            contact_info.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except ContactInformation.DoesNotExist:
-            return Response(
-                {"error": "Contact information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class HealthFacilityPopulationCreateView(APIView):
-    @create_facility_population_docs
+    @docs.create_facility_population_docs
     def post(self, request, facility_id):
         """Create population statistics for a specific health facility"""
         try:
@@ -503,74 +511,29 @@ class HealthFacilityPopulationCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class HealthFacilityPopulationDetailView(APIView):
-    @get_facility_population_details_docs
-    def get(self, request, facility_id):
+class HealthFacilityPopulationDetailView(FacilitySubResourceView):
+    model = HealthFacilityPopulation
+    serializer_class = PopulationStatsSerializer
+    not_found_message = "Population statistics not found for this facility"
+
+    @docs.get_facility_population_details_docs
+    def get(self, request, facility_id, population_id=None):
         """Get population statistics for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            population = HealthFacilityPopulation.objects.get(facility=facility)
-            serializer = PopulationStatsSerializer(population)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityPopulation.DoesNotExist:
-            return Response(
-                {"error": "Population statistics not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id, population_id)
 
-    @update_facility_population_docs
+    @docs.update_facility_population_docs
     def put(self, request, facility_id, population_id):
         """Update population statistics for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            population = HealthFacilityPopulation.objects.get(
-                id=population_id, facility=facility
-            )
-            serializer = PopulationStatsSerializer(
-                population, data=request.data, partial=True
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityPopulation.DoesNotExist:
-            return Response(
-                {"error": "Population statistics not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id, population_id)
 
-    @delete_facility_population_docs
+    @docs.delete_facility_population_docs
     def delete(self, request, facility_id, population_id):
         """Delete population statistics for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            population = HealthFacilityPopulation.objects.get(
-                id=population_id, facility=facility
-            )
-            population.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except HealthFacilityPopulation.DoesNotExist:
-            return Response(
-                {"error": "Population statistics not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id, population_id)
 
 
 class FacilityFeesCreateView(APIView):
-    @create_facility_fees_docs
+    @docs.create_facility_fees_docs
     def post(self, request, facility_id):
         """Create fee information for a specific health facility"""
         try:
@@ -587,68 +550,29 @@ class FacilityFeesCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class FacilityFeesDetailView(APIView):
-    @get_facility_fees_details_docs
+class FacilityFeesDetailView(FacilitySubResourceView):
+    model = FacilityFees
+    serializer_class = FacilityFeesSerializer
+    not_found_message = "Fee information not found for this facility"
+
+    @docs.get_facility_fees_details_docs
     def get(self, request, facility_id):
         """Get fee information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            fees = FacilityFees.objects.get(facility=facility)
-            serializer = FacilityFeesSerializer(fees)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityFees.DoesNotExist:
-            return Response(
-                {"error": "Fee information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_fees_docs
+    @docs.update_facility_fees_docs
     def put(self, request, facility_id):
         """Update fee information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            fees = FacilityFees.objects.get(facility=facility)
-            serializer = FacilityFeesSerializer(fees, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityFees.DoesNotExist:
-            return Response(
-                {"error": "Fee information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_fees_docs
+    @docs.delete_facility_fees_docs
     def delete(self, request, facility_id):
         """Delete fee information for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            fees = FacilityFees.objects.get(facility=facility)
-            fees.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityFees.DoesNotExist:
-            return Response(
-                {"error": "Fee information not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class GovernmentDataCreateView(APIView):
-    @create_facility_governmentdata_docs
+    @docs.create_facility_governmentdata_docs
     def post(self, request, facility_id):
         """Create government data for a specific health facility"""
         try:
@@ -665,70 +589,29 @@ class GovernmentDataCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GovernmentDataDetailView(APIView):
-    @get_facility_governmentdata_details_docs
+class GovernmentDataDetailView(FacilitySubResourceView):
+    model = GovernmentData
+    serializer_class = GovernmentDataSerializer
+    not_found_message = "Government data not found for this facility"
+
+    @docs.get_facility_governmentdata_details_docs
     def get(self, request, facility_id):
         """Get government data for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            government_data = GovernmentData.objects.get(facility=facility)
-            serializer = GovernmentDataSerializer(government_data)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except GovernmentData.DoesNotExist:
-            return Response(
-                {"error": "Government data not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_governmentdata_docs
+    @docs.update_facility_governmentdata_docs
     def put(self, request, facility_id):
         """Update government data for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            government_data = GovernmentData.objects.get(facility=facility)
-            serializer = GovernmentDataSerializer(
-                government_data, data=request.data, partial=True
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except GovernmentData.DoesNotExist:
-            return Response(
-                {"error": "Government data not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_governmentdata_docs
+    @docs.delete_facility_governmentdata_docs
     def delete(self, request, facility_id):
         """Delete government data for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            government_data = GovernmentData.objects.get(facility=facility)
-            government_data.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except GovernmentData.DoesNotExist:
-            return Response(
-                {"error": "Government data not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class AdvancedFacilityDataCreateView(APIView):
-    @create_facility_advanceddata_docs
+    @docs.create_facility_advanceddata_docs
     def post(self, request, facility_id):
         """Create advanced data for a specific health facility"""
         try:
@@ -745,72 +628,31 @@ class AdvancedFacilityDataCreateView(APIView):
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AdvancedFacilityDataDetailView(APIView):
-    @get_facility_advanceddata_details_docs
+class AdvancedFacilityDataDetailView(FacilitySubResourceView):
+    model = AdvancedFacilityData
+    serializer_class = AdvancedDataSerializer
+    not_found_message = "Advanced data not found for this facility"
+
+    @docs.get_facility_advanceddata_details_docs
     def get(self, request, facility_id):
         """Get advanced data for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            advanced_data = AdvancedFacilityData.objects.get(facility=facility)
-            serializer = AdvancedDataSerializer(advanced_data)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except AdvancedFacilityData.DoesNotExist:
-            return Response(
-                {"error": "Advanced data not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id)
 
-    @update_facility_advanceddata_docs
+    @docs.update_facility_advanceddata_docs
     def put(self, request, facility_id):
         """Update advanced data for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            advanced_data = AdvancedFacilityData.objects.get(facility=facility)
-            serializer = AdvancedDataSerializer(
-                advanced_data, data=request.data, partial=True
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except AdvancedFacilityData.DoesNotExist:
-            return Response(
-                {"error": "Advanced data not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id)
 
-    @delete_facility_advanceddata_docs
+    @docs.delete_facility_advanceddata_docs
     def delete(self, request, facility_id):
         """Delete advanced data for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            advanced_data = AdvancedFacilityData.objects.get(facility=facility)
-            advanced_data.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except AdvancedFacilityData.DoesNotExist:
-            return Response(
-                {"error": "Advanced data not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id)
 
 
 class FacilityImageBulkCreateView(APIView):
     parser_classes = [MultiPartParser, FormParser]
 
-    @create_facility_images_docs
+    @docs.create_facility_images_docs
     def post(self, request, facility_id):
         """Bulk upload images for a specific health facility"""
         try:
@@ -843,61 +685,22 @@ class FacilityImageBulkCreateView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class FacilityImageDetailView(APIView):
-    @get_facility_images_details_docs
+class FacilityImageDetailView(FacilitySubResourceView):
+    model = FacilityImage
+    serializer_class = FacilityImageSerializer
+    not_found_message = "Image not found for this facility"
+
+    @docs.get_facility_images_details_docs
     def get(self, request, facility_id, image_id):
         """Get an image for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            image = FacilityImage.objects.get(id=image_id, facility=facility)
-            serializer = FacilityImageSerializer(image)
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityImage.DoesNotExist:
-            return Response(
-                {"error": "Image not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.retrieve(request, facility_id, image_id)
 
-    @update_facility_images_docs
+    @docs.update_facility_images_docs
     def put(self, request, facility_id, image_id):
         """Update an image for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            image = FacilityImage.objects.get(id=image_id, facility=facility)
-            serializer = FacilityImageSerializer(image, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityImage.DoesNotExist:
-            return Response(
-                {"error": "Image not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except serializers.ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, facility_id, image_id)
 
-    @delete_facility_governmentdata_docs
+    @docs.delete_facility_images_docs
     def delete(self, request, facility_id, image_id):
         """Delete an image for a specific health facility"""
-        try:
-            facility = HealthFacility.objects.get(id=facility_id)
-            image = FacilityImage.objects.get(id=image_id, facility=facility)
-            image.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except HealthFacility.DoesNotExist:
-            return Response(
-                {"error": "Health facility not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-        except FacilityImage.DoesNotExist:
-            return Response(
-                {"error": "Image not found for this facility"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return self.destroy(request, facility_id, image_id)
@@ -0,0 +1,72 @@
+"""
+Deferred Swagger documentation for API views.
+
+Each app keeps its `swagger_auto_schema` definitions in `swagger_docs.py`.
+Importing those modules builds every drf_yasg schema object and serializer
+referenced by the docs, which a cold worker should not pay for just to serve
+an API request. Views therefore decorate their methods through `lazy_docs`:
+
+    docs = lazy_docs("edudata.swagger_docs")
+
+    class ProvinceAPIView(APIView):
+        @docs.get_province_docs
+        def get(self, request):
+            ...
+
+With `LAZY_API_DOCS` enabled (the default), the decorator only records which
+definition documents the method, and `LazySwaggerSchemaGenerator` imports and
+applies it the first time the schema is generated. With the setting disabled
+the definition is imported and applied immediately, as a plain
+`swagger_auto_schema` decorator would be.
+"""
+
+from importlib import import_module
+from django.conf import settings
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+
+def resolve_docs(view_method):
+    """
+    Applies the swagger definition recorded on `view_method`, if it has not
+    been applied yet, and returns the method.
+    """
+    func = getattr(view_method, "__func__", view_method)
+    reference = getattr(func, "_lazy_swagger_docs", None)
+    if reference is not None:
+        module, name = reference
+        del func._lazy_swagger_docs
+        getattr(import_module(module), name)(func)
+    return view_method
+
+
+class lazy_docs:
+    """
+    Gives access to the swagger definitions of a `swagger_docs` module as
+    decorators, without importing the module until the docs are needed.
+    """
+
+    def __init__(self, module):
+        self.module = module
+
+    def __getattr__(self, name):
+        def decorator(view_method):
+            view_method._lazy_swagger_docs = (self.module, name)
+            if not getattr(settings, "LAZY_API_DOCS", True):
+                resolve_docs(view_method)
+            return view_method
+
+        return decorator
+
+
+class LazySwaggerSchemaGenerator(OpenAPISchemaGenerator):
+    """
+    Schema generator that applies deferred swagger definitions before
+    reading the overrides of each operation.
+    """
+
+    def get_overrides(self, view, method):
+        action = getattr(view, "action", method.lower())
+        action_method = getattr(view, action, None)
+        if action_method is not None:
+            resolve_docs(action_method)
+        return super().get_overrides(view, method)
@@ -0,0 +1,88 @@
+"""
+Multi-get (batch retrieve) endpoints.
+
+Clients pass up to `max_batch_size` comma-separated ids (`ids=3,1,7`) or
+codes (`codes=...`). All of them are fetched with a single `IN` query, plus
+the fixed number of queries the serializer's eager loading adds, and
+returned in request order. A key that matches nothing is answered inline
+with `{"<field>": <key>, "error": "..."}` at its position instead of failing
+the whole request.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+MAX_BATCH_SIZE = 50
+
+
+class BatchRetrieveView(APIView):
+    # Query parameter -> model field the keys are looked up by.
+    lookup_params = {"ids": "id"}
+    max_batch_size = MAX_BATCH_SIZE
+    serializer_class = None
+    not_found_message = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_serializer_context(self):
+        return {"request": self.request, "format": self.format_kwarg, "view": self}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("context", self.get_serializer_context())
+        return self.serializer_class(*args, **kwargs)
+
+    def get_lookup(self, query_params):
+        """
+        Returns (model field, keys) for the single lookup parameter in the
+        request, raising a ValidationError if it is missing, too long or
+        holds values the field cannot store.
+        """
+        given = [param for param in self.lookup_params if param in query_params]
+        if len(given) != 1:
+            raise ValidationError(
+                {
+                    "detail": "Provide exactly one of: "
+                    f"{', '.join(self.lookup_params)}"
+                }
+            )
+
+        param = given[0]
+        field_name = self.lookup_params[param]
+        field = self.get_queryset().model._meta.get_field(field_name)
+        raw_keys = [key for key in query_params[param].split(",") if key]
+        if not 1 <= len(raw_keys) <= self.max_batch_size:
+            raise ValidationError(
+                {param: f"Provide between 1 and {self.max_batch_size} values"}
+            )
+
+        try:
+            keys = [field.to_python(key) for key in raw_keys]
+        except DjangoValidationError:
+            raise ValidationError({param: f"Invalid value in {param}"})
+        return field_name, keys
+
+    def batch_retrieve(self, request):
+        try:
+            field_name, keys = self.get_lookup(request.query_params)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        found = {
+            getattr(instance, field_name): instance
+            for instance in self.get_queryset().filter(**{f"{field_name}__in": keys})
+        }
+        serializer = self.get_serializer(
+            [found[key] for key in keys if key in found], many=True
+        )
+        serialized = iter(serializer.data)
+        results = [
+            next(serialized)
+            if key in found
+            else {field_name: key, "error": self.not_found_message}
+            for key in keys
+        ]
+        return Response({"results": results})
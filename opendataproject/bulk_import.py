@@ -0,0 +1,460 @@
+"""
+Shared machinery for the bulk importers of registry files (see
+edudata.school_import and healthdata.facility_import).
+
+Input is CSV with a header row or newline-delimited JSON, read as a stream of
+(line number, record) pairs. Each importer validates records in Python
+without queries, reports the ones that fail with their line number and
+writes the rest in batches, one transaction per batch, upserting the main
+model on its natural key so an import can be re-run safely.
+
+After each batch the report's `last_line` is the last input line that has
+been dealt with, which is what a checkpoint records: an importer created
+with `start_after=<line>` skips everything up to that line. Since rows are
+upserted, resuming from a checkpoint a batch late is harmless.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, models, transaction
+
+DEFAULT_BATCH_SIZE = 1000
+FORMATS = ("csv", "ndjson")
+
+TRUE_VALUES = {"1", "t", "true", "y", "yes"}
+FALSE_VALUES = {"0", "f", "false", "n", "no"}
+
+
+def detect_format(filename):
+    """
+    Returns the input format for `filename` from its extension, or None.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    if extension == "csv":
+        return "csv"
+    return None
+
+
+def read_csv(stream):
+    """
+    Yields (line number, record) for each row of a CSV file with a header.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(stream):
+    """
+    Yields (line number, record) for each line of a newline-delimited JSON
+    file. Lines that are not a JSON object yield an error message instead.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            record = f"Invalid JSON: {e}"
+        if not isinstance(record, (dict, str)):
+            record = "Expected a JSON object"
+        yield line_number, record
+
+
+def read_records(stream, format):
+    return read_ndjson(stream) if format == "ndjson" else read_csv(stream)
+
+
+def clean_value(field, value):
+    """
+    Converts a raw input value to the Python value for a model field,
+    raising a ValidationError if the field would not accept it.
+    """
+    if isinstance(value, str):
+        value = value.strip() or None
+    if value is None:
+        if field.has_default():
+            return field.get_default()
+        if not field.null:
+            raise ValidationError("This field is required.")
+        return None
+
+    if isinstance(field, models.BooleanField) and isinstance(value, str):
+        if value.lower() not in TRUE_VALUES | FALSE_VALUES:
+            raise ValidationError(f"'{value}' must be true or false.")
+        value = value.lower() in TRUE_VALUES
+
+    if field.choices and isinstance(value, str):
+        for choice, label in field.flatchoices:
+            if value.casefold() in (str(choice).casefold(), str(label).casefold()):
+                value = choice
+                break
+
+    return field.clean(value, None)
+
+
+def clean_columns(model, columns, record, errors, prefix=""):
+    """
+    Cleans the `columns` of `record` that are present, returning their
+    values and adding the messages of invalid ones to `errors`.
+    """
+    values = {}
+    for column in columns:
+        if column in record:
+            try:
+                values[column] = clean_value(
+                    model._meta.get_field(column), record[column]
+                )
+            except ValidationError as e:
+                errors[prefix + column] = e.messages
+    return values
+
+
+def has_values(record, columns):
+    return any(record.get(column) not in (None, "") for column in columns)
+
+
+def format_errors(error):
+    if hasattr(error, "error_dict"):
+        return "; ".join(
+            f"{column}: {' '.join(messages).rstrip('.')}"
+            for column, messages in error.message_dict.items()
+        )
+    return " ".join(error.messages)
+
+
+def copy_field(value, field):
+    """
+    Renders a value as a COPY CSV field: NULL is an unquoted empty field and
+    everything else is quoted, so empty strings stay empty strings.
+    """
+    if value is None:
+        return ""
+    if isinstance(field, models.JSONField):
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def read_checkpoint(path, source):
+    """
+    Returns the line to resume `source` after from the checkpoint file at
+    `path`, 0 if there is none. Raises ValueError if the checkpoint was
+    written for another input.
+    """
+    try:
+        with open(path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except FileNotFoundError:
+        return 0
+    if checkpoint.get("source") != source:
+        raise ValueError(
+            f"The checkpoint is for {checkpoint.get('source')}, not {source}"
+        )
+    return checkpoint["line"]
+
+
+def write_checkpoint(path, source, line):
+    """
+    Records that `source` has been imported up to `line`. The file is
+    replaced atomically, so an interrupted write leaves the previous one.
+    """
+    with open(f"{path}.tmp", "w") as checkpoint_file:
+        json.dump({"source": source, "line": line}, checkpoint_file)
+    os.replace(f"{path}.tmp", path)
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []  # (line number, message)
+        self.last_line = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f"{self.rows} rows in {self.elapsed:.1f} s "
+            f"({self.rows_per_second:.0f} rows/s): {self.created} created, "
+            f"{self.updated} updated, {len(self.errors)} failed"
+        )
+
+
+class BulkImporter:
+    """
+    Imports records from read_csv/read_ndjson into `model`, upserting on
+    `key_field`. Subclasses implement clean_record and save_rows.
+    `on_batch` is called with the report after each batch is written.
+    """
+
+    model = None
+    key_field = None
+
+    def __init__(
+        self,
+        batch_size=DEFAULT_BATCH_SIZE,
+        dry_run=False,
+        use_copy=None,
+        on_batch=None,
+        start_after=0,
+    ):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        if use_copy is None:
+            use_copy = connection.vendor == "postgresql"
+        self.use_copy = use_copy
+        self.on_batch = on_batch
+        self.start_after = start_after
+
+    def clean_record(self, record):
+        """
+        Validates one input record, returning (values of the main model,
+        related data for save_rows) or raising a ValidationError.
+        """
+        raise NotImplementedError
+
+    def save_rows(self, rows):
+        """
+        Writes a list of (line number, values, related) with distinct keys,
+        inside the batch's transaction.
+        """
+        raise NotImplementedError
+
+    def run(self, records):
+        report = ImportReport()
+        batch = []
+        last_line = self.start_after
+        for line_number, record in records:
+            if line_number <= self.start_after:
+                continue
+            last_line = line_number
+            report.rows += 1
+            try:
+                batch.append((line_number, *self.clean_record(record)))
+            except ValidationError as e:
+                report.errors.append((line_number, format_errors(e)))
+                continue
+            if len(batch) >= self.batch_size:
+                report.last_line = last_line
+                self.write_batch(batch, report)
+                batch = []
+        report.last_line = last_line
+        if batch:
+            self.write_batch(batch, report)
+
+        report.elapsed = time.perf_counter() - report.started
+        report.errors.sort()
+        return report
+
+    def write_batch(self, batch, report):
+        # A key repeated within a batch is written once, from its last row.
+        latest = {}
+        for line_number, values, related in batch:
+            key = values[self.key_field]
+            if key in latest:
+                report.errors.append(
+                    (
+                        latest[key][0],
+                        f"{self.key_field} {key} is repeated on line {line_number}",
+                    )
+                )
+            latest[key] = (line_number, values, related)
+        rows = list(latest.values())
+
+        existing = set(
+            self.model.objects.filter(**{f"{self.key_field}__in": latest}).values_list(
+                self.key_field, flat=True
+            )
+        )
+        if not self.dry_run:
+            try:
+                with transaction.atomic():
+                    self.save_rows(rows)
+            except DatabaseError as e:
+                for line_number, _values, _related in rows:
+                    report.errors.append((line_number, f"Batch not saved: {e}"))
+                return
+
+        report.created += len(rows) - len(existing)
+        report.updated += len(existing)
+        report.elapsed = time.perf_counter() - report.started
+        if self.on_batch:
+            self.on_batch(report)
+
+    def upsert(self, rows, columns, **defaults):
+        """
+        Inserts or updates the main model rows with one INSERT ... ON
+        CONFLICT on `key_field`, updating the `columns` present in the batch.
+        Returns the saved instances in the order of `rows`.
+        """
+        present = {column for _line, values, _related in rows for column in values}
+        return self.model.objects.bulk_create(
+            [self.model(**defaults, **values) for _line, values, _related in rows],
+            update_conflicts=True,
+            unique_fields=[self.key_field],
+            update_fields=[
+                column
+                for column in columns
+                if column in present and column != self.key_field
+            ]
+            + ["updated_at"],
+        )
+
+    def insert(self, model, records):
+        """
+        Inserts unsaved instances with PostgreSQL COPY, or bulk_create when
+        COPY is not used.
+        """
+        if not self.use_copy:
+            model.objects.bulk_create(records)
+            return
+
+        fields = [
+            field for field in model._meta.concrete_fields if not field.primary_key
+        ]
+        buffer = io.StringIO()
+        for record in records:
+            buffer.write(
+                ",".join(
+                    copy_field(getattr(record, field.attname), field)
+                    for field in fields
+                )
+                + "\n"
+            )
+        quote_name = connection.ops.quote_name
+        sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+            quote_name(model._meta.db_table),
+            ", ".join(quote_name(field.column) for field in fields),
+        )
+        with connection.cursor() as cursor, connection.wrap_database_errors:
+            if hasattr(cursor.cursor, "copy_expert"):  # psycopg2
+                buffer.seek(0)
+                cursor.cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with cursor.cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+
+class BaseImportCommand(BaseCommand):
+    """
+    Management command running an importer over a file or standard input.
+    Subclasses set `importer_class` and may extend get_importer_kwargs.
+    """
+
+    importer_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - to read standard input")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows written per transaction (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the input and report errors without saving anything",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Insert related rows with INSERT instead of PostgreSQL COPY",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "File recording the last imported line after each batch. An "
+                "interrupted import run again with it resumes after that line; "
+                "it is removed once the import completes"
+            ),
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=50,
+            help="Number of row errors to print (default: 50)",
+        )
+
+    def get_importer_kwargs(self, options):
+        return {
+            "batch_size": options["batch_size"],
+            "dry_run": options["dry_run"],
+            "use_copy": False if options["no_copy"] else None,
+        }
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"] or detect_format(path)
+        if format is None:
+            raise CommandError(
+                "Cannot tell the input format from the file name, use --format"
+            )
+
+        checkpoint = None if options["dry_run"] else options["checkpoint"]
+        source = os.path.abspath(path) if path != "-" else path
+        start_after = 0
+        if checkpoint:
+            try:
+                start_after = read_checkpoint(checkpoint, source)
+            except ValueError as e:
+                raise CommandError(e)
+            if start_after:
+                self.stdout.write(f"Resuming after line {start_after}")
+
+        def on_batch(report):
+            if checkpoint:
+                write_checkpoint(checkpoint, source, report.last_line)
+            if options["verbosity"] >= 2:
+                self.stdout.write(report.summary())
+
+        importer = self.importer_class(
+            on_batch=on_batch,
+            start_after=start_after,
+            **self.get_importer_kwargs(options),
+        )
+        try:
+            stream = (
+                sys.stdin
+                if path == "-"
+                else open(path, encoding="utf-8-sig", newline="")
+            )
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+        with stream:
+            report = importer.run(read_records(stream, format))
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        for line_number, message in report.errors[: options["max_errors"]]:
+            self.stderr.write(f"Line {line_number}: {message}")
+        if len(report.errors) > options["max_errors"]:
+            self.stderr.write(
+                f"... and {len(report.errors) - options['max_errors']} more errors"
+            )
+
+        summary = report.summary()
+        if options["dry_run"]:
+            summary += " (dry run, nothing saved)"
+        style = self.style.WARNING if report.errors else self.style.SUCCESS
+        self.stdout.write(style(summary))
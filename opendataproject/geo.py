@@ -0,0 +1,189 @@
+"""
+Proximity queries over the latitude/longitude of school and facility
+locations: everything within `radius` km of a point, or the k nearest.
+
+Location tables have a (latitude, longitude) B-tree index. A query first
+narrows the rows to the bounding box of the search circle, a range scan of
+that index, then computes the haversine distance of the remaining rows
+only, keeping those inside the circle, nearest first.
+
+Without a radius, the k nearest are found by searching circles of
+SEARCH_RADII_KM in turn until one holds k objects: everything nearer than
+the k-th result lies in that circle, so the answer is exact, and a dense
+area is answered from its first, small box.
+
+Bounding boxes do not wrap around the antimeridian or the poles, which no
+location in Rwanda is near.
+"""
+
+import math
+from django.db.models import F, FloatField, Min, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Rwanda is about 250 km across, so the last radius reaches every location.
+SEARCH_RADII_KM = (2, 5, 10, 25, 50, 100, 300)
+MAX_RADIUS_KM = SEARCH_RADII_KM[-1]
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Returns the (south, north, west, east) bounds, in degrees, of the
+    circle of `radius_km` around a point.
+    """
+    delta_latitude = math.degrees(radius_km / EARTH_RADIUS_KM)
+    delta_longitude = math.degrees(
+        radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(latitude)), 1e-6))
+    )
+    return (
+        latitude - delta_latitude,
+        latitude + delta_latitude,
+        longitude - delta_longitude,
+        longitude + delta_longitude,
+    )
+
+
+def distance_expression(latitude, longitude):
+    """
+    Haversine distance in km from a point to the `latitude` and `longitude`
+    columns.
+    """
+    row_latitude = Radians(F("latitude"))
+    half_chord = Power(
+        Sin((row_latitude - Value(math.radians(latitude))) / 2), 2
+    ) + Value(math.cos(math.radians(latitude))) * Cos(row_latitude) * Power(
+        Sin((Radians(F("longitude")) - Value(math.radians(longitude))) / 2), 2
+    )
+    # Rounding can push the root just past 1 for antipodal points.
+    return (
+        2
+        * EARTH_RADIUS_KM
+        * ASin(Least(Sqrt(half_chord), Value(1.0), output_field=FloatField()))
+    )
+
+
+def nearest(locations, owner, latitude, longitude, limit, radius_km=None):
+    """
+    Returns the [(owner pk, distance in km)] of the `limit` owners nearest to
+    a point, by the location in `locations` (a queryset) nearest to it, and
+    within `radius_km` when given. `owner` is the locations' foreign key to
+    the owners, e.g. "school".
+    """
+    radii = [radius_km] if radius_km is not None else SEARCH_RADII_KM
+    for radius in radii:
+        south, north, west, east = bounding_box(latitude, longitude, radius)
+        matches = list(
+            locations.filter(
+                latitude__range=(south, north), longitude__range=(west, east)
+            )
+            .values(owner)
+            .annotate(distance=Min(distance_expression(latitude, longitude)))
+            .filter(distance__lte=radius)
+            .order_by("distance", owner)
+            .values_list(owner, "distance")[:limit]
+        )
+        if len(matches) == limit:
+            break
+    return matches
+
+
+class NearbyView(APIView):
+    model = None
+    serializer_class = None
+    # Response key of each result, e.g. "school".
+    object_name = None
+    # Model field the `type` parameter is checked against.
+    kind_field = None
+    location_model = None
+    # Foreign key from the location model to `model`.
+    owner_field = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_params(self, query_params):
+        """
+        Returns (latitude, longitude, radius or None, limit, location
+        filters) for the request, or raises a ValidationError with the errors
+        per parameter.
+        """
+        errors = {}
+        latitude = longitude = radius = None
+        try:
+            latitude, longitude = (
+                float(value) for value in query_params.get("near", "").split(",")
+            )
+        except ValueError:
+            errors["near"] = "Provide the point as latitude,longitude"
+        else:
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                errors["near"] = "Latitude must be within ±90 and longitude ±180"
+
+        if "radius" in query_params:
+            try:
+                radius = float(query_params["radius"])
+            except ValueError:
+                radius = 0
+            if not 0 < radius <= MAX_RADIUS_KM:
+                errors["radius"] = f"Provide a distance in km up to {MAX_RADIUS_KM}"
+
+        limit = query_params.get("limit", str(DEFAULT_LIMIT))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+            errors["limit"] = f"Provide a number between 1 and {MAX_LIMIT}"
+
+        filters = {f"{self.owner_field}__is_deleted": False}
+        kind = query_params.get("type")
+        if kind is not None:
+            choices = [
+                choice
+                for choice, _label in self.model._meta.get_field(
+                    self.kind_field
+                ).choices
+            ]
+            if kind.upper() in choices:
+                filters[f"{self.owner_field}__{self.kind_field}"] = kind.upper()
+            else:
+                errors["type"] = f"Valid choices are: {', '.join(choices)}"
+
+        if errors:
+            raise ValidationError(errors)
+        return latitude, longitude, radius, int(limit), filters
+
+    def nearby(self, request):
+        try:
+            latitude, longitude, radius, limit, filters = self.get_params(
+                request.query_params
+            )
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches = nearest(
+            self.location_model.objects.filter(**filters),
+            self.owner_field,
+            latitude,
+            longitude,
+            limit,
+            radius,
+        )
+        objects = self.get_queryset().in_bulk([pk for pk, _distance in matches])
+        # Objects deleted since their locations were read are left out.
+        matches = [(pk, distance) for pk, distance in matches if pk in objects]
+        serialized = self.serializer_class(
+            [objects[pk] for pk, _distance in matches],
+            many=True,
+            context={"request": request},
+        ).data
+        return Response(
+            {
+                "results": [
+                    {"distance_km": round(distance, 3), self.object_name: data}
+                    for (_pk, distance), data in zip(matches, serialized)
+                ]
+            }
+        )
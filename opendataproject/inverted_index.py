@@ -0,0 +1,182 @@
+"""
+In-process search backend: an inverted index per model, ranked with BM25.
+
+Selected with SEARCH_BACKEND = "opendataproject.inverted_index.MemorySearchBackend"
+where PostgreSQL full-text search is not available or wanted (edge and
+serverless deploys, tests). It needs no database extension and answers
+queries without database access, apart from loading the serialized objects.
+
+A model's index is bulk-loaded from its search documents on its first
+search, then kept up to date from the same commits and import batches that
+update the PostgreSQL columns (see opendataproject.search). Changes made by
+other processes are not seen until `manage.py rebuild_search_index` runs in
+this one or the process restarts, so it suits single-process deploys.
+
+Documents and queries are normalized and split into words. Each term of a
+document is weighted by the field it occurs in (FIELD_WEIGHTS, the name
+counting most), and every query word must match a term it is a prefix of.
+A word is scored with BM25 over the weighted term frequencies, taking the
+best of the terms it matches; a prefix of a longer term counts for the
+share of the term it covers, so exact words rank first.
+"""
+
+import heapq
+import math
+import threading
+from bisect import bisect_left, insort
+
+from edudata.location_search import normalize
+from .search import SearchBackend, document_batches
+
+# Weights of the (name, description, related text) fields of a document.
+FIELD_WEIGHTS = (3.0, 1.0, 1.0)
+# BM25 term frequency saturation and document length normalization.
+K1 = 1.2
+B = 0.75
+
+
+class InvertedIndex:
+    def __init__(self):
+        # term -> {pk: weighted term frequency}
+        self.postings = {}
+        # Every term, sorted, to find the terms a query word is a prefix of.
+        self.terms = []
+        # pk -> (terms of the document, weighted length)
+        self.documents = {}
+        self.total_length = 0.0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, pk, document):
+        """
+        Indexes a (name, description, related text) `document`, replacing
+        any previous document of `pk`.
+        """
+        self.remove(pk)
+        frequencies = {}
+        for weight, text in zip(FIELD_WEIGHTS, document):
+            for term in normalize(text or "").split():
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                insort(self.terms, term)
+            postings[pk] = frequency
+        length = sum(frequencies.values())
+        self.documents[pk] = (list(frequencies), length)
+        self.total_length += length
+
+    def remove(self, pk):
+        entry = self.documents.pop(pk, None)
+        if entry is None:
+            return
+        terms, length = entry
+        self.total_length -= length
+        for term in terms:
+            postings = self.postings[term]
+            del postings[pk]
+            if not postings:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def expand(self, word):
+        """
+        Returns the indexed terms `word` is a prefix of.
+        """
+        terms = []
+        position = bisect_left(self.terms, word)
+        while position < len(self.terms) and self.terms[position].startswith(word):
+            terms.append(self.terms[position])
+            position += 1
+        return terms
+
+    def search(self, query, limit):
+        """
+        Returns the [(pk, score)] of the best `limit` documents matching
+        every word of `query`, best first.
+        """
+        words = list(dict.fromkeys(normalize(query).split()))
+        if not words or not self.documents:
+            return []
+        count = len(self.documents)
+        average_length = self.total_length / count
+
+        scores = None
+        for word in words:
+            word_scores = {}
+            for term in self.expand(word):
+                postings = self.postings[term]
+                idf = math.log(
+                    1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                coverage = len(word) / len(term)
+                for pk, frequency in postings.items():
+                    # Only documents that matched the previous words can match.
+                    if scores is not None and pk not in scores:
+                        continue
+                    length = self.documents[pk][1]
+                    score = (
+                        coverage
+                        * idf
+                        * frequency
+                        * (K1 + 1)
+                        / (frequency + K1 * (1 - B + B * length / average_length))
+                    )
+                    if score > word_scores.get(pk, 0.0):
+                        word_scores[pk] = score
+            if scores is not None:
+                word_scores = {
+                    pk: scores[pk] + score for pk, score in word_scores.items()
+                }
+            scores = word_scores
+            if not scores:
+                return []
+
+        return heapq.nlargest(
+            limit, scores.items(), key=lambda match: (match[1], -match[0])
+        )
+
+
+class MemorySearchBackend(SearchBackend):
+    def __init__(self):
+        self.lock = threading.Lock()
+        # model -> InvertedIndex, loaded on first search.
+        self.indexes = {}
+
+    def load(self, model):
+        index = InvertedIndex()
+        objects = model.objects.filter(is_deleted=False).order_by("pk")
+        for documents in document_batches(model, objects.values_list("pk", flat=True)):
+            for pk, document in documents.items():
+                index.add(pk, document)
+        return index
+
+    def search(self, model, query, limit):
+        with self.lock:
+            index = self.indexes.get(model)
+            if index is None:
+                index = self.indexes[model] = self.load(model)
+            return index.search(query, limit)
+
+    def update(self, model, pks):
+        with self.lock:
+            index = self.indexes.get(model)
+            if index is None:
+                # The change is read with the rest on first search.
+                return
+            pks = set(pks)
+            for documents in document_batches(model, pks):
+                for pk, document in documents.items():
+                    index.add(pk, document)
+                pks -= documents.keys()
+            # Deleted objects have no document.
+            for pk in pks:
+                index.remove(pk)
+
+    def rebuild(self, model):
+        index = self.load(model)
+        with self.lock:
+            self.indexes[model] = index
+        return len(index)
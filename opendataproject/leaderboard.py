@@ -0,0 +1,105 @@
+"""
+Leaderboard endpoints: the top rated objects of a model, optionally within a
+province, a district and/or a type, ranked by the Bayesian score precomputed
+in accounts.models.RatingRollup. A request reads the first `limit` rows of a
+rollup index and loads those objects; nothing is sorted at request time.
+
+Rankings are as fresh as the last `manage.py refresh_leaderboards`, whose
+time is returned as `refreshed_at`.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.models import RatingRollup
+from edudata.location_index import is_valid_code
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+class LeaderboardView(APIView):
+    model = None
+    serializer_class = None
+    # Response key of each ranked object, e.g. "school".
+    object_name = None
+    # Model field the `type` parameter is checked against.
+    kind_field = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_filters(self, query_params):
+        """
+        Returns (rollup filters, limit) for the request, or raises a
+        ValidationError with the errors per parameter.
+        """
+        errors = {}
+        filters = {}
+        for level in ("province", "district"):
+            code = query_params.get(level)
+            if code is not None:
+                if is_valid_code(level, code):
+                    filters[level] = code
+                else:
+                    errors[level] = f"Invalid {level} code"
+
+        kind = query_params.get("type")
+        if kind is not None:
+            choices = [
+                choice
+                for choice, _label in self.model._meta.get_field(
+                    self.kind_field
+                ).choices
+            ]
+            if kind.upper() in choices:
+                filters["kind"] = kind.upper()
+            else:
+                errors["type"] = f"Valid choices are: {', '.join(choices)}"
+
+        limit = query_params.get("limit", str(DEFAULT_LIMIT))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+            errors["limit"] = f"Provide a number between 1 and {MAX_LIMIT}"
+
+        if errors:
+            raise ValidationError(errors)
+        return filters, int(limit)
+
+    def leaderboard(self, request):
+        try:
+            filters, limit = self.get_filters(request.query_params)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = list(
+            RatingRollup.objects.filter(
+                content_type=ContentType.objects.get_for_model(self.model), **filters
+            ).order_by("-score", "-object_id")[:limit]
+        )
+        objects = self.get_queryset().in_bulk([entry.object_id for entry in entries])
+        # Objects deleted since the last refresh are left out.
+        entries = [entry for entry in entries if entry.object_id in objects]
+        serialized = self.serializer_class(
+            [objects[entry.object_id] for entry in entries],
+            many=True,
+            context={"request": request},
+        ).data
+
+        return Response(
+            {
+                "refreshed_at": entries[0].refreshed_at if entries else None,
+                "results": [
+                    {
+                        "rank": rank,
+                        "score": round(entry.score, 3),
+                        self.object_name: data,
+                    }
+                    for rank, (entry, data) in enumerate(
+                        zip(entries, serialized), start=1
+                    )
+                ],
+            }
+        )
@@ -0,0 +1,166 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are fetched with `WHERE (sort_key, id) > (last_sort_key, last_id)
+ORDER BY sort_key, id LIMIT page_size + 1` instead of an OFFSET, so every page
+costs the same index range scan however deep the client has paged.
+
+Clients choose the sort key with `ordering` (e.g. `-average_rating`) and get
+`next`/`previous` links carrying an opaque cursor. `id` breaks ties, so the
+order is total even when many rows share a rating. Rows with a NULL sort key
+come last in both directions and are paged by id.
+"""
+
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    ordering_param = "ordering"
+    ordering_fields = ("id", "average_rating", "updated_at")
+    ordering = "id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field_name = self.ordering.lstrip("-")
+        self.descending = self.ordering.startswith("-")
+        self.field = queryset.model._meta.get_field(self.field_name)
+
+        position, self.reversed = self.decode_cursor(request)
+
+        rows = []
+        for segment in self.get_segments(queryset, position):
+            rows.extend(segment[: self.page_size + 1 - len(rows)])
+            if len(rows) > self.page_size:
+                break
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reversed:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get(self.ordering_param, self.ordering)
+        if ordering not in self.get_ordering_choices():
+            raise ValidationError(
+                {
+                    self.ordering_param: f"Invalid ordering: {ordering}. "
+                    f"Valid choices are: {self.get_ordering_choices()}"
+                }
+            )
+        return ordering
+
+    def get_ordering_choices(self):
+        return [
+            f"{sign}{field}" for field in self.ordering_fields for sign in ("", "-")
+        ]
+
+    def get_segments(self, queryset, position):
+        """
+        Returns the querysets that make up the rest of the traversal after
+        `position`, in order: rows with a sort key, then rows without one
+        (the other way round when paging backwards). The caller slices them,
+        so later segments are only queried if earlier ones run out.
+        """
+        descending = self.descending != self.reversed
+        after, at_or_after, at_or_before = (
+            ("lt", "lte", "gte") if descending else ("gt", "gte", "lte")
+        )
+        pk_order = "-pk" if descending else "pk"
+        key_order = f"-{self.field_name}" if descending else self.field_name
+
+        keyed = queryset.order_by(key_order, pk_order)
+        unkeyed = None
+        if self.field.null:
+            keyed = keyed.filter(**{f"{self.field_name}__isnull": False})
+            unkeyed = queryset.filter(**{f"{self.field_name}__isnull": True})
+            unkeyed = unkeyed.order_by(pk_order)
+
+        if position is not None:
+            value, pk = position
+            if value is None:
+                # Inside the NULL rows, which come after every keyed row.
+                unkeyed = unkeyed.filter(**{f"pk__{after}": pk})
+                if not self.reversed:
+                    keyed = None
+            else:
+                # (key, pk) after (value, pk), written so that the key
+                # bound can be used as an index range condition.
+                keyed = keyed.filter(
+                    **{f"{self.field_name}__{at_or_after}": value}
+                ).exclude(**{self.field_name: value, f"pk__{at_or_before}": pk})
+                if self.reversed:
+                    unkeyed = None
+
+        segments = [keyed, unkeyed]
+        if self.reversed:
+            segments.reverse()
+        return [segment for segment in segments if segment is not None]
+
+    def get_position(self, instance):
+        value = getattr(instance, self.field_name)
+        if value is not None:
+            value = self.field.value_to_string(instance)
+        return value, instance.pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reversed=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reversed=True)
+
+    def encode_cursor(self, position, reversed):
+        data = {"o": self.ordering, "p": position, "r": reversed}
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """
+        Returns (position, reversed) for the cursor in the request, where
+        position is (sort key value, pk) or None for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value, pk = data["p"]
+            if data["o"] != self.ordering:
+                raise ValueError("Cursor belongs to another ordering")
+            if value is not None:
+                value = self.field.to_python(value)
+            return (value, int(pk)), bool(data["r"])
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.ordering_param,
+                "required": False,
+                "in": "query",
+                "description": f"Sort key, prefix with '-' for descending (default: {self.ordering})",
+                "schema": {"type": "string", "enum": self.get_ordering_choices()},
+            }
+        ]
@@ -0,0 +1,274 @@
+"""
+Search over schools and health facilities, through a pluggable backend.
+
+Each searchable model builds search documents with `search_documents(pks)`:
+a (name, description, related text) triple per object that is not deleted,
+where the related text holds the names of the object's locations and, for
+facilities, of its offered services. Text is normalized like location names
+(accents stripped, case folded), so "Lycée" and "lycee" match, and a query
+matches objects whose document contains every word of the query as a word
+prefix ("kig hosp"), the name weighing more than the rest.
+
+The backend is the class at the dotted path of the SEARCH_BACKEND setting:
+
+- PostgresSearchBackend (the default) keeps the documents in two columns of
+  the model's table: `search_vector`, a tsvector weighting the name (A) over
+  the description (B) and the related names (C), and `search_name`, the
+  normalized name, both GIN-indexed. Queries are ranked by ts_rank and also
+  match names within trigram distance ("kibagabga"), ranked by word
+  similarity. The trigram part needs the pg_trgm extension, which the
+  migrations install when the server provides it; without it, matching
+  falls back to word prefixes. The `simple` configuration is used rather
+  than a stemming one, as names mix Kinyarwanda, French and English.
+- opendataproject.inverted_index.MemorySearchBackend keeps an in-process
+  BM25 index per model, for deployments and tests without PostgreSQL
+  extensions.
+
+Backends are updated by the receivers in each app's search_index module
+when an object, its locations or its services change, once per object when
+the transaction commits, and by the bulk importers for each batch. To
+rebuild a backend's data for all rows, run `manage.py rebuild_search_index`.
+"""
+
+import threading
+from functools import cache
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from edudata.location_search import normalize
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+SEARCH_CONFIG = "simple"
+UPDATE_BATCH_SIZE = 1000
+DEFAULT_BACKEND = "opendataproject.search.PostgresSearchBackend"
+
+_pending = threading.local()
+
+
+def searchable_models():
+    """
+    Returns the models that provide search_documents().
+    """
+    return [model for model in apps.get_models() if hasattr(model, "search_documents")]
+
+
+def document_batches(model, pks):
+    """
+    Yields the search documents of the given objects as {pk: document}, one
+    dict per UPDATE_BATCH_SIZE objects. Deleted objects have no document.
+    """
+    pks = list(pks)
+    for start in range(0, len(pks), UPDATE_BATCH_SIZE):
+        yield model.search_documents(pks[start : start + UPDATE_BATCH_SIZE])
+
+
+class SearchBackend:
+    def search(self, model, query, limit):
+        """
+        Returns the [(pk, score)] of the best `limit` objects of `model`
+        matching `query`, best first.
+        """
+        raise NotImplementedError
+
+    def update(self, model, pks):
+        """
+        Updates the data of the given objects from their current documents.
+        """
+        raise NotImplementedError
+
+    def rebuild(self, model):
+        """
+        Rebuilds the data of all objects of `model`, returning their number.
+        """
+        raise NotImplementedError
+
+
+@cache
+def get_backend():
+    return import_string(getattr(settings, "SEARCH_BACKEND", DEFAULT_BACKEND))()
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    if setting == "SEARCH_BACKEND":
+        get_backend.cache_clear()
+
+
+@cache
+def trigram_enabled():
+    """
+    Whether the pg_trgm extension is installed in the database.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def search_queryset(queryset, query):
+    """
+    Filters `queryset` to the objects matching `query` in their search
+    columns and annotates their relevance as `search_score`, best first.
+    """
+    text = normalize(query)
+    tsquery = SearchQuery(
+        " & ".join(f"{word}:*" for word in text.split()),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+    matches = Q(search_vector=tsquery)
+    score = SearchRank(F("search_vector"), tsquery)
+    if trigram_enabled():
+        matches |= Q(search_name__trigram_word_similar=text)
+        score = Greatest(
+            score, TrigramWordSimilarity(text, "search_name"), output_field=FloatField()
+        )
+    return (
+        queryset.filter(matches)
+        .annotate(search_score=Coalesce(score, 0.0, output_field=FloatField()))
+        .order_by("-search_score", "pk")
+    )
+
+
+def write_search_columns(model, documents):
+    """
+    Writes the search columns of the objects of a {pk: document} dict with
+    one UPDATE. The documents are passed as arrays and joined to the table,
+    as a CASE per row (bulk_update) takes time quadratic in the batch size.
+    Deleted objects keep their columns; searches skip them.
+    """
+    if not documents:
+        return
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk_column = connection.ops.quote_name(model._meta.pk.column)
+    columns = [
+        [normalize(text or "") for text in texts] for texts in zip(*documents.values())
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} SET
+                search_name = document.name,
+                search_vector =
+                    setweight(to_tsvector(%(config)s, document.name), 'A')
+                    || setweight(to_tsvector(%(config)s, document.description), 'B')
+                    || setweight(to_tsvector(%(config)s, document.related), 'C')
+            FROM unnest(
+                %(pks)s::bigint[], %(names)s::text[],
+                %(descriptions)s::text[], %(related)s::text[]
+            ) AS document (pk, name, description, related)
+            WHERE {table}.{pk_column} = document.pk
+            """,
+            {
+                "config": SEARCH_CONFIG,
+                "pks": list(documents),
+                "names": columns[0],
+                "descriptions": columns[1],
+                "related": columns[2],
+            },
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    def search(self, model, query, limit):
+        return list(
+            search_queryset(model.objects.filter(is_deleted=False), query).values_list(
+                "pk", "search_score"
+            )[:limit]
+        )
+
+    def update(self, model, pks):
+        for documents in document_batches(model, pks):
+            write_search_columns(model, documents)
+
+    def rebuild(self, model):
+        pks = list(model.objects.order_by("pk").values_list("pk", flat=True))
+        self.update(model, pks)
+        return len(pks)
+
+
+def schedule_search_update(model, pks):
+    """
+    Queues the given objects for a search backend update when the current
+    transaction commits (right away outside of one), so the objects changed
+    by a transaction are updated once, together.
+    """
+    pending = _pending.__dict__.setdefault("models", {})
+    pending.setdefault(model, set()).update(pks)
+    transaction.on_commit(flush_search_updates)
+
+
+def flush_search_updates():
+    pending = _pending.__dict__.pop("models", {})
+    for model, pks in pending.items():
+        get_backend().update(model, pks)
+
+
+class SearchView(APIView):
+    model = None
+    serializer_class = None
+    # Response key of each result, e.g. "school".
+    object_name = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_params(self, query_params):
+        """
+        Returns (query, limit) for the request, or raises a ValidationError
+        with the errors per parameter.
+        """
+        errors = {}
+        query = query_params.get("q", "")
+        if len(normalize(query)) < MIN_QUERY_LENGTH:
+            errors["q"] = (
+                f"Provide a search query of at least {MIN_QUERY_LENGTH} "
+                "letters or digits"
+            )
+        limit = query_params.get("limit", str(DEFAULT_LIMIT))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+            errors["limit"] = f"Provide a number between 1 and {MAX_LIMIT}"
+
+        if errors:
+            raise ValidationError(errors)
+        return query, int(limit)
+
+    def search(self, request):
+        try:
+            query, limit = self.get_params(request.query_params)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches = get_backend().search(self.model, query, limit)
+        objects = self.get_queryset().in_bulk([pk for pk, _score in matches])
+        # Objects deleted since they were indexed are left out.
+        matches = [(pk, score) for pk, score in matches if pk in objects]
+        serialized = self.serializer_class(
+            [objects[pk] for pk, _score in matches],
+            many=True,
+            context={"request": request},
+        ).data
+        return Response(
+            {
+                "results": [
+                    {"score": round(score, 3), self.object_name: data}
+                    for (_pk, score), data in zip(matches, serialized)
+                ]
+            }
+        )
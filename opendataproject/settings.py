@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # third party apps
     "rest_framework",
     "rest_framework_simplejwt",
@@ -155,6 +156,8 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "opendataproject.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 20,
 }
 
 AUTH_USER_MODEL = "accounts.CustomUser"
@@ -198,8 +201,20 @@ SWAGGER_SETTINGS = {
     },
     "USE_SESSION_AUTH": False,
     "JSON_EDITOR": True,
+    "DEFAULT_GENERATOR_CLASS": "opendataproject.api_docs.LazySwaggerSchemaGenerator",
 }
 
+# Defer importing the swagger_docs modules until the API schema is first
+# generated (see opendataproject/api_docs.py).
+LAZY_API_DOCS = config("LAZY_API_DOCS", default=True, cast=bool)
+
+# Search backend of the search endpoints (see opendataproject/search.py):
+# PostgreSQL full-text search, or an in-process index that needs no
+# database extension, "opendataproject.inverted_index.MemorySearchBackend".
+SEARCH_BACKEND = config(
+    "SEARCH_BACKEND", default="opendataproject.search.PostgresSearchBackend"
+)
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]